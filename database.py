@@ -1,13 +1,61 @@
 # database.py - Módulo de base de datos para JFinanzas
 import sqlite3
 import datetime
+import functools
 import hashlib
 import json
+import os
+import threading
+import types
+
+
+def cacheado(*tablas):
+    """Memoriza el resultado de una consulta agregada hasta que se escriba
+    en alguna de las tablas de las que depende. La fecha forma parte de la
+    clave porque los valores por defecto (mes actual, últimos meses) dependen del día.
+    Se llama también desde hilos (exportaciones): la caché se protege con un
+    candado y no se guarda un resultado si hubo una escritura mientras se calculaba.
+    Los métodos memorizados retornan valores inmutables, ya que se comparten"""
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            clave = (metodo.__name__, datetime.date.today(), args, tuple(sorted(kwargs.items())))
+            with self._candado_cache:
+                if clave in self._cache:
+                    return self._cache[clave]
+                version = self.version
+            resultado = metodo(self, *args, **kwargs)
+            with self._candado_cache:
+                if self.version == version:
+                    self._cache[clave] = resultado
+                    for tabla in tablas:
+                        self._claves_por_tabla.setdefault(tabla, set()).add(clave)
+            return resultado
+        return envoltura
+    return decorador
+
+
+# Sentencia de borrado por tabla (lógico o físico). Todos los borrar_* pasan
+# por borrar_muchos, que solo acepta estas tablas
+BORRADO_POR_TABLA = {
+    "movimientos": "DELETE FROM movimientos WHERE id IN ({})",
+    "suscripciones": "UPDATE suscripciones SET activa = 0 WHERE id IN ({})",
+    "prestamos": "UPDATE prestamos SET activo = 0 WHERE id IN ({})",
+    "ahorros": "UPDATE ahorros SET completado = 1 WHERE id IN ({})",
+    "creditos": "UPDATE creditos SET pagado = 1 WHERE id IN ({})",
+    "cuentas_bancarias": "UPDATE cuentas_bancarias SET activa = 0 WHERE id IN ({})",
+    "presupuestos": "DELETE FROM presupuestos WHERE id IN ({})",
+}
 
 
 class Database:
     def __init__(self, db_path="finanzas.db"):
         self.db_path = db_path
+        self._cache = {}
+        self._claves_por_tabla = {}
+        self._candado_cache = threading.Lock()
+        # Se incrementa en cada escritura; permite a la interfaz saber si sus vistas siguen vigentes
+        self.version = 0
         try:
             self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
             self.conn.execute("PRAGMA journal_mode=WAL")
@@ -15,7 +63,8 @@ class Database:
         except Exception as e:
             print(f"Error conectando a la base de datos: {e}")
             # Intentar con base de datos en memoria como fallback
-            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self.db_path = ":memory:"
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             self.create_table()
 
     def create_table(self):
@@ -123,7 +172,7 @@ class Database:
                 FOREIGN KEY (cuenta_destino) REFERENCES cuentas_bancarias(id)
             )
         """)
-        self.conn.commit()
+        self._commit()
     
     # --- Métodos de Configuración ---
     
@@ -140,7 +189,7 @@ class Database:
         try:
             cursor = self.conn.cursor()
             cursor.execute("INSERT OR REPLACE INTO configuracion (clave, valor) VALUES (?, ?)", (clave, valor))
-            self.conn.commit()
+            self._commit("config")
             return True
         except:
             return False
@@ -181,7 +230,7 @@ class Database:
                 INSERT OR REPLACE INTO presupuestos (categoria, limite, mes, anio) 
                 VALUES (?, ?, ?, ?)
             """, (categoria, limite, ahora.month, ahora.year))
-            self.conn.commit()
+            self._commit("presupuestos")
             return True
         except Exception as e:
             print(f"Error al agregar presupuesto: {e}")
@@ -190,11 +239,13 @@ class Database:
     def obtener_presupuestos(self):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM presupuestos ORDER BY categoria")
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("SELECT id, categoria, limite FROM presupuestos ORDER BY categoria")
             return cursor.fetchall()
         except:
             return []
     
+    @cacheado("movimientos")
     def obtener_gasto_categoria_mes(self, categoria, mes=None, anio=None):
         try:
             if mes is None:
@@ -214,13 +265,7 @@ class Database:
             return 0
     
     def borrar_presupuesto(self, id_presupuesto):
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM presupuestos WHERE id = ?", (id_presupuesto,))
-            self.conn.commit()
-            return True
-        except:
-            return False
+        return self.borrar_muchos("presupuestos", [id_presupuesto])
     
     # --- Métodos de Transferencias ---
     
@@ -236,7 +281,7 @@ class Database:
                 INSERT INTO transferencias (cuenta_origen, cuenta_destino, monto, fecha, descripcion)
                 VALUES (?, ?, ?, ?, ?)
             """, (cuenta_origen, cuenta_destino, monto, fecha, descripcion))
-            self.conn.commit()
+            self._commit("transferencias", "cuentas_bancarias")
             return True
         except Exception as e:
             print(f"Error en transferencia: {e}")
@@ -258,6 +303,7 @@ class Database:
     
     # --- Métodos de Estadísticas para Gráficos ---
     
+    @cacheado("movimientos")
     def obtener_gastos_por_categoria(self, mes=None, anio=None):
         try:
             if mes is None:
@@ -274,31 +320,42 @@ class Database:
                 GROUP BY categoria
                 ORDER BY total DESC
             """, (f"{mes:02d}", str(anio)))
-            return cursor.fetchall()
+            return tuple(cursor.fetchall())
         except:
-            return []
+            return ()
     
+    @cacheado("movimientos")
     def obtener_balance_ultimos_meses(self, num_meses=6):
         try:
             resultados = []
             ahora = datetime.datetime.now()
+            fechas = [ahora - datetime.timedelta(days=i*30) for i in range(num_meses - 1, -1, -1)]
             
-            for i in range(num_meses - 1, -1, -1):
-                fecha = ahora - datetime.timedelta(days=i*30)
-                mes = fecha.month
+            # Una sola consulta agrupada por mes en lugar de una por cada mes
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT strftime('%Y-%m', fecha) as periodo,
+                       COALESCE(SUM(CASE WHEN tipo = 'ingreso' THEN monto END), 0),
+                       COALESCE(SUM(CASE WHEN tipo = 'gasto' THEN monto END), 0)
+                FROM movimientos
+                WHERE fecha >= ?
+                GROUP BY periodo
+            """, (fechas[0].strftime("%Y-%m-01"),))
+            totales = {periodo: (ingresos, gastos) for periodo, ingresos, gastos in cursor.fetchall()}
+            
+            for fecha in fechas:
                 anio = fecha.year
-                
-                ingresos, gastos = self.obtener_balance_mensual(mes, anio)
-                resultados.append({
+                ingresos, gastos = totales.get(fecha.strftime("%Y-%m"), (0, 0))
+                resultados.append(types.MappingProxyType({
                     "mes": fecha.strftime("%b"),
                     "anio": anio,
                     "ingresos": ingresos,
                     "gastos": gastos
-                })
+                }))
             
-            return resultados
+            return tuple(resultados)
         except:
-            return []
+            return ()
     
     # --- Métodos de Edición ---
     
@@ -309,7 +366,7 @@ class Database:
                 UPDATE movimientos SET tipo = ?, categoria = ?, monto = ?, descripcion = ?
                 WHERE id = ?
             """, (tipo, categoria, monto, descripcion, id_mov))
-            self.conn.commit()
+            self._commit("movimientos")
             return True
         except:
             return False
@@ -321,7 +378,7 @@ class Database:
                 UPDATE suscripciones SET nombre = ?, monto = ?, dia_cobro = ?
                 WHERE id = ?
             """, (nombre, monto, dia_cobro, id_sub))
-            self.conn.commit()
+            self._commit("suscripciones")
             return True
         except:
             return False
@@ -333,7 +390,7 @@ class Database:
                 UPDATE prestamos SET banco = ?, monto_total = ?, cuota_mensual = ?, dia_pago = ?
                 WHERE id = ?
             """, (banco, monto_total, cuota_mensual, dia_pago, id_pres))
-            self.conn.commit()
+            self._commit("prestamos")
             return True
         except:
             return False
@@ -345,7 +402,7 @@ class Database:
                 UPDATE ahorros SET nombre = ?, meta = ?
                 WHERE id = ?
             """, (nombre, meta, id_aho))
-            self.conn.commit()
+            self._commit("ahorros")
             return True
         except:
             return False
@@ -364,7 +421,7 @@ class Database:
                 meses_sin_intereses = ?, cuota_mensual = ?, tasa_interes = ?
                 WHERE id = ?
             """, (descripcion, banco, monto_total, meses_plazo, cuota_mensual, tasa_interes, id_cred))
-            self.conn.commit()
+            self._commit("creditos")
             return True
         except:
             return False
@@ -376,7 +433,7 @@ class Database:
                 UPDATE cuentas_bancarias SET nombre_banco = ?, tipo_cuenta = ?, limite_credito = ?
                 WHERE id = ?
             """, (nombre_banco, tipo_cuenta, limite_credito, id_cuenta))
-            self.conn.commit()
+            self._commit("cuentas_bancarias")
             return True
         except:
             return False
@@ -386,7 +443,8 @@ class Database:
     def buscar_movimientos(self, texto="", categoria=None, tipo=None, fecha_desde=None, fecha_hasta=None):
         try:
             cursor = self.conn.cursor()
-            query = "SELECT * FROM movimientos WHERE 1=1"
+            cursor.row_factory = sqlite3.Row
+            query = "SELECT id, tipo, categoria, monto, descripcion, fecha FROM movimientos WHERE 1=1"
             params = []
             
             if texto:
@@ -417,7 +475,8 @@ class Database:
     
     # --- Backup y Restauración ---
     
-    def exportar_datos(self):
+    def exportar_datos(self, ruta):
+        """Guarda un backup JSON de todas las tablas en 'ruta'"""
         try:
             cursor = self.conn.cursor()
             datos = {}
@@ -430,15 +489,35 @@ class Database:
                 filas = cursor.fetchall()
                 datos[tabla] = [dict(zip(columnas, fila)) for fila in filas]
             
-            return json.dumps(datos, indent=2, ensure_ascii=False)
+            # json.dump escribe el archivo por partes; sin sangría ni escapes ASCII.
+            # Se escribe a un temporal en la misma carpeta y se reemplaza al final,
+            # para no dejar un backup truncado si la escritura falla a medias
+            temporal = ruta + ".tmp"
+            try:
+                with open(temporal, 'w', encoding='utf-8') as f:
+                    json.dump(datos, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(temporal, ruta)
+            except Exception:
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+                raise
+            return True
         except Exception as e:
             print(f"Error al exportar: {e}")
-            return None
+            return False
     
-    def importar_datos(self, json_data):
-        try:
-            datos = json.loads(json_data)
-            cursor = self.conn.cursor()
+    def importar_datos(self, ruta):
+        """Restaura un backup JSON generado por exportar_datos.
+        Escribe con su propia conexión y en una sola transacción, así puede
+        correr en otro hilo sin que los commits de la interfaz confirmen un
+        import a medias. Al terminar, quien llama debe invocar invalidar_cache()"""
+        # Una base en memoria solo es visible desde su propia conexión
+        separada = self.db_path != ":memory:"
+        conn = sqlite3.connect(self.db_path, timeout=10) if separada else self.conn
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            cursor = conn.cursor()
             
             for tabla, registros in datos.items():
                 for registro in registros:
@@ -451,11 +530,15 @@ class Database:
                     except:
                         pass
             
-            self.conn.commit()
+            conn.commit()
             return True
         except Exception as e:
+            conn.rollback()
             print(f"Error al importar: {e}")
             return False
+        finally:
+            if separada:
+                conn.close()
 
     def agregar_movimiento(self, tipo, categoria, monto, descripcion):
         try:
@@ -463,21 +546,39 @@ class Database:
             fecha = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
             cursor.execute("INSERT INTO movimientos (tipo, categoria, monto, descripcion, fecha) VALUES (?, ?, ?, ?, ?)",
                            (tipo, categoria, monto, descripcion, fecha))
-            self.conn.commit()
+            self._commit("movimientos")
             return True
         except Exception as e:
             print(f"Error al agregar movimiento: {e}")
             return False
 
+    def agregar_movimiento_con_cuenta(self, tipo, categoria, monto, descripcion, id_cuenta):
+        """Registra el movimiento y ajusta el saldo de la cuenta en una sola transacción"""
+        try:
+            cursor = self.conn.cursor()
+            fecha = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+            cursor.execute("INSERT INTO movimientos (tipo, categoria, monto, descripcion, fecha) VALUES (?, ?, ?, ?, ?)",
+                           (tipo, categoria, monto, descripcion, fecha))
+            ajuste = monto if tipo == "ingreso" else -monto
+            cursor.execute("UPDATE cuentas_bancarias SET saldo = saldo + ? WHERE id = ?", (ajuste, id_cuenta))
+            self._commit("movimientos", "cuentas_bancarias")
+            return True
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error al agregar movimiento con cuenta: {e}")
+            return False
+
     def obtener_movimientos(self):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM movimientos ORDER BY id DESC")
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("SELECT id, tipo, categoria, monto, descripcion, fecha FROM movimientos ORDER BY id DESC")
             return cursor.fetchall()
         except Exception as e:
             print(f"Error al obtener movimientos: {e}")
             return []
 
+    @cacheado("movimientos")
     def obtener_balance(self):
         try:
             cursor = self.conn.cursor()
@@ -491,6 +592,7 @@ class Database:
             print(f"Error al obtener balance: {e}")
             return 0, 0, 0
     
+    @cacheado("movimientos")
     def obtener_balance_mensual(self, mes, anio):
         try:
             cursor = self.conn.cursor()
@@ -506,12 +608,34 @@ class Database:
         except Exception as e:
             print(f"Error al obtener balance mensual: {e}")
             return 0, 0
-    
+
+    @cacheado("movimientos", "suscripciones", "prestamos", "creditos")
+    def obtener_resumen_mensual(self, mes, anio):
+        """Retorna (ingresos, gastos, suscripciones, cuotas_prestamos, cuotas_creditos) en una sola consulta"""
+        try:
+            cursor = self.conn.cursor()
+            # Ingresos y gastos salen de un solo recorrido de los movimientos del mes
+            cursor.execute("""
+                SELECT
+                    COALESCE(SUM(CASE WHEN tipo = 'ingreso' THEN monto END), 0),
+                    COALESCE(SUM(CASE WHEN tipo = 'gasto' THEN monto END), 0),
+                    (SELECT COALESCE(SUM(monto), 0) FROM suscripciones WHERE activa = 1),
+                    (SELECT COALESCE(SUM(cuota_mensual), 0) FROM prestamos WHERE activo = 1),
+                    (SELECT COALESCE(SUM(cuota_mensual), 0) FROM creditos WHERE pagado = 0)
+                FROM movimientos
+                WHERE strftime('%Y-%m', fecha) = ?
+            """, (f"{anio}-{mes:02d}",))
+            return cursor.fetchone()
+        except Exception as e:
+            print(f"Error al obtener resumen mensual: {e}")
+            return 0, 0, 0, 0, 0
+
     def obtener_movimientos_mensuales(self, mes, anio):
+        """Retorna (fecha, TIPO, categoria, descripcion, monto) en el orden de columnas del reporte"""
         try:
             cursor = self.conn.cursor()
             cursor.execute("""
-                SELECT id, tipo, categoria, monto, descripcion, fecha 
+                SELECT fecha, UPPER(tipo), categoria, descripcion, monto 
                 FROM movimientos 
                 WHERE strftime('%m', fecha) = ? AND strftime('%Y', fecha) = ?
                 ORDER BY fecha DESC
@@ -528,7 +652,7 @@ class Database:
             cursor = self.conn.cursor()
             cursor.execute("INSERT INTO suscripciones (nombre, monto, dia_cobro) VALUES (?, ?, ?)",
                            (nombre, monto, dia_cobro))
-            self.conn.commit()
+            self._commit("suscripciones")
             return True
         except Exception as e:
             print(f"Error al agregar suscripción: {e}")
@@ -537,12 +661,14 @@ class Database:
     def obtener_suscripciones(self):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM suscripciones WHERE activa = 1 ORDER BY dia_cobro")
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("SELECT id, nombre, monto, dia_cobro FROM suscripciones WHERE activa = 1 ORDER BY dia_cobro")
             return cursor.fetchall()
         except Exception as e:
             print(f"Error al obtener suscripciones: {e}")
             return []
     
+    @cacheado("suscripciones")
     def obtener_total_suscripciones(self):
         try:
             cursor = self.conn.cursor()
@@ -554,19 +680,24 @@ class Database:
             return 0
     
     def borrar_suscripcion(self, id_suscripcion):
+        return self.borrar_muchos("suscripciones", [id_suscripcion])
+
+    def borrar_movimiento(self, id_movimiento):
+        return self.borrar_muchos("movimientos", [id_movimiento])
+    
+    def borrar_muchos(self, tabla, ids):
+        """Borra varios registros de una tabla en una sola transacción"""
+        if not ids:
+            return True
         try:
             cursor = self.conn.cursor()
-            cursor.execute("UPDATE suscripciones SET activa = 0 WHERE id = ?", (id_suscripcion,))
-            self.conn.commit()
+            marcadores = ",".join("?" * len(ids))
+            cursor.execute(BORRADO_POR_TABLA[tabla].format(marcadores), tuple(ids))
+            self._commit(tabla)
             return True
         except Exception as e:
-            print(f"Error al borrar suscripción: {e}")
+            print(f"Error al borrar registros de {tabla}: {e}")
             return False
-
-    def borrar_movimiento(self, id_movimiento):
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM movimientos WHERE id = ?", (id_movimiento,))
-        self.conn.commit()
     
     # --- Métodos para Préstamos ---
     
@@ -576,7 +707,7 @@ class Database:
             fecha_inicio = datetime.datetime.now().strftime("%Y-%m-%d")
             cursor.execute("INSERT INTO prestamos (banco, monto_total, cuota_mensual, dia_pago, fecha_inicio) VALUES (?, ?, ?, ?, ?)",
                            (banco, monto_total, cuota_mensual, dia_pago, fecha_inicio))
-            self.conn.commit()
+            self._commit("prestamos")
             return True
         except Exception as e:
             print(f"Error al agregar préstamo: {e}")
@@ -585,12 +716,17 @@ class Database:
     def obtener_prestamos(self):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM prestamos WHERE activo = 1 ORDER BY dia_pago")
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("""
+                SELECT id, banco, monto_total, monto_pagado, cuota_mensual, dia_pago
+                FROM prestamos WHERE activo = 1 ORDER BY dia_pago
+            """)
             return cursor.fetchall()
         except Exception as e:
             print(f"Error al obtener préstamos: {e}")
             return []
     
+    @cacheado("prestamos")
     def obtener_total_cuotas_prestamos(self):
         try:
             cursor = self.conn.cursor()
@@ -601,6 +737,7 @@ class Database:
             print(f"Error al obtener total de cuotas: {e}")
             return 0
     
+    @cacheado("prestamos")
     def obtener_deuda_total(self):
         try:
             cursor = self.conn.cursor()
@@ -626,21 +763,14 @@ class Database:
                 else:
                     cursor.execute("UPDATE prestamos SET monto_pagado = ? WHERE id = ?", 
                                    (nuevo_monto_pagado, id_prestamo))
-                self.conn.commit()
+                self._commit("prestamos")
                 return True
         except Exception as e:
             print(f"Error al registrar pago: {e}")
             return False
     
     def borrar_prestamo(self, id_prestamo):
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("UPDATE prestamos SET activo = 0 WHERE id = ?", (id_prestamo,))
-            self.conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error al borrar préstamo: {e}")
-            return False
+        return self.borrar_muchos("prestamos", [id_prestamo])
     
     # --- Métodos para Ahorros ---
     
@@ -650,7 +780,7 @@ class Database:
             fecha_inicio = datetime.datetime.now().strftime("%Y-%m-%d")
             cursor.execute("INSERT INTO ahorros (nombre, meta, fecha_inicio) VALUES (?, ?, ?)",
                            (nombre, meta, fecha_inicio))
-            self.conn.commit()
+            self._commit("ahorros")
             return True
         except Exception as e:
             print(f"Error al agregar ahorro: {e}")
@@ -659,12 +789,14 @@ class Database:
     def obtener_ahorros(self):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM ahorros WHERE completado = 0 ORDER BY fecha_inicio DESC")
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("SELECT id, nombre, meta, monto_actual, fecha_inicio FROM ahorros WHERE completado = 0 ORDER BY fecha_inicio DESC")
             return cursor.fetchall()
         except Exception as e:
             print(f"Error al obtener ahorros: {e}")
             return []
     
+    @cacheado("ahorros")
     def obtener_total_ahorros(self):
         try:
             cursor = self.conn.cursor()
@@ -690,7 +822,7 @@ class Database:
                 else:
                     cursor.execute("UPDATE ahorros SET monto_actual = ? WHERE id = ?", 
                                    (nuevo_monto, id_ahorro))
-                self.conn.commit()
+                self._commit("ahorros")
                 return True
         except Exception as e:
             print(f"Error al agregar monto: {e}")
@@ -706,21 +838,14 @@ class Database:
                 nuevo_monto = max(0, monto_actual - monto)
                 cursor.execute("UPDATE ahorros SET monto_actual = ? WHERE id = ?", 
                                (nuevo_monto, id_ahorro))
-                self.conn.commit()
+                self._commit("ahorros")
                 return True
         except Exception as e:
             print(f"Error al retirar monto: {e}")
             return False
     
     def borrar_ahorro(self, id_ahorro):
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("UPDATE ahorros SET completado = 1 WHERE id = ?", (id_ahorro,))
-            self.conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error al borrar ahorro: {e}")
-            return False
+        return self.borrar_muchos("ahorros", [id_ahorro])
     
     # --- Métodos para Compras a Crédito ---
     
@@ -736,7 +861,7 @@ class Database:
             fecha_compra = datetime.datetime.now().strftime("%Y-%m-%d")
             cursor.execute("INSERT INTO creditos (descripcion, banco, monto_total, meses_sin_intereses, cuota_mensual, fecha_compra, tasa_interes) VALUES (?, ?, ?, ?, ?, ?, ?)",
                            (descripcion, banco, monto_total, meses_plazo, cuota_mensual, fecha_compra, tasa_interes))
-            self.conn.commit()
+            self._commit("creditos")
             return True
         except Exception as e:
             print(f"Error al agregar crédito: {e}")
@@ -751,6 +876,7 @@ class Database:
             print(f"Error al obtener créditos: {e}")
             return []
     
+    @cacheado("creditos")
     def obtener_total_cuotas_creditos(self):
         try:
             cursor = self.conn.cursor()
@@ -761,6 +887,7 @@ class Database:
             print(f"Error al obtener total de cuotas: {e}")
             return 0
     
+    @cacheado("creditos")
     def obtener_deuda_total_creditos(self):
         try:
             cursor = self.conn.cursor()
@@ -787,21 +914,14 @@ class Database:
                 else:
                     cursor.execute("UPDATE creditos SET meses_pagados = ? WHERE id = ?", 
                                    (nuevos_meses_pagados, id_credito))
-                self.conn.commit()
+                self._commit("creditos")
                 return True
         except Exception as e:
             print(f"Error al registrar pago de crédito: {e}")
             return False
     
     def borrar_credito(self, id_credito):
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("UPDATE creditos SET pagado = 1 WHERE id = ?", (id_credito,))
-            self.conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error al borrar crédito: {e}")
-            return False
+        return self.borrar_muchos("creditos", [id_credito])
     
     # --- Métodos para Cuentas Bancarias ---
     
@@ -811,7 +931,7 @@ class Database:
             fecha_creacion = datetime.datetime.now().strftime("%Y-%m-%d")
             cursor.execute("INSERT INTO cuentas_bancarias (nombre_banco, tipo_cuenta, saldo, limite_credito, fecha_creacion) VALUES (?, ?, ?, ?, ?)",
                            (nombre_banco, tipo_cuenta, saldo_inicial, limite_credito, fecha_creacion))
-            self.conn.commit()
+            self._commit("cuentas_bancarias")
             return True
         except Exception as e:
             print(f"Error al agregar cuenta bancaria: {e}")
@@ -820,12 +940,17 @@ class Database:
     def obtener_cuentas_bancarias(self):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM cuentas_bancarias WHERE activa = 1 ORDER BY nombre_banco")
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("""
+                SELECT id, nombre_banco, tipo_cuenta, saldo, limite_credito, fecha_creacion
+                FROM cuentas_bancarias WHERE activa = 1 ORDER BY nombre_banco
+            """)
             return cursor.fetchall()
         except Exception as e:
             print(f"Error al obtener cuentas bancarias: {e}")
             return []
     
+    @cacheado("cuentas_bancarias")
     def obtener_saldo_total_bancos(self):
         try:
             cursor = self.conn.cursor()
@@ -840,7 +965,7 @@ class Database:
         try:
             cursor = self.conn.cursor()
             cursor.execute("UPDATE cuentas_bancarias SET saldo = ? WHERE id = ?", (nuevo_saldo, id_cuenta))
-            self.conn.commit()
+            self._commit("cuentas_bancarias")
             return True
         except Exception as e:
             print(f"Error al actualizar saldo: {e}")
@@ -871,14 +996,26 @@ class Database:
             return False
     
     def borrar_cuenta_bancaria(self, id_cuenta):
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("UPDATE cuentas_bancarias SET activa = 0 WHERE id = ?", (id_cuenta,))
-            self.conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error al borrar cuenta: {e}")
-            return False
+        return self.borrar_muchos("cuentas_bancarias", [id_cuenta])
+    
+    def _commit(self, *tablas):
+        """Confirma la transacción e invalida las consultas memorizadas que
+        dependen de las tablas modificadas (todas si no se indica ninguna)"""
+        self.conn.commit()
+        self.invalidar_cache(*tablas)
+    
+    def invalidar_cache(self, *tablas):
+        """Marca los datos como modificados: sube la versión y descarta las
+        consultas memorizadas de esas tablas (todas si no se indica ninguna)"""
+        with self._candado_cache:
+            self.version += 1
+            if not tablas:
+                self._cache.clear()
+                self._claves_por_tabla.clear()
+                return
+            for tabla in tablas:
+                for clave in self._claves_por_tabla.pop(tabla, ()):
+                    self._cache.pop(clave, None)
     
     def close(self):
         if self.conn:
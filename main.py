@@ -1,15 +1,26 @@
 import flet as ft
+import asyncio
+import bisect
 import datetime
 import os
+import re
+from collections import namedtuple
+from dataclasses import dataclass
+from functools import partial
 
 # Importar módulos locales
 from database import Database
 from utils import (
     get_persistent_db_path,
+    carpeta_exportacion,
     obtener_colores,
+    fecha_actual,
+    formato_dinero,
     EXCEL_DISPONIBLE,
     CATEGORIAS,
+    CATEGORIAS_GASTO,
     COLORES_CATEGORIAS,
+    ICONOS_CUENTA,
     MESES_NOMBRES,
     MESES_CORTOS,
     ONBOARDING_PAGES
@@ -23,6 +34,118 @@ else:
         return False, "Excel no disponible"
 
 
+# Campo de formulario para validar_campos: si 'defecto' es None el campo es obligatorio
+Campo = namedtuple("Campo", "control convertir es_valido mensaje defecto", defaults=(str, None, None, None))
+
+# Destinos de la barra de navegación: (vista, icono, icono seleccionado, etiqueta).
+# El último destino, "Más", abre un menú en lugar de una vista
+DESTINOS_NAVEGACION = (
+    ("inicio", "home_outlined", "home", "Inicio"),
+    ("balance", "receipt_long_outlined", "receipt_long", "Balance"),
+    ("presupuestos", "pie_chart_outline", "pie_chart", "Gastos"),
+    ("ahorros", "savings_outlined", "savings", "Ahorros"),
+    (None, "more_horiz", "more_horiz", "Más"),
+)
+VISTAS_NAVEGACION = tuple(vista for vista, *_ in DESTINOS_NAVEGACION if vista is not None)
+
+# Tramos de gasto de un presupuesto (en % del límite) y su (clave de color, estado)
+UMBRALES_PRESUPUESTO = (80, 100)
+ESTADOS_PRESUPUESTO = (
+    ("verde", "✅ Dentro del presupuesto"),
+    ("naranja", "⚡ Cerca del límite"),
+    ("rojo", "⚠️ Excedido"),
+)
+
+# Controles de una fila de presupuesto que cambian al refrescar la vista
+FilaPresupuesto = namedtuple("FilaPresupuesto", "estado gasto limite progreso campo_limite borrar")
+
+# Formato aceptado por cada conversor numérico; se valida antes de convertir
+# para no usar excepciones como control de flujo al teclear mal un número
+PATRONES_NUMERICOS = {
+    float: re.compile(r"^\s*-?(?:\d+(?:\.\d*)?|\.\d+)\s*$"),
+    int: re.compile(r"^\s*-?\d+\s*$"),
+}
+
+
+def campo_dia(control):
+    """Campo de día del mes (cobro o pago), válido entre 1 y 31"""
+    return Campo(control, int, lambda dia: 1 <= dia <= 31, "Debe estar entre 1 y 31")
+
+
+# Valores de Flet usados en casi todas las vistas, resueltos una sola vez
+TECLADO_NUMERICO = ft.KeyboardType.NUMBER
+NEGRITA = ft.FontWeight.BOLD
+CENTRADO = ft.CrossAxisAlignment.CENTER
+SCROLL_AUTO = ft.ScrollMode.AUTO
+
+
+@dataclass(slots=True)
+class EstadoOperacion:
+    """Registro pendiente de las hojas de pago de préstamo y de agregar/retirar monto"""
+    prestamo_id: int | None = None
+    ahorro_id: int | None = None
+    tipo_ahorro: str = "agregar"  # "agregar" o "retirar"
+    cuenta_id: int | None = None
+    tipo_banco: str = "depositar"  # "depositar" o "retirar"
+
+
+def crear_campo(label, borde, borde_foco=None, numerico=False, **kwargs):
+    """Crea un TextField de formulario con el estilo común de los diálogos"""
+    return ft.TextField(
+        label=label,
+        keyboard_type=TECLADO_NUMERICO if numerico else None,
+        color="black",
+        text_size=16,
+        border_color=borde,
+        focused_border_color=borde_foco or borde,
+        **kwargs
+    )
+
+
+
+def limpiar_campos(*campos, valor=""):
+    """Deja los campos con el valor inicial y sin mensaje de error"""
+    for campo in campos:
+        campo.value = valor
+        campo.error_text = None
+
+# Bordes superiores redondeados compartidos por todas las hojas inferiores
+RADIO_HOJA = ft.border_radius.only(top_left=20, top_right=20)
+
+# Desplazamiento de la sombra de las tarjetas
+DESPLAZAMIENTO_SOMBRA = ft.Offset(0, 2)
+
+# Sombra de las tarjetas de las listas (no depende del tema)
+SOMBRA_TARJETA = ft.BoxShadow(spread_radius=0, blur_radius=4, color="black12", offset=DESPLAZAMIENTO_SOMBRA)
+
+
+def separador():
+    """Espacio vertical entre tarjetas (los controles no se pueden compartir)"""
+    return ft.Divider(height=5, color="transparent")
+
+
+def crear_bottom_sheet(titulo, controles, on_guardar, texto_boton="Guardar", spacing=15):
+    """Crea una hoja inferior de formulario: título, controles y botón de confirmar"""
+    return ft.BottomSheet(
+        ft.Container(
+            ft.Column(
+                [
+                    ft.Text(titulo, size=20, weight=NEGRITA),
+                    *controles,
+                    ft.ElevatedButton(texto_boton, on_click=on_guardar, width=float("inf"))
+                ],
+                tight=True,
+                spacing=spacing,
+                scroll=SCROLL_AUTO
+            ),
+            padding=20,
+            border_radius=RADIO_HOJA
+        ),
+        is_scroll_controlled=True,
+        use_safe_area=True
+    )
+
+
 # --- Interfaz Gráfica (Flet) ---
 def main(page: ft.Page):
     # Configuración básica
@@ -53,6 +176,7 @@ def main(page: ft.Page):
         page.update()
         return
     # Colores según tema - usando la función de utils.py
+    # (obtener_colores retorna paletas constantes, no se crean en cada llamada)
     def get_colores():
         es_oscuro = page.theme_mode == ft.ThemeMode.DARK
         return obtener_colores(es_oscuro)
@@ -71,22 +195,26 @@ def main(page: ft.Page):
     contenedor_app = ft.Container(expand=True, visible=False)
     
     # Campos para PIN
-    pin_inputs = []
-    for i in range(4):
-        pin_inputs.append(ft.TextField(
+    pin_inputs = tuple(
+        ft.TextField(
             width=50,
             height=60,
             text_align=ft.TextAlign.CENTER,
-            keyboard_type=ft.KeyboardType.NUMBER,
+            keyboard_type=TECLADO_NUMERICO,
             max_length=1,
             text_size=24,
             border_radius=10,
             password=True,
             on_change=lambda e, idx=i: manejar_pin_input(e, idx)
-        ))
+        )
+        for i in range(4)
+    )
+    
+    # En el móvil no se enfoca el primer campo al limpiar: abriría el teclado sin que se pida
+    es_movil = page.platform in (ft.PagePlatform.ANDROID, ft.PagePlatform.IOS)
     
     txt_pin_mensaje = ft.Text("", color="red", size=14, text_align=ft.TextAlign.CENTER)
-    txt_pin_titulo = ft.Text("Ingresa tu PIN", size=24, weight=ft.FontWeight.BOLD, text_align=ft.TextAlign.CENTER)
+    txt_pin_titulo = ft.Text("Ingresa tu PIN", size=24, weight=NEGRITA, text_align=ft.TextAlign.CENTER)
     
     def manejar_pin_input(e, idx):
         """Maneja la entrada de PIN y pasa al siguiente campo"""
@@ -125,7 +253,8 @@ def main(page: ft.Page):
         """Limpia los campos de PIN"""
         for p in pin_inputs:
             p.value = ""
-        pin_inputs[0].focus()
+        if not es_movil:
+            pin_inputs[0].focus()
     
     def desbloquear_app():
         """Desbloquea la app y muestra la pantalla principal"""
@@ -159,52 +288,19 @@ def main(page: ft.Page):
     
     onboarding_index = [0]
     
-    onboarding_pages = [
-        {
-            "icono": "account_balance_wallet",
-            "titulo": "¡Bienvenido a Mis Finanzas!",
-            "descripcion": "Tu asistente personal para controlar ingresos, gastos y alcanzar tus metas financieras.",
-            "color": "blue"
-        },
-        {
-            "icono": "trending_up",
-            "titulo": "Controla tus Movimientos",
-            "descripcion": "Registra fácilmente todos tus ingresos y gastos. Categoriza y mantén un historial completo.",
-            "color": "green"
-        },
-        {
-            "icono": "subscriptions",
-            "titulo": "Gestiona Suscripciones",
-            "descripcion": "Nunca pierdas de vista tus pagos recurrentes como Netflix, Spotify y más.",
-            "color": "orange"
-        },
-        {
-            "icono": "savings",
-            "titulo": "Alcanza tus Metas",
-            "descripcion": "Crea metas de ahorro y visualiza tu progreso. ¡Cada peso cuenta!",
-            "color": "teal"
-        },
-        {
-            "icono": "pie_chart",
-            "titulo": "Visualiza tus Finanzas",
-            "descripcion": "Gráficos y reportes para entender mejor cómo gastas tu dinero.",
-            "color": "purple"
-        }
-    ]
-    
     contenedor_onboarding = ft.Container(visible=False, expand=True)
     
     def crear_pagina_onboarding(index):
         """Crea una página del onboarding"""
-        p = onboarding_pages[index]
+        p = ONBOARDING_PAGES[index]
         return ft.Container(
             content=ft.Column([
                 ft.Container(height=50),
-                ft.Icon(p["icono"], size=120, color=p["color"]),
+                ft.Icon(p.icono, size=120, color=p.color),
                 ft.Container(height=30),
-                ft.Text(p["titulo"], size=28, weight=ft.FontWeight.BOLD, text_align=ft.TextAlign.CENTER),
+                ft.Text(p.titulo, size=28, weight=NEGRITA, text_align=ft.TextAlign.CENTER),
                 ft.Container(height=20),
-                ft.Text(p["descripcion"], size=16, text_align=ft.TextAlign.CENTER, color="grey600"),
+                ft.Text(p.descripcion, size=16, text_align=ft.TextAlign.CENTER, color="grey600"),
                 ft.Container(height=50),
                 # Indicadores de página
                 ft.Row(
@@ -212,22 +308,22 @@ def main(page: ft.Page):
                         width=10 if i != index else 30,
                         height=10,
                         border_radius=5,
-                        bgcolor=p["color"] if i == index else "grey300"
-                    ) for i in range(len(onboarding_pages))],
+                        bgcolor=p.color if i == index else "grey300"
+                    ) for i in range(len(ONBOARDING_PAGES))],
                     alignment=ft.MainAxisAlignment.CENTER,
                     spacing=5
                 ),
                 ft.Container(height=30),
                 ft.Row([
-                    ft.TextButton("Saltar", on_click=lambda e: finalizar_onboarding()) if index < len(onboarding_pages) - 1 else ft.Container(),
+                    ft.TextButton("Saltar", on_click=lambda e: finalizar_onboarding()) if index < len(ONBOARDING_PAGES) - 1 else ft.Container(),
                     ft.ElevatedButton(
-                        "Siguiente" if index < len(onboarding_pages) - 1 else "¡Comenzar!",
+                        "Siguiente" if index < len(ONBOARDING_PAGES) - 1 else "¡Comenzar!",
                         on_click=lambda e: siguiente_onboarding(),
-                        bgcolor=p["color"],
+                        bgcolor=p.color,
                         color="white"
                     )
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
-            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            ], horizontal_alignment=CENTRADO),
             padding=30,
             expand=True
         )
@@ -242,7 +338,7 @@ def main(page: ft.Page):
     
     def siguiente_onboarding():
         """Avanza a la siguiente página del onboarding"""
-        if onboarding_index[0] < len(onboarding_pages) - 1:
+        if onboarding_index[0] < len(ONBOARDING_PAGES) - 1:
             onboarding_index[0] += 1
             contenedor_onboarding.content = crear_pagina_onboarding(onboarding_index[0])
             page.update()
@@ -262,15 +358,15 @@ def main(page: ft.Page):
     # =====================================================
     
     # Texto del Balance
-    txt_balance_total = ft.Text("$0", size=36, weight=ft.FontWeight.BOLD)
-    txt_ingresos = ft.Text("$0", color="green", size=16, weight=ft.FontWeight.BOLD)
-    txt_gastos = ft.Text("$0", color="red", size=16, weight=ft.FontWeight.BOLD)
-    txt_suscripciones = ft.Text("$0", color="orange", size=16, weight=ft.FontWeight.BOLD)
-    txt_prestamos = ft.Text("$0", color="purple", size=16, weight=ft.FontWeight.BOLD)
-    txt_creditos = ft.Text("$0", color="indigo", size=16, weight=ft.FontWeight.BOLD)
-    txt_ahorros = ft.Text("$0", color="teal", size=16, weight=ft.FontWeight.BOLD)
-    txt_bancos = ft.Text("$0", color="cyan900", size=16, weight=ft.FontWeight.BOLD)
-    txt_disponible = ft.Text("$0", size=20, weight=ft.FontWeight.BOLD, color="blue700")
+    txt_balance_total = ft.Text("$0", size=36, weight=NEGRITA)
+    txt_ingresos = ft.Text("$0", color="green", size=16, weight=NEGRITA)
+    txt_gastos = ft.Text("$0", color="red", size=16, weight=NEGRITA)
+    txt_suscripciones = ft.Text("$0", color="orange", size=16, weight=NEGRITA)
+    txt_prestamos = ft.Text("$0", color="purple", size=16, weight=NEGRITA)
+    txt_creditos = ft.Text("$0", color="indigo", size=16, weight=NEGRITA)
+    txt_ahorros = ft.Text("$0", color="teal", size=16, weight=NEGRITA)
+    txt_bancos = ft.Text("$0", color="cyan900", size=16, weight=NEGRITA)
+    txt_disponible = ft.Text("$0", size=20, weight=NEGRITA, color="blue700")
 
     # Contenedores para diferentes vistas
     contenedor_principal = ft.Column(spacing=0, expand=True)
@@ -279,17 +375,17 @@ def main(page: ft.Page):
     input_desc = ft.TextField(
         label="Descripción",
         hint_text="Ej: Supermercado",
-        color=colores["texto"],
+        color=colores.texto,
         text_size=16,
-        border_color=colores["input_border"],
+        border_color=colores.input_border,
         focused_border_color="blue900"
     )
     input_monto = ft.TextField(
         label="Monto",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color=colores["texto"],
+        keyboard_type=TECLADO_NUMERICO,
+        color=colores.texto,
         text_size=16,
-        border_color=colores["input_border"],
+        border_color=colores.input_border,
         focused_border_color="blue900"
     )
     dropdown_tipo = ft.Dropdown(
@@ -345,8 +441,7 @@ def main(page: ft.Page):
         cuentas = db.obtener_cuentas_bancarias()
         opciones = []
         for cuenta in cuentas:
-            id_cuenta, nombre_banco, tipo_cuenta, saldo, limite_credito, fecha_creacion, activa = cuenta
-            opciones.append(ft.dropdown.Option(f"banco_{id_cuenta}", f"{nombre_banco} ({tipo_cuenta})"))
+            opciones.append(ft.dropdown.Option(str(cuenta['id']), f"{cuenta['nombre_banco']} ({cuenta['tipo_cuenta']})"))
         dropdown_banco_movimiento.options = opciones
         if opciones:
             dropdown_banco_movimiento.value = opciones[0].key
@@ -360,8 +455,17 @@ def main(page: ft.Page):
 
     # --- Funciones de Lógica ---
 
+    # Versión de los datos con la que se calcularon por última vez los textos del balance
+    version_balance = None
+    
     def actualizar_balance():
-        """Actualiza los textos del balance"""
+        """Actualiza los textos del balance; si no hubo escrituras desde la
+        última vez, los textos siguen vigentes y no se consulta la base"""
+        nonlocal version_balance
+        if version_balance == db.version:
+            return
+        version_balance = db.version
+        
         ingresos, gastos, total = db.obtener_balance()
         total_suscripciones = db.obtener_total_suscripciones()
         total_cuotas_prestamos = db.obtener_total_cuotas_prestamos()
@@ -370,15 +474,15 @@ def main(page: ft.Page):
         total_bancos = db.obtener_saldo_total_bancos()
         disponible = total - total_suscripciones - total_cuotas_prestamos - total_cuotas_creditos
         
-        txt_balance_total.value = f"${total:,.0f}"
-        txt_ingresos.value = f"${ingresos:,.0f}"
-        txt_gastos.value = f"${gastos:,.0f}"
-        txt_suscripciones.value = f"${total_suscripciones:,.0f}"
-        txt_prestamos.value = f"${total_cuotas_prestamos:,.0f}"
-        txt_creditos.value = f"${total_cuotas_creditos:,.0f}"
-        txt_ahorros.value = f"${total_ahorros:,.0f}"
-        txt_bancos.value = f"${total_bancos:,.0f}"
-        txt_disponible.value = f"${disponible:,.0f}"
+        txt_balance_total.value = formato_dinero(total)
+        txt_ingresos.value = formato_dinero(ingresos)
+        txt_gastos.value = formato_dinero(gastos)
+        txt_suscripciones.value = formato_dinero(total_suscripciones)
+        txt_prestamos.value = formato_dinero(total_cuotas_prestamos)
+        txt_creditos.value = formato_dinero(total_cuotas_creditos)
+        txt_ahorros.value = formato_dinero(total_ahorros)
+        txt_bancos.value = formato_dinero(total_bancos)
+        txt_disponible.value = formato_dinero(disponible)
 
     # =====================================================
     # DIÁLOGOS DE CONFIRMACIÓN Y EDICIÓN
@@ -402,26 +506,25 @@ def main(page: ft.Page):
     def confirmar_borrado(tipo, id_registro, nombre=""):
         """Muestra diálogo de confirmación antes de borrar"""
         dialogo_confirmacion.content = ft.Text(f"¿Eliminar {nombre}?")
-        dialogo_confirmacion.actions[1].on_click = lambda e: ejecutar_borrado(tipo, id_registro)
+        dialogo_confirmacion.actions[1].on_click = lambda e: ejecutar_borrado(tipo, [id_registro])
         dialogo_confirmacion.open = True
         page.update()
     
-    def ejecutar_borrado(tipo, id_registro):
-        """Ejecuta el borrado después de confirmación"""
-        if tipo == "movimiento":
-            db.borrar_movimiento(id_registro)
-        elif tipo == "suscripcion":
-            db.borrar_suscripcion(id_registro)
-        elif tipo == "prestamo":
-            db.borrar_prestamo(id_registro)
-        elif tipo == "ahorro":
-            db.borrar_ahorro(id_registro)
-        elif tipo == "credito":
-            db.borrar_credito(id_registro)
-        elif tipo == "cuenta":
-            db.borrar_cuenta_bancaria(id_registro)
-        elif tipo == "presupuesto":
-            db.borrar_presupuesto(id_registro)
+    # Tabla de la base de datos según el tipo de registro a borrar
+    TABLAS_BORRADO = {
+        "movimiento": "movimientos",
+        "suscripcion": "suscripciones",
+        "prestamo": "prestamos",
+        "ahorro": "ahorros",
+        "credito": "creditos",
+        "cuenta": "cuentas_bancarias",
+        "presupuesto": "presupuestos",
+    }
+    
+    def ejecutar_borrado(tipo, ids):
+        """Ejecuta el borrado después de confirmación; varios registros se
+        borran en una sola transacción y con un solo refresco de la vista"""
+        db.borrar_muchos(TABLAS_BORRADO[tipo], ids)
         
         cerrar_dialogo()
         actualizar_vista()
@@ -466,15 +569,67 @@ def main(page: ft.Page):
     
     mostrar_filtros = [False]
     
-    def aplicar_filtros():
-        """Aplica los filtros y actualiza la vista"""
+    # Espera tras la última tecla/cambio de filtro antes de reconstruir la lista
+    RETARDO_FILTROS = 0.3
+    tarea_filtros = None
+    
+    async def filtrar_tras_pausa():
+        await asyncio.sleep(RETARDO_FILTROS)
         actualizar_vista()
     
+    def aplicar_filtros():
+        """Aplica los filtros y actualiza la vista cuando se deja de escribir.
+        La espera corre en el bucle de la página, no en un hilo aparte"""
+        nonlocal tarea_filtros
+        if tarea_filtros is not None:
+            tarea_filtros.cancel()
+        tarea_filtros = page.run_task(filtrar_tras_pausa)
+    
     def toggle_filtros():
         """Muestra/oculta los filtros"""
         mostrar_filtros[0] = not mostrar_filtros[0]
         actualizar_vista()
-    
+
+    # =====================================================
+    # CARGA POR LOTES DE LISTAS LARGAS
+    # =====================================================
+
+    TAMANO_LOTE = 20
+
+    def cargar_por_lotes(lista, registros, crear_item, lote=TAMANO_LOTE):
+        """Construye los elementos de la lista por lotes a medida que se hace scroll.
+        Mientras queden registros se muestra "Ver más" al final, por si el primer
+        lote no llena la pantalla y la lista no llega a tener scroll"""
+        cargados = [0]
+
+        def cargar_siguiente_lote():
+            inicio = cargados[0]
+            if lista.controls and lista.controls[-1] is ver_mas:
+                lista.controls.pop()
+            lista.controls.extend([crear_item(registro) for registro in registros[inicio:inicio + lote]])
+            cargados[0] = min(inicio + lote, len(registros))
+            if cargados[0] < len(registros):
+                lista.controls.append(ver_mas)
+
+        def al_pulsar_ver_mas(e):
+            cargar_siguiente_lote()
+            lista.update()
+
+        ver_mas = ft.Container(
+            content=ft.TextButton("Ver más", on_click=al_pulsar_ver_mas),
+            alignment=ft.alignment.center,
+        )
+
+        def al_hacer_scroll(e):
+            # Cargar el siguiente lote cuando se acerca al final de la lista
+            if cargados[0] < len(registros) and e.pixels >= e.max_scroll_extent - 400:
+                cargar_siguiente_lote()
+                lista.update()
+
+        cargar_siguiente_lote()
+        if cargados[0] < len(registros):
+            lista.on_scroll = al_hacer_scroll
+
     # =====================================================
     # VISTA DE INICIO CON MEJORAS
     # =====================================================
@@ -482,39 +637,38 @@ def main(page: ft.Page):
     def crear_vista_inicio():
         """Crea la vista principal con gráficos interactivos y movimientos"""
         colores = get_colores()
+        c_texto_secundario = colores.texto_secundario
+        c_borde = colores.borde
+        c_texto = colores.texto
+        c_rojo = colores.rojo
+        c_naranja = colores.naranja
+        c_verde = colores.verde
+        c_azul = colores.azul
+        c_tarjeta = colores.tarjeta
+        c_verde_bg = colores.verde_bg
+        c_rojo_bg = colores.rojo_bg
+        c_azul_bg = colores.azul_bg
         
         # Datos del mes actual
-        ahora = datetime.datetime.now()
+        ahora = fecha_actual()
         mes_actual = ahora.month
         anio_actual = ahora.year
-        meses_nombres = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", 
-                        "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
-        mes_nombre = meses_nombres[mes_actual - 1]
+        mes_nombre = MESES_NOMBRES[mes_actual - 1]
         
         # Obtener datos financieros del mes
-        ingresos_mes, gastos_mes = db.obtener_balance_mensual(mes_actual, anio_actual)
-        total_subs = db.obtener_total_suscripciones()
-        total_cuotas = db.obtener_total_cuotas_prestamos()
-        total_creditos = db.obtener_total_cuotas_creditos()
+        ingresos_mes, gastos_mes, total_subs, total_cuotas, total_creditos = db.obtener_resumen_mensual(mes_actual, anio_actual)
         gastos_fijos = total_subs + total_cuotas + total_creditos
         disponible_mes = ingresos_mes - gastos_mes - gastos_fijos
         
         # Gastos por categoría
         gastos_categoria = db.obtener_gastos_por_categoria(mes_actual, anio_actual)
         
-        # Colores para categorías
-        colores_cat = {
-            "Comida": "#FF6384", "Transporte": "#36A2EB", "Servicios": "#FFCE56",
-            "Ocio": "#4BC0C0", "Salud": "#9966FF", "Salario": "#2ECC71",
-            "Compras": "#FF9F40", "Educación": "#E74C3C", "Otro": "#95A5A6"
-        }
-        
         # === GRÁFICO CIRCULAR DE DISTRIBUCIÓN ===
         def crear_grafico_circular():
             total_egresos = gastos_mes + gastos_fijos
             if total_egresos <= 0:
                 return ft.Container(
-                    content=ft.Text("Sin gastos este mes", color=colores["texto_secundario"], italic=True),
+                    content=ft.Text("Sin gastos este mes", color=c_texto_secundario, italic=True),
                     alignment=ft.alignment.center,
                     padding=20
                 )
@@ -530,24 +684,24 @@ def main(page: ft.Page):
                             ft.Container(
                                 width=100, height=100,
                                 border_radius=50,
-                                bgcolor=colores["borde"],
+                                bgcolor=c_borde,
                             ),
                             ft.Container(
                                 width=100, height=100,
                                 content=ft.Column([
-                                    ft.Text(f"${total_egresos:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                                    ft.Text("Total", size=10, color=colores["texto_secundario"])
-                                ], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                                    ft.Text(formato_dinero(total_egresos), size=14, weight=NEGRITA, color=c_texto),
+                                    ft.Text("Total", size=10, color=c_texto_secundario)
+                                ], alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=CENTRADO),
                             ),
                         ]),
                         ft.Column([
                             ft.Row([
-                                ft.Container(width=12, height=12, bgcolor=colores["rojo"], border_radius=3),
-                                ft.Text(f"Gastos: {pct_gastos:.0f}%", size=12, color=colores["texto"])
+                                ft.Container(width=12, height=12, bgcolor=c_rojo, border_radius=3),
+                                ft.Text(f"Gastos: {pct_gastos:.0f}%", size=12, color=c_texto)
                             ], spacing=8),
                             ft.Row([
-                                ft.Container(width=12, height=12, bgcolor=colores["naranja"], border_radius=3),
-                                ft.Text(f"Fijos: {pct_fijos:.0f}%", size=12, color=colores["texto"])
+                                ft.Container(width=12, height=12, bgcolor=c_naranja, border_radius=3),
+                                ft.Text(f"Fijos: {pct_fijos:.0f}%", size=12, color=c_texto)
                             ], spacing=8),
                         ], spacing=8)
                     ], alignment=ft.MainAxisAlignment.SPACE_AROUND),
@@ -564,27 +718,27 @@ def main(page: ft.Page):
             # Calcular si vamos bien o mal
             if ingresos_mes > 0:
                 progreso_gastos = (gastos_mes + gastos_fijos) / ingresos_mes
-                estado_color = colores["verde"] if progreso_gastos <= progreso_dias else colores["rojo"]
+                estado_color = c_verde if progreso_gastos <= progreso_dias else c_rojo
                 estado_texto = "✅ Vas bien" if progreso_gastos <= progreso_dias else "⚠️ Cuidado"
             else:
                 progreso_gastos = 0
-                estado_color = colores["texto_secundario"]
+                estado_color = c_texto_secundario
                 estado_texto = "Sin ingresos"
             
             return ft.Container(
                 content=ft.Column([
                     ft.Row([
-                        ft.Text(f"📅 Día {dia_actual} de {dias_mes}", size=13, color=colores["texto"]),
-                        ft.Text(estado_texto, size=13, color=estado_color, weight=ft.FontWeight.BOLD)
+                        ft.Text(f"📅 Día {dia_actual} de {dias_mes}", size=13, color=c_texto),
+                        ft.Text(estado_texto, size=13, color=estado_color, weight=NEGRITA)
                     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                    ft.ProgressBar(value=progreso_dias, color=colores["azul"], bgcolor=colores["borde"], height=8),
+                    ft.ProgressBar(value=progreso_dias, color=c_azul, bgcolor=c_borde, height=8),
                     ft.Row([
-                        ft.Text(f"Gastado: ${gastos_mes + gastos_fijos:,.0f}", size=11, color=colores["rojo"]),
-                        ft.Text(f"de ${ingresos_mes:,.0f}", size=11, color=colores["texto_secundario"])
+                        ft.Text(f"Gastado: {formato_dinero(gastos_mes + gastos_fijos)}", size=11, color=c_rojo),
+                        ft.Text(f"de {formato_dinero(ingresos_mes)}", size=11, color=c_texto_secundario)
                     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 ], spacing=8),
                 padding=15,
-                bgcolor=colores["tarjeta"],
+                bgcolor=c_tarjeta,
                 border_radius=12,
                 margin=ft.margin.only(left=10, right=10, bottom=10)
             )
@@ -594,8 +748,12 @@ def main(page: ft.Page):
             if not gastos_categoria:
                 return ft.Container()
             
-            total_gastos = sum([g[1] for g in gastos_categoria])
-            max_gasto = max([g[1] for g in gastos_categoria]) if gastos_categoria else 1
+            total_gastos = 0
+            max_gasto = 0
+            for _, monto in gastos_categoria:
+                total_gastos += monto
+                if monto > max_gasto:
+                    max_gasto = monto
             
             # Solo mostrar top 4 categorías
             top_cats = sorted(gastos_categoria, key=lambda x: x[1], reverse=True)[:4]
@@ -604,12 +762,12 @@ def main(page: ft.Page):
             for cat, monto in top_cats:
                 pct = (monto / total_gastos * 100) if total_gastos > 0 else 0
                 ancho = (monto / max_gasto) if max_gasto > 0 else 0
-                color = colores_cat.get(cat, "#95A5A6")
+                color = COLORES_CATEGORIAS.get(cat, "#95A5A6")
                 
                 barras.append(
                     ft.Row([
                         ft.Container(
-                            content=ft.Text(cat[:8], size=10, color=colores["texto"]),
+                            content=ft.Text(cat[:8], size=10, color=c_texto),
                             width=65
                         ),
                         ft.Container(
@@ -619,23 +777,23 @@ def main(page: ft.Page):
                                 bgcolor=color,
                                 border_radius=4,
                             ),
-                            bgcolor=colores["borde"],
+                            bgcolor=c_borde,
                             border_radius=4,
                             width=120,
                             height=16,
                         ),
-                        ft.Text(f"{pct:.0f}%", size=10, color=colores["texto_secundario"], width=35)
+                        ft.Text(f"{pct:.0f}%", size=10, color=c_texto_secundario, width=35)
                     ], spacing=5)
                 )
             
             return ft.Container(
                 content=ft.Column([
-                    ft.Text("🏷️ Top Gastos", size=13, weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                    ft.Divider(height=5, color="transparent"),
+                    ft.Text("🏷️ Top Gastos", size=13, weight=NEGRITA, color=c_texto),
+                    separador(),
                     *barras
                 ], spacing=6),
                 padding=15,
-                bgcolor=colores["tarjeta"],
+                bgcolor=c_tarjeta,
                 border_radius=12,
                 margin=ft.margin.only(left=10, right=10, bottom=10)
             )
@@ -645,40 +803,40 @@ def main(page: ft.Page):
             return ft.Container(
                 content=ft.Column([
                     ft.Row([
-                        ft.Text(f"💰 {mes_nombre} {anio_actual}", size=18, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                        ft.Text(f"💰 {mes_nombre} {anio_actual}", size=18, weight=NEGRITA, color=c_texto),
                     ]),
                     ft.Divider(height=10, color="transparent"),
                     ft.Row([
                         ft.Container(
                             content=ft.Column([
-                                ft.Icon("trending_up", color=colores["verde"], size=22),
-                                ft.Text(f"${ingresos_mes:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["verde"]),
-                                ft.Text("Ingresos", size=10, color=colores["texto_secundario"])
-                            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                            bgcolor=colores["verde_bg"],
+                                ft.Icon("trending_up", color=c_verde, size=22),
+                                ft.Text(formato_dinero(ingresos_mes), size=14, weight=NEGRITA, color=c_verde),
+                                ft.Text("Ingresos", size=10, color=c_texto_secundario)
+                            ], horizontal_alignment=CENTRADO, spacing=2),
+                            bgcolor=c_verde_bg,
                             padding=10,
                             border_radius=10,
                             expand=True
                         ),
                         ft.Container(
                             content=ft.Column([
-                                ft.Icon("trending_down", color=colores["rojo"], size=22),
-                                ft.Text(f"${gastos_mes:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["rojo"]),
-                                ft.Text("Gastos", size=10, color=colores["texto_secundario"])
-                            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                            bgcolor=colores["rojo_bg"],
+                                ft.Icon("trending_down", color=c_rojo, size=22),
+                                ft.Text(formato_dinero(gastos_mes), size=14, weight=NEGRITA, color=c_rojo),
+                                ft.Text("Gastos", size=10, color=c_texto_secundario)
+                            ], horizontal_alignment=CENTRADO, spacing=2),
+                            bgcolor=c_rojo_bg,
                             padding=10,
                             border_radius=10,
                             expand=True
                         ),
                         ft.Container(
                             content=ft.Column([
-                                ft.Icon("account_balance_wallet", color=colores["azul"], size=22),
-                                ft.Text(f"${disponible_mes:,.0f}", size=14, weight=ft.FontWeight.BOLD, 
-                                       color=colores["verde"] if disponible_mes >= 0 else colores["rojo"]),
-                                ft.Text("Disponible", size=10, color=colores["texto_secundario"])
-                            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                            bgcolor=colores["azul_bg"],
+                                ft.Icon("account_balance_wallet", color=c_azul, size=22),
+                                ft.Text(formato_dinero(disponible_mes), size=14, weight=NEGRITA, 
+                                       color=c_verde if disponible_mes >= 0 else c_rojo),
+                                ft.Text("Disponible", size=10, color=c_texto_secundario)
+                            ], horizontal_alignment=CENTRADO, spacing=2),
+                            bgcolor=c_azul_bg,
                             padding=10,
                             border_radius=10,
                             expand=True
@@ -687,9 +845,49 @@ def main(page: ft.Page):
                 ]),
                 padding=15,
                 margin=10,
-                bgcolor=colores["tarjeta"],
+                bgcolor=c_tarjeta,
                 border_radius=15,
-                shadow=ft.BoxShadow(spread_radius=0, blur_radius=8, color="black12", offset=ft.Offset(0, 2))
+                shadow=ft.BoxShadow(spread_radius=0, blur_radius=8, color="black12", offset=DESPLAZAMIENTO_SOMBRA)
+            )
+        
+        # === FILA DE MOVIMIENTO ===
+        def crear_item_movimiento(mov):
+            id_mov, tipo, cat, monto, desc, fecha = mov
+            
+            icono = "trending_down" if tipo == "gasto" else "trending_up"
+            color_icono = c_rojo if tipo == "gasto" else c_verde
+            
+            return ft.Container(
+                content=ft.Row([
+                    ft.Icon(icono, color=color_icono, size=24),
+                    ft.Column([
+                        ft.Text(desc, weight=ft.FontWeight.W_500, size=14, color=c_texto),
+                        ft.Text(f"{cat} · {fecha}", size=11, color=c_texto_secundario),
+                    ], expand=True, spacing=1),
+                    ft.Column([
+                        ft.Text(formato_dinero(monto), weight=NEGRITA, color=color_icono, size=14),
+                        ft.Row([
+                            ft.IconButton(
+                                icon="edit_outlined",
+                                icon_color=c_azul,
+                                icon_size=16,
+                                tooltip="Editar",
+                                on_click=partial(abrir_editar, "movimiento", mov)
+                            ),
+                            ft.IconButton(
+                                icon="delete_outline", 
+                                icon_color=c_rojo,
+                                icon_size=16,
+                                tooltip="Borrar",
+                                on_click=lambda e, x=id_mov, d=desc: confirmar_borrado("movimiento", x, d)
+                            )
+                        ], spacing=0)
+                    ], alignment=ft.MainAxisAlignment.END, horizontal_alignment=ft.CrossAxisAlignment.END)
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                padding=10,
+                border_radius=10,
+                bgcolor=c_tarjeta,
+                border=ft.border.all(1, c_borde),
             )
         
         # === LISTA DE MOVIMIENTOS ===
@@ -708,53 +906,12 @@ def main(page: ft.Page):
             lista_movimientos.controls.append(
                 ft.Container(
                     content=ft.Text("No hay movimientos aún.\n¡Agrega tu primer movimiento!", 
-                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=colores["texto_secundario"]),
+                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=c_texto_secundario),
                     padding=30
                 )
             )
         else:
-            for mov in movimientos:
-                if len(mov) == 7:
-                    id_mov, tipo, cat, monto, desc, fecha, modo = mov
-                else:
-                    id_mov, tipo, cat, monto, desc, fecha = mov
-                
-                icono = "trending_down" if tipo == "gasto" else "trending_up"
-                color_icono = colores["rojo"] if tipo == "gasto" else colores["verde"]
-                
-                item = ft.Container(
-                    content=ft.Row([
-                        ft.Icon(icono, color=color_icono, size=24),
-                        ft.Column([
-                            ft.Text(desc, weight=ft.FontWeight.W_500, size=14, color=colores["texto"]),
-                            ft.Text(f"{cat} · {fecha}", size=11, color=colores["texto_secundario"]),
-                        ], expand=True, spacing=1),
-                        ft.Column([
-                            ft.Text(f"${monto:,.0f}", weight=ft.FontWeight.BOLD, color=color_icono, size=14),
-                            ft.Row([
-                                ft.IconButton(
-                                    icon="edit_outlined",
-                                    icon_color=colores["azul"],
-                                    icon_size=16,
-                                    tooltip="Editar",
-                                    on_click=lambda e, m=mov: abrir_editar_movimiento(m)
-                                ),
-                                ft.IconButton(
-                                    icon="delete_outline", 
-                                    icon_color=colores["rojo"],
-                                    icon_size=16,
-                                    tooltip="Borrar",
-                                    on_click=lambda e, x=id_mov, d=desc: confirmar_borrado("movimiento", x, d)
-                                )
-                            ], spacing=0)
-                        ], alignment=ft.MainAxisAlignment.END, horizontal_alignment=ft.CrossAxisAlignment.END)
-                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                    padding=10,
-                    border_radius=10,
-                    bgcolor=colores["tarjeta"],
-                    border=ft.border.all(1, colores["borde"]),
-                )
-                lista_movimientos.controls.append(item)
+            cargar_por_lotes(lista_movimientos, movimientos, crear_item_movimiento)
         
         # Barra de búsqueda compacta
         barra_busqueda = ft.Container(
@@ -762,7 +919,7 @@ def main(page: ft.Page):
                 ft.Container(content=input_busqueda, expand=True),
                 ft.IconButton(
                     icon="filter_list",
-                    icon_color=colores["azul"],
+                    icon_color=c_azul,
                     tooltip="Filtros",
                     on_click=lambda e: toggle_filtros()
                 )
@@ -776,14 +933,14 @@ def main(page: ft.Page):
             crear_grafico_categorias_mini(),
             ft.Container(
                 content=ft.Row([
-                    ft.Text("📋 Últimos Movimientos", size=14, weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                    ft.Text(f"({len(movimientos)})", size=12, color=colores["texto_secundario"])
+                    ft.Text("📋 Últimos Movimientos", size=14, weight=NEGRITA, color=c_texto),
+                    ft.Text(f"({len(movimientos)})", size=12, color=c_texto_secundario)
                 ]),
                 padding=ft.padding.only(left=15, top=5, bottom=5)
             ),
             barra_busqueda,
             lista_movimientos
-        ], spacing=0, expand=True, scroll=ft.ScrollMode.AUTO)
+        ], spacing=0, expand=True, scroll=SCROLL_AUTO)
     
     def crear_vista_suscripciones():
         """Crea la vista de suscripciones"""
@@ -796,65 +953,66 @@ def main(page: ft.Page):
         # Header con total
         header = ft.Container(
             content=ft.Column([
-                ft.Text("📆 Suscripciones Activas", size=20, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                ft.Text("📆 Suscripciones Activas", size=20, weight=NEGRITA, color=colores.texto),
                 ft.Divider(height=10, color="transparent"),
                 ft.Row([
-                    ft.Text("Total mensual:", size=16, color=colores["texto_secundario"]),
-                    ft.Text(f"${total:,.0f}", size=24, weight=ft.FontWeight.BOLD, color=colores["naranja"])
+                    ft.Text("Total mensual:", size=16, color=colores.texto_secundario),
+                    ft.Text(formato_dinero(total), size=24, weight=NEGRITA, color=colores.naranja)
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
             ]),
             padding=20,
-            bgcolor=colores["naranja_bg"],
+            bgcolor=colores.naranja_bg,
             border_radius=15,
             margin=10,
-            border=ft.border.all(1, colores["borde"])
+            border=ft.border.all(1, colores.borde)
         )
         
+        def crear_tarjeta_suscripcion(sub):
+            id_sub, nombre, monto, dia_cobro = sub
+            
+            return ft.Container(
+                content=ft.Row([
+                    ft.Icon("subscriptions", color=colores.naranja, size=28),
+                    ft.Column([
+                        ft.Text(nombre, weight=NEGRITA, size=15, color=colores.texto),
+                        ft.Text(f"Se cobra el día {dia_cobro} de cada mes", size=12, color=colores.texto_secundario),
+                    ], expand=True, spacing=2),
+                    ft.Column([
+                        ft.Text(f"{formato_dinero(monto)}/mes", weight=NEGRITA, color=colores.naranja, size=16),
+                        ft.Row([
+                            ft.IconButton(
+                                icon="edit_outlined",
+                                icon_color=colores.azul,
+                                icon_size=18,
+                                tooltip="Editar",
+                                on_click=partial(abrir_editar, "suscripcion", sub)
+                            ),
+                            ft.IconButton(
+                                icon="delete_outline", 
+                                icon_color=colores.rojo,
+                                icon_size=18,
+                                tooltip="Eliminar",
+                                on_click=lambda e, x=id_sub, n=nombre: confirmar_borrado("suscripcion", x, n)
+                            )
+                        ], spacing=0)
+                    ], alignment=ft.MainAxisAlignment.END, horizontal_alignment=ft.CrossAxisAlignment.END)
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                padding=12,
+                border_radius=12,
+                bgcolor=colores.tarjeta,
+                border=ft.border.all(1, colores.borde),
+            )
+        
         if not suscripciones:
             lista_subs.controls.append(
                 ft.Container(
                     content=ft.Text("No tienes suscripciones activas.\n¡Agrega tus servicios recurrentes!", 
-                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=colores["texto_secundario"]),
+                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=colores.texto_secundario),
                     padding=40
                 )
             )
         else:
-            for sub in suscripciones:
-                id_sub, nombre, monto, dia_cobro, activa = sub
-                
-                item = ft.Container(
-                    content=ft.Row([
-                        ft.Icon("subscriptions", color=colores["naranja"], size=28),
-                        ft.Column([
-                            ft.Text(nombre, weight=ft.FontWeight.BOLD, size=15, color=colores["texto"]),
-                            ft.Text(f"Se cobra el día {dia_cobro} de cada mes", size=12, color=colores["texto_secundario"]),
-                        ], expand=True, spacing=2),
-                        ft.Column([
-                            ft.Text(f"${monto:,.0f}/mes", weight=ft.FontWeight.BOLD, color=colores["naranja"], size=16),
-                            ft.Row([
-                                ft.IconButton(
-                                    icon="edit_outlined",
-                                    icon_color=colores["azul"],
-                                    icon_size=18,
-                                    tooltip="Editar",
-                                    on_click=lambda e, s=sub: abrir_editar_suscripcion(s)
-                                ),
-                                ft.IconButton(
-                                    icon="delete_outline", 
-                                    icon_color=colores["rojo"],
-                                    icon_size=18,
-                                    tooltip="Eliminar",
-                                    on_click=lambda e, x=id_sub, n=nombre: confirmar_borrado("suscripcion", x, n)
-                                )
-                            ], spacing=0)
-                        ], alignment=ft.MainAxisAlignment.END, horizontal_alignment=ft.CrossAxisAlignment.END)
-                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                    padding=12,
-                    border_radius=12,
-                    bgcolor=colores["tarjeta"],
-                    border=ft.border.all(1, colores["borde"]),
-                )
-                lista_subs.controls.append(item)
+            lista_subs.controls = [crear_tarjeta_suscripcion(sub) for sub in suscripciones]
         
         return ft.Column([header, lista_subs], spacing=0, expand=True)
     
@@ -870,95 +1028,96 @@ def main(page: ft.Page):
         # Header con totales
         header = ft.Container(
             content=ft.Column([
-                ft.Text("🏦 Préstamos Bancarios", size=20, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                ft.Text("🏦 Préstamos Bancarios", size=20, weight=NEGRITA, color=colores.texto),
                 ft.Divider(height=10, color="transparent"),
                 ft.Row([
                     ft.Container(
                         content=ft.Column([
-                            ft.Text("Cuotas/mes", size=12, color=colores["texto_secundario"]),
-                            ft.Text(f"${total_cuotas:,.0f}", size=20, weight=ft.FontWeight.BOLD, color=colores["purple"])
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                            ft.Text("Cuotas/mes", size=12, color=colores.texto_secundario),
+                            ft.Text(formato_dinero(total_cuotas), size=20, weight=NEGRITA, color=colores.purple)
+                        ], horizontal_alignment=CENTRADO),
                         expand=True
                     ),
                     ft.Container(
                         content=ft.Column([
-                            ft.Text("Deuda total", size=12, color=colores["texto_secundario"]),
-                            ft.Text(f"${deuda_total:,.0f}", size=20, weight=ft.FontWeight.BOLD, color=colores["rojo"])
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                            ft.Text("Deuda total", size=12, color=colores.texto_secundario),
+                            ft.Text(formato_dinero(deuda_total), size=20, weight=NEGRITA, color=colores.rojo)
+                        ], horizontal_alignment=CENTRADO),
                         expand=True
                     ),
                 ], alignment=ft.MainAxisAlignment.SPACE_AROUND)
             ]),
             padding=20,
-            bgcolor=colores["purple_bg"],
+            bgcolor=colores.purple_bg,
             border_radius=15,
             margin=10,
-            border=ft.border.all(1, colores["borde"])
+            border=ft.border.all(1, colores.borde)
         )
         
+        def crear_tarjeta_prestamo(prestamo):
+            id_pres, banco, monto_total, monto_pagado, cuota_mensual, dia_pago = prestamo
+            
+            saldo_pendiente = monto_total - monto_pagado
+            porcentaje_pagado = (monto_pagado / monto_total * 100) if monto_total > 0 else 0
+            
+            return ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon("account_balance", color=colores.purple, size=28),
+                        ft.Column([
+                            ft.Text(banco, weight=NEGRITA, size=15, color=colores.texto),
+                            ft.Text(f"Cuota: {formato_dinero(cuota_mensual)}/mes · Día {dia_pago}", size=12, color=colores.texto_secundario),
+                        ], expand=True, spacing=2),
+                        ft.IconButton(
+                            icon="delete_outline", 
+                            icon_color=colores.rojo,
+                            icon_size=20,
+                            tooltip="Eliminar",
+                            on_click=lambda e, x=id_pres, b=banco: confirmar_borrado("prestamo", x, b)
+                        )
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    separador(),
+                    ft.Row([
+                        ft.Column([
+                            ft.Text("Pagado", size=11, color=colores.texto_secundario),
+                            ft.Text(formato_dinero(monto_pagado), size=14, weight=NEGRITA, color=colores.verde),
+                        ]),
+                        ft.Column([
+                            ft.Text("Pendiente", size=11, color=colores.texto_secundario),
+                            ft.Text(formato_dinero(saldo_pendiente), size=14, weight=NEGRITA, color=colores.rojo),
+                        ]),
+                        ft.Column([
+                            ft.Text("Total", size=11, color=colores.texto_secundario),
+                            ft.Text(formato_dinero(monto_total), size=14, weight=NEGRITA, color=colores.texto),
+                        ]),
+                    ], alignment=ft.MainAxisAlignment.SPACE_AROUND),
+                    ft.ProgressBar(value=porcentaje_pagado/100, color=colores.purple, bgcolor=colores.borde),
+                    ft.Text(f"{porcentaje_pagado:.1f}% pagado", size=11, color=colores.purple, text_align=ft.TextAlign.CENTER),
+                    ft.ElevatedButton(
+                        "Registrar Pago",
+                        icon="payment",
+                        on_click=partial(abrir_registrar_pago, id_pres),
+                        bgcolor=colores.purple,
+                        color="white",
+                        width=float("inf")
+                    )
+                ], spacing=8),
+                padding=12,
+                border_radius=12,
+                bgcolor=colores.tarjeta,
+                border=ft.border.all(1, colores.borde),
+            )
+        
         if not prestamos:
             lista_prestamos.controls.append(
                 ft.Container(
                     content=ft.Text("No tienes préstamos registrados.\n¡Mantén control de tus deudas bancarias!", 
-                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=colores["texto_secundario"]),
+                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=colores.texto_secundario),
                     padding=40
                 )
             )
         else:
-            for prestamo in prestamos:
-                id_pres, banco, monto_total, monto_pagado, cuota_mensual, dia_pago, fecha_inicio, activo = prestamo
-                
-                saldo_pendiente = monto_total - monto_pagado
-                porcentaje_pagado = (monto_pagado / monto_total * 100) if monto_total > 0 else 0
-                
-                item = ft.Container(
-                    content=ft.Column([
-                        ft.Row([
-                            ft.Icon("account_balance", color=colores["purple"], size=28),
-                            ft.Column([
-                                ft.Text(banco, weight=ft.FontWeight.BOLD, size=15, color=colores["texto"]),
-                                ft.Text(f"Cuota: ${cuota_mensual:,.0f}/mes · Día {dia_pago}", size=12, color=colores["texto_secundario"]),
-                            ], expand=True, spacing=2),
-                            ft.IconButton(
-                                icon="delete_outline", 
-                                icon_color=colores["rojo"],
-                                icon_size=20,
-                                tooltip="Eliminar",
-                                on_click=lambda e, x=id_pres, b=banco: confirmar_borrado("prestamo", x, b)
-                            )
-                        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                        ft.Divider(height=5, color="transparent"),
-                        ft.Row([
-                            ft.Column([
-                                ft.Text("Pagado", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${monto_pagado:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["verde"]),
-                            ]),
-                            ft.Column([
-                                ft.Text("Pendiente", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${saldo_pendiente:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["rojo"]),
-                            ]),
-                            ft.Column([
-                                ft.Text("Total", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${monto_total:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                            ]),
-                        ], alignment=ft.MainAxisAlignment.SPACE_AROUND),
-                        ft.ProgressBar(value=porcentaje_pagado/100, color=colores["purple"], bgcolor=colores["borde"]),
-                        ft.Text(f"{porcentaje_pagado:.1f}% pagado", size=11, color=colores["purple"], text_align=ft.TextAlign.CENTER),
-                        ft.ElevatedButton(
-                            "Registrar Pago",
-                            icon="payment",
-                            on_click=lambda e, x=id_pres: abrir_registrar_pago(x),
-                            bgcolor=colores["purple"],
-                            color="white",
-                            width=float("inf")
-                        )
-                    ], spacing=8),
-                    padding=12,
-                    border_radius=12,
-                    bgcolor=colores["tarjeta"],
-                    border=ft.border.all(1, colores["borde"]),
-                )
-                lista_prestamos.controls.append(item)
+            lista_prestamos.controls = [crear_tarjeta_prestamo(prestamo) for prestamo in prestamos]
         
         return ft.Column([header, lista_prestamos], spacing=0, expand=True)
     
@@ -974,107 +1133,118 @@ def main(page: ft.Page):
         # Header con totales
         header = ft.Container(
             content=ft.Column([
-                ft.Text("💳 Compras a Crédito", size=20, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                ft.Text("💳 Compras a Crédito", size=20, weight=NEGRITA, color=colores.texto),
                 ft.Divider(height=10, color="transparent"),
                 ft.Row([
                     ft.Container(
                         content=ft.Column([
-                            ft.Text("Cuotas/mes", size=12, color=colores["texto_secundario"]),
-                            ft.Text(f"${total_cuotas:,.0f}", size=20, weight=ft.FontWeight.BOLD, color=colores["indigo"])
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                            ft.Text("Cuotas/mes", size=12, color=colores.texto_secundario),
+                            ft.Text(formato_dinero(total_cuotas), size=20, weight=NEGRITA, color=colores.indigo)
+                        ], horizontal_alignment=CENTRADO),
                         expand=True
                     ),
                     ft.Container(
                         content=ft.Column([
-                            ft.Text("Deuda total", size=12, color=colores["texto_secundario"]),
-                            ft.Text(f"${deuda_total:,.0f}", size=20, weight=ft.FontWeight.BOLD, color=colores["rojo"])
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                            ft.Text("Deuda total", size=12, color=colores.texto_secundario),
+                            ft.Text(formato_dinero(deuda_total), size=20, weight=NEGRITA, color=colores.rojo)
+                        ], horizontal_alignment=CENTRADO),
                         expand=True
                     ),
                 ], alignment=ft.MainAxisAlignment.SPACE_AROUND)
             ]),
             padding=20,
-            bgcolor=colores["indigo_bg"],
+            bgcolor=colores.indigo_bg,
             border_radius=15,
             margin=10
         )
         
+        borde_tarjeta = ft.border.all(1, colores.borde)
+        
+        def crear_tarjeta_credito(credito):
+            # credito = (id, descripcion, banco, monto_total, meses_sin_intereses, cuota_mensual, meses_pagados, fecha_compra, tasa_interes, pagado)
+            id_cred, descripcion, banco, monto_total, meses_totales, cuota_mensual, meses_pagados, fecha_compra, tasa_interes, pagado = credito
+            
+            meses_restantes = meses_totales - meses_pagados
+            saldo_pendiente = meses_restantes * cuota_mensual
+            porcentaje_pagado = (meses_pagados / meses_totales * 100) if meses_totales > 0 else 0
+            
+            # Determinar si tiene intereses
+            tipo_credito = "Sin intereses" if tasa_interes == 0 else f"Interés: {tasa_interes:.1f}% mensual"
+            
+            return ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon("credit_card", color=colores.indigo, size=28),
+                        ft.Column([
+                            ft.Text(descripcion, weight=NEGRITA, size=15, color=colores.texto),
+                            ft.Text(f"{banco} · {fecha_compra}", size=12, color=colores.texto_secundario),
+                            ft.Text(tipo_credito, size=11, color=colores.indigo, italic=True),
+                        ], expand=True, spacing=2),
+                        ft.IconButton(
+                            icon="delete_outline", 
+                            icon_color=colores.texto_secundario,
+                            icon_size=20,
+                            tooltip="Eliminar",
+                            on_click=partial(borrar_credito, id_cred)
+                        )
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    separador(),
+                    ft.Row([
+                        ft.Column([
+                            ft.Text("Cuota mensual", size=11, color=colores.texto_secundario),
+                            ft.Text(formato_dinero(cuota_mensual), size=14, weight=NEGRITA, color=colores.indigo),
+                        ]),
+                        ft.Column([
+                            ft.Text("Meses", size=11, color=colores.texto_secundario),
+                            ft.Text(f"{meses_pagados}/{meses_totales}", size=14, weight=NEGRITA, color=colores.texto),
+                        ]),
+                        ft.Column([
+                            ft.Text("Pendiente", size=11, color=colores.texto_secundario),
+                            ft.Text(formato_dinero(saldo_pendiente), size=14, weight=NEGRITA, color=colores.rojo),
+                        ]),
+                    ], alignment=ft.MainAxisAlignment.SPACE_AROUND),
+                    ft.ProgressBar(value=porcentaje_pagado/100, color=colores.indigo, bgcolor=colores.indigo_bg),
+                    ft.Text(f"{porcentaje_pagado:.1f}% pagado · Faltan {meses_restantes} meses", size=11, color=colores.indigo, text_align=ft.TextAlign.CENTER),
+                    ft.ElevatedButton(
+                        "Pagar Mensualidad",
+                        icon="payment",
+                        on_click=partial(registrar_pago_credito_directo, id_cred),
+                        bgcolor=colores.indigo,
+                        color="white",
+                        width=float("inf")
+                    )
+                ], spacing=8),
+                padding=12,
+                border_radius=12,
+                bgcolor=colores.tarjeta,
+                border=borde_tarjeta,
+                shadow=SOMBRA_TARJETA
+            )
+        
         if not creditos:
             lista_creditos.controls.append(
                 ft.Container(
                     content=ft.Text("No tienes compras a crédito.\n¡Controla tus compras en meses sin intereses!", 
-                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=colores["texto_secundario"]),
+                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=colores.texto_secundario),
                     padding=40
                 )
             )
         else:
-            for credito in creditos:
-                # credito = (id, descripcion, banco, monto_total, meses_sin_intereses, cuota_mensual, meses_pagados, fecha_compra, tasa_interes, pagado)
-                id_cred, descripcion, banco, monto_total, meses_totales, cuota_mensual, meses_pagados, fecha_compra, tasa_interes, pagado = credito
-                
-                meses_restantes = meses_totales - meses_pagados
-                saldo_pendiente = meses_restantes * cuota_mensual
-                porcentaje_pagado = (meses_pagados / meses_totales * 100) if meses_totales > 0 else 0
-                
-                # Determinar si tiene intereses
-                tipo_credito = "Sin intereses" if tasa_interes == 0 else f"Interés: {tasa_interes:.1f}% mensual"
-                
-                item = ft.Container(
-                    content=ft.Column([
-                        ft.Row([
-                            ft.Icon("credit_card", color=colores["indigo"], size=28),
-                            ft.Column([
-                                ft.Text(descripcion, weight=ft.FontWeight.BOLD, size=15, color=colores["texto"]),
-                                ft.Text(f"{banco} · {fecha_compra}", size=12, color=colores["texto_secundario"]),
-                                ft.Text(tipo_credito, size=11, color=colores["indigo"], italic=True),
-                            ], expand=True, spacing=2),
-                            ft.IconButton(
-                                icon="delete_outline", 
-                                icon_color=colores["texto_secundario"],
-                                icon_size=20,
-                                tooltip="Eliminar",
-                                on_click=lambda e, x=id_cred: borrar_credito(x)
-                            )
-                        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                        ft.Divider(height=5, color="transparent"),
-                        ft.Row([
-                            ft.Column([
-                                ft.Text("Cuota mensual", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${cuota_mensual:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["indigo"]),
-                            ]),
-                            ft.Column([
-                                ft.Text("Meses", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"{meses_pagados}/{meses_totales}", size=14, weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                            ]),
-                            ft.Column([
-                                ft.Text("Pendiente", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${saldo_pendiente:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["rojo"]),
-                            ]),
-                        ], alignment=ft.MainAxisAlignment.SPACE_AROUND),
-                        ft.ProgressBar(value=porcentaje_pagado/100, color=colores["indigo"], bgcolor=colores["indigo_bg"]),
-                        ft.Text(f"{porcentaje_pagado:.1f}% pagado · Faltan {meses_restantes} meses", size=11, color=colores["indigo"], text_align=ft.TextAlign.CENTER),
-                        ft.ElevatedButton(
-                            "Pagar Mensualidad",
-                            icon="payment",
-                            on_click=lambda e, x=id_cred: registrar_pago_credito_directo(x),
-                            bgcolor=colores["indigo"],
-                            color="white",
-                            width=float("inf")
-                        )
-                    ], spacing=8),
-                    padding=12,
-                    border_radius=12,
-                    bgcolor=colores["tarjeta"],
-                    border=ft.border.all(1, colores["borde"]),
-                    shadow=ft.BoxShadow(spread_radius=0, blur_radius=4, color="black12", offset=ft.Offset(0, 2))
-                )
-                lista_creditos.controls.append(item)
+            lista_creditos.controls = [crear_tarjeta_credito(credito) for credito in creditos]
         
         return ft.Column([header, lista_creditos], spacing=0, expand=True)
     
     def crear_vista_ahorros():
         """Crea la vista de ahorros"""
         colores = get_colores()
+        c_texto = colores.texto
+        c_texto_secundario = colores.texto_secundario
+        c_teal = colores.teal
+        c_teal_bg = colores.teal_bg
+        c_naranja = colores.naranja
+        c_rojo = colores.rojo
+        c_tarjeta = colores.tarjeta
+        c_borde = colores.borde
         lista_ahorros = ft.ListView(spacing=10, padding=10, expand=True)
         
         ahorros = db.obtener_ahorros()
@@ -1083,100 +1253,114 @@ def main(page: ft.Page):
         # Header con total
         header = ft.Container(
             content=ft.Column([
-                ft.Text("🎯 Mis Ahorros", size=20, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                ft.Text("🎯 Mis Ahorros", size=20, weight=NEGRITA, color=c_texto),
                 ft.Divider(height=10, color="transparent"),
                 ft.Row([
-                    ft.Text("Total ahorrado:", size=16, color=colores["texto_secundario"]),
-                    ft.Text(f"${total_ahorrado:,.0f}", size=24, weight=ft.FontWeight.BOLD, color=colores["teal"])
+                    ft.Text("Total ahorrado:", size=16, color=c_texto_secundario),
+                    ft.Text(formato_dinero(total_ahorrado), size=24, weight=NEGRITA, color=c_teal)
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
             ]),
             padding=20,
-            bgcolor=colores["teal_bg"],
+            bgcolor=c_teal_bg,
             border_radius=15,
             margin=10
         )
         
+        borde_tarjeta = ft.border.all(1, c_borde)
+        
+        def crear_tarjeta_ahorro(ahorro):
+            id_aho = ahorro["id"]
+            nombre = ahorro["nombre"]
+            meta = ahorro["meta"]
+            monto_actual = ahorro["monto_actual"]
+            fecha_inicio = ahorro["fecha_inicio"]
+            
+            falta = meta - monto_actual
+            porcentaje = (monto_actual / meta * 100) if meta > 0 else 0
+            
+            return ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon("savings", color=c_teal, size=28),
+                        ft.Column([
+                            ft.Text(nombre, weight=NEGRITA, size=15, color=c_texto),
+                            ft.Text(f"Desde {fecha_inicio}", size=12, color=c_texto_secundario),
+                        ], expand=True, spacing=2),
+                        ft.IconButton(
+                            icon="delete_outline", 
+                            icon_color=c_texto_secundario,
+                            icon_size=20,
+                            tooltip="Eliminar",
+                            on_click=partial(borrar_ahorro, id_aho)
+                        )
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    separador(),
+                    ft.Row([
+                        ft.Column([
+                            ft.Text("Ahorrado", size=11, color=c_texto_secundario),
+                            ft.Text(formato_dinero(monto_actual), size=14, weight=NEGRITA, color=c_teal),
+                        ]),
+                        ft.Column([
+                            ft.Text("Falta", size=11, color=c_texto_secundario),
+                            ft.Text(formato_dinero(falta), size=14, weight=NEGRITA, color=c_naranja),
+                        ]),
+                        ft.Column([
+                            ft.Text("Meta", size=11, color=c_texto_secundario),
+                            ft.Text(formato_dinero(meta), size=14, weight=NEGRITA, color=c_texto),
+                        ]),
+                    ], alignment=ft.MainAxisAlignment.SPACE_AROUND),
+                    ft.ProgressBar(value=porcentaje/100, color=c_teal, bgcolor=c_teal_bg),
+                    ft.Text(f"{porcentaje:.1f}% completado", size=11, color=c_teal, text_align=ft.TextAlign.CENTER),
+                    ft.Row([
+                        ft.ElevatedButton(
+                            "Agregar",
+                            icon="add",
+                            on_click=partial(abrir_agregar_monto, id_aho),
+                            bgcolor=c_teal,
+                            color="white",
+                            expand=True
+                        ),
+                        ft.ElevatedButton(
+                            "Retirar",
+                            icon="remove",
+                            on_click=partial(abrir_retirar_monto, id_aho),
+                            bgcolor=c_rojo,
+                            color="white",
+                            expand=True
+                        ),
+                    ], spacing=10)
+                ], spacing=8),
+                padding=12,
+                border_radius=12,
+                bgcolor=c_tarjeta,
+                border=borde_tarjeta,
+                shadow=SOMBRA_TARJETA
+            )
+        
         if not ahorros:
             lista_ahorros.controls.append(
                 ft.Container(
                     content=ft.Text("No tienes metas de ahorro activas.\n¡Empieza a ahorrar para tus objetivos!", 
-                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=colores["texto_secundario"]),
+                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=c_texto_secundario),
                     padding=40
                 )
             )
         else:
-            for ahorro in ahorros:
-                # ahorro = (id, nombre, meta, monto_actual, fecha_inicio, completado)
-                id_aho, nombre, meta, monto_actual, fecha_inicio, completado = ahorro
-                
-                falta = meta - monto_actual
-                porcentaje = (monto_actual / meta * 100) if meta > 0 else 0
-                
-                item = ft.Container(
-                    content=ft.Column([
-                        ft.Row([
-                            ft.Icon("savings", color=colores["teal"], size=28),
-                            ft.Column([
-                                ft.Text(nombre, weight=ft.FontWeight.BOLD, size=15, color=colores["texto"]),
-                                ft.Text(f"Desde {fecha_inicio}", size=12, color=colores["texto_secundario"]),
-                            ], expand=True, spacing=2),
-                            ft.IconButton(
-                                icon="delete_outline", 
-                                icon_color=colores["texto_secundario"],
-                                icon_size=20,
-                                tooltip="Eliminar",
-                                on_click=lambda e, x=id_aho: borrar_ahorro(x)
-                            )
-                        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                        ft.Divider(height=5, color="transparent"),
-                        ft.Row([
-                            ft.Column([
-                                ft.Text("Ahorrado", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${monto_actual:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["teal"]),
-                            ]),
-                            ft.Column([
-                                ft.Text("Falta", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${falta:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["naranja"]),
-                            ]),
-                            ft.Column([
-                                ft.Text("Meta", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${meta:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                            ]),
-                        ], alignment=ft.MainAxisAlignment.SPACE_AROUND),
-                        ft.ProgressBar(value=porcentaje/100, color=colores["teal"], bgcolor=colores["teal_bg"]),
-                        ft.Text(f"{porcentaje:.1f}% completado", size=11, color=colores["teal"], text_align=ft.TextAlign.CENTER),
-                        ft.Row([
-                            ft.ElevatedButton(
-                                "Agregar",
-                                icon="add",
-                                on_click=lambda e, x=id_aho: abrir_agregar_monto(x),
-                                bgcolor=colores["teal"],
-                                color="white",
-                                expand=True
-                            ),
-                            ft.ElevatedButton(
-                                "Retirar",
-                                icon="remove",
-                                on_click=lambda e, x=id_aho: abrir_retirar_monto(x),
-                                bgcolor=colores["rojo"],
-                                color="white",
-                                expand=True
-                            ),
-                        ], spacing=10)
-                    ], spacing=8),
-                    padding=12,
-                    border_radius=12,
-                    bgcolor=colores["tarjeta"],
-                    border=ft.border.all(1, colores["borde"]),
-                    shadow=ft.BoxShadow(spread_radius=0, blur_radius=4, color="black12", offset=ft.Offset(0, 2))
-                )
-                lista_ahorros.controls.append(item)
+            cargar_por_lotes(lista_ahorros, ahorros, crear_tarjeta_ahorro)
         
         return ft.Column([header, lista_ahorros], spacing=0, expand=True)
     
     def crear_vista_bancos():
         """Crea la vista de cuentas bancarias"""
         colores = get_colores()
+        c_texto = colores.texto
+        c_texto_secundario = colores.texto_secundario
+        c_cyan = colores.cyan
+        c_cyan_bg = colores.cyan_bg
+        c_verde = colores.verde
+        c_rojo = colores.rojo
+        c_tarjeta = colores.tarjeta
+        c_borde = colores.borde
         lista_bancos = ft.ListView(spacing=10, padding=10, expand=True)
         
         cuentas = db.obtener_cuentas_bancarias()
@@ -1185,101 +1369,104 @@ def main(page: ft.Page):
         # Header con total
         header = ft.Container(
             content=ft.Column([
-                ft.Text("🏦 Mis Cuentas Bancarias", size=20, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                ft.Text("🏦 Mis Cuentas Bancarias", size=20, weight=NEGRITA, color=c_texto),
                 ft.Divider(height=10, color="transparent"),
                 ft.Row([
-                    ft.Text("Saldo total:", size=16, color=colores["texto_secundario"]),
-                    ft.Text(f"${total_saldo:,.0f}", size=24, weight=ft.FontWeight.BOLD, color=colores["cyan"])
+                    ft.Text("Saldo total:", size=16, color=c_texto_secundario),
+                    ft.Text(formato_dinero(total_saldo), size=24, weight=NEGRITA, color=c_cyan)
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
             ]),
             padding=20,
-            bgcolor=colores["cyan_bg"],
+            bgcolor=c_cyan_bg,
             border_radius=15,
             margin=10
         )
         
-        if not cuentas:
-            lista_bancos.controls.append(
-                ft.Container(
-                    content=ft.Text("No tienes cuentas registradas.\n¡Agrega tus cuentas bancarias!", 
-                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=colores["texto_secundario"]),
-                    padding=40
+        borde_tarjeta = ft.border.all(1, c_borde)
+        
+        def crear_tarjeta_cuenta(cuenta):
+            id_cuenta = cuenta["id"]
+            nombre_banco = cuenta["nombre_banco"]
+            tipo_cuenta = cuenta["tipo_cuenta"]
+            saldo = cuenta["saldo"]
+            limite_credito = cuenta["limite_credito"]
+            fecha_creacion = cuenta["fecha_creacion"]
+            
+            # Iconos y colores según tipo de cuenta
+            icono, clave_color = ICONOS_CUENTA.get(tipo_cuenta, ("account_balance", "cyan"))
+            color = getattr(colores, clave_color)
+            
+            contenido_saldo = [
+                ft.Text("Saldo actual", size=12, color=c_texto_secundario),
+                ft.Text(formato_dinero(saldo), size=24, weight=NEGRITA, color=c_cyan),
+            ]
+            # Mostrar información adicional para tarjetas de crédito
+            if tipo_cuenta == "credito" and limite_credito > 0:
+                disponible_credito = limite_credito - abs(saldo)
+                contenido_saldo.append(
+                    ft.Text(f"Disponible: {formato_dinero(disponible_credito)} de {formato_dinero(limite_credito)}", size=11, color=c_texto_secundario)
                 )
-            )
-        else:
-            for cuenta in cuentas:
-                # cuenta = (id, nombre_banco, tipo_cuenta, saldo, limite_credito, fecha_creacion, activa)
-                id_cuenta, nombre_banco, tipo_cuenta, saldo, limite_credito, fecha_creacion, activa = cuenta
-                
-                # Iconos y colores según tipo de cuenta
-                iconos = {
-                    "debito": ("payment", colores["azul"]),
-                    "credito": ("credit_card", colores["naranja"]),
-                    "ahorro": ("savings", colores["verde"]),
-                    "inversion": ("trending_up", colores["purple"])
-                }
-                icono, color = iconos.get(tipo_cuenta, ("account_balance", colores["cyan"]))
-                
-                # Mostrar información adicional para tarjetas de crédito
-                info_adicional = ""
-                if tipo_cuenta == "credito" and limite_credito > 0:
-                    disponible_credito = limite_credito - abs(saldo)
-                    info_adicional = f"Disponible: ${disponible_credito:,.0f} de ${limite_credito:,.0f}"
-                
-                item = ft.Container(
-                    content=ft.Column([
-                        ft.Row([
-                            ft.Icon(icono, color=color, size=28),
-                            ft.Column([
-                                ft.Text(nombre_banco, weight=ft.FontWeight.BOLD, size=15, color=colores["texto"]),
-                                ft.Text(f"{tipo_cuenta.capitalize()} · {fecha_creacion}", size=12, color=colores["texto_secundario"]),
-                            ], expand=True, spacing=2),
-                            ft.IconButton(
-                                icon="delete_outline", 
-                                icon_color=colores["texto_secundario"],
-                                icon_size=20,
-                                tooltip="Eliminar",
-                                on_click=lambda e, x=id_cuenta: borrar_cuenta_bancaria(x)
-                            )
-                        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                        ft.Divider(height=5, color="transparent"),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text("Saldo actual", size=12, color=colores["texto_secundario"]),
-                                ft.Text(f"${saldo:,.0f}", size=24, weight=ft.FontWeight.BOLD, color=colores["cyan"]),
-                                ft.Text(info_adicional, size=11, color=colores["texto_secundario"]) if info_adicional else ft.Container(),
-                            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                            padding=10,
-                            bgcolor=colores["cyan_bg"],
-                            border_radius=8,
+            
+            return ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon(icono, color=color, size=28),
+                        ft.Column([
+                            ft.Text(nombre_banco, weight=NEGRITA, size=15, color=c_texto),
+                            ft.Text(f"{tipo_cuenta.capitalize()} · {fecha_creacion}", size=12, color=c_texto_secundario),
+                        ], expand=True, spacing=2),
+                        ft.IconButton(
+                            icon="delete_outline", 
+                            icon_color=c_texto_secundario,
+                            icon_size=20,
+                            tooltip="Eliminar",
+                            on_click=partial(borrar_cuenta_bancaria, id_cuenta)
+                        )
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    separador(),
+                    ft.Container(
+                        content=ft.Column(contenido_saldo, horizontal_alignment=CENTRADO),
+                        padding=10,
+                        bgcolor=c_cyan_bg,
+                        border_radius=8,
+                    ),
+                    separador(),
+                    ft.Row([
+                        ft.ElevatedButton(
+                            "Depositar",
+                            icon="add",
+                            on_click=partial(abrir_depositar_banco, id_cuenta),
+                            bgcolor=c_verde,
+                            color="white",
+                            expand=True
                         ),
-                        ft.Divider(height=5, color="transparent"),
-                        ft.Row([
-                            ft.ElevatedButton(
-                                "Depositar",
-                                icon="add",
-                                on_click=lambda e, x=id_cuenta: abrir_depositar_banco(x),
-                                bgcolor=colores["verde"],
-                                color="white",
-                                expand=True
-                            ),
-                            ft.ElevatedButton(
-                                "Retirar",
-                                icon="remove",
-                                on_click=lambda e, x=id_cuenta: abrir_retirar_banco(x),
-                                bgcolor=colores["rojo"],
-                                color="white",
-                                expand=True
-                            ),
-                        ], spacing=10)
-                    ], spacing=8),
-                    padding=12,
-                    border_radius=12,
-                    bgcolor=colores["tarjeta"],
-                    border=ft.border.all(1, colores["borde"]),
-                    shadow=ft.BoxShadow(spread_radius=0, blur_radius=4, color="black12", offset=ft.Offset(0, 2))
+                        ft.ElevatedButton(
+                            "Retirar",
+                            icon="remove",
+                            on_click=partial(abrir_retirar_banco, id_cuenta),
+                            bgcolor=c_rojo,
+                            color="white",
+                            expand=True
+                        ),
+                    ], spacing=10)
+                ], spacing=8),
+                padding=12,
+                border_radius=12,
+                bgcolor=c_tarjeta,
+                border=borde_tarjeta,
+                shadow=SOMBRA_TARJETA
+            )
+        
+        if not cuentas:
+            lista_bancos.controls.append(
+                ft.Container(
+                    content=ft.Text("No tienes cuentas registradas.\n¡Agrega tus cuentas bancarias!", 
+                                   italic=True, text_align=ft.TextAlign.CENTER, size=14, color=c_texto_secundario),
+                    padding=40
                 )
-                lista_bancos.controls.append(item)
+            )
+        else:
+            cargar_por_lotes(lista_bancos, cuentas, crear_tarjeta_cuenta)
         
         return ft.Column([header, lista_bancos], spacing=0, expand=True)
     
@@ -1290,36 +1477,70 @@ def main(page: ft.Page):
     def crear_vista_balance_mensual():
         """Crea la vista de balance mensual con gráficos"""
         colores = get_colores()
-        ahora = datetime.datetime.now()
+        c_verde = colores.verde
+        c_rojo = colores.rojo
+        c_texto_secundario = colores.texto_secundario
+        c_texto = colores.texto
+        c_borde = colores.borde
+        c_gris_bg = colores.gris_bg
+        c_azul = colores.azul
+        c_azul_bg = colores.azul_bg
+        c_verde_bg = colores.verde_bg
+        c_rojo_bg = colores.rojo_bg
+        c_naranja = colores.naranja
+        c_naranja_bg = colores.naranja_bg
+        c_purple = colores.purple
+        c_purple_bg = colores.purple_bg
+        c_indigo = colores.indigo
+        c_indigo_bg = colores.indigo_bg
+        c_tarjeta = colores.tarjeta
+        ahora = fecha_actual()
         mes_actual = ahora.month
         anio_actual = ahora.year
         
-        ingresos_mes, gastos_mes = db.obtener_balance_mensual(mes_actual, anio_actual)
-        total_subs = db.obtener_total_suscripciones()
-        total_cuotas = db.obtener_total_cuotas_prestamos()
-        total_creditos = db.obtener_total_cuotas_creditos()
+        ingresos_mes, gastos_mes, total_subs, total_cuotas, total_creditos = db.obtener_resumen_mensual(mes_actual, anio_actual)
         balance_mes = ingresos_mes - gastos_mes - total_subs - total_cuotas - total_creditos
         
-        meses = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
-        mes_nombre = meses[mes_actual - 1]
+        mes_nombre = MESES_CORTOS[mes_actual - 1]
         
         # Obtener gastos por categoría para el gráfico
         gastos_categoria = db.obtener_gastos_por_categoria(mes_actual, anio_actual)
         
-        # Colores para las categorías
-        colores_cat = {
-            "Comida": "#FF6384", "Transporte": "#36A2EB", "Servicios": "#FFCE56",
-            "Ocio": "#4BC0C0", "Salud": "#9966FF", "Salario": "#2ECC71",
-            "Compras": "#FF9F40", "Educación": "#E74C3C", "Otro": "#95A5A6"
-        }
+        def crear_tarjeta_estadistica(etiqueta, valor, color, bgcolor, icono=None):
+            """Tarjeta de resumen; con icono se usa el formato grande"""
+            if icono:
+                contenido = [
+                    ft.Icon(icono, color=color, size=24),
+                    ft.Text(etiqueta, size=11, color=c_texto_secundario),
+                    ft.Text(valor, size=16, weight=NEGRITA, color=color),
+                ]
+            else:
+                contenido = [
+                    ft.Text(etiqueta, size=10, color=c_texto_secundario),
+                    ft.Text(valor, size=14, weight=NEGRITA, color=color),
+                ]
+            return ft.Container(
+                content=ft.Column(contenido, horizontal_alignment=CENTRADO, spacing=2),
+                padding=12 if icono else 10,
+                bgcolor=bgcolor,
+                border_radius=10 if icono else 8,
+                expand=True
+            )
         
-        def exportar_excel(e):
-            exito, mensaje = exportar_excel_local(mes_actual, anio_actual)
+        async def exportar_excel(e):
+            page.show_snack_bar(
+                ft.SnackBar(
+                    content=ft.Text("⏳ Exportando a Excel..."),
+                    bgcolor=c_azul,
+                )
+            )
+            # openpyxl serializa y escribe en disco fuera del hilo de la interfaz
+            exito, mensaje = await asyncio.to_thread(exportar_excel_local, mes_actual, anio_actual)
             if exito:
                 page.show_snack_bar(
                     ft.SnackBar(
                         content=ft.Text(f"✅ Excel exportado: {mensaje}"),
-                        bgcolor=colores["verde"],
+                        bgcolor=c_verde,
                         duration=5000
                     )
                 )
@@ -1327,7 +1548,7 @@ def main(page: ft.Page):
                 page.show_snack_bar(
                     ft.SnackBar(
                         content=ft.Text(f"❌ Error: {mensaje}"),
-                        bgcolor=colores["rojo"],
+                        bgcolor=c_rojo,
                         duration=5000
                     )
                 )
@@ -1336,53 +1557,56 @@ def main(page: ft.Page):
         def crear_grafico_categorias():
             if not gastos_categoria:
                 return ft.Container(
-                    content=ft.Text("Sin gastos este mes", color=colores["texto_secundario"], italic=True),
+                    content=ft.Text("Sin gastos este mes", color=c_texto_secundario, italic=True),
                     padding=20,
                     alignment=ft.alignment.center
                 )
             
-            total_gastos = sum([g[1] for g in gastos_categoria])
-            max_gasto = max([g[1] for g in gastos_categoria]) if gastos_categoria else 1
+            total_gastos = 0
+            max_gasto = 0
+            for _, monto in gastos_categoria:
+                total_gastos += monto
+                if monto > max_gasto:
+                    max_gasto = monto
             
-            barras = []
-            for cat, monto in gastos_categoria:
+            # Un único BarChart nativo en lugar de un par de Containers por barra
+            grupos = []
+            etiquetas = []
+            for i, (cat, monto) in enumerate(gastos_categoria):
                 porcentaje = (monto / total_gastos * 100) if total_gastos > 0 else 0
-                ancho_barra = (monto / max_gasto) if max_gasto > 0 else 0
-                color = colores_cat.get(cat, "#95A5A6")
-                
-                barras.append(
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Row([
-                                ft.Text(cat, size=12, weight=ft.FontWeight.W_500, expand=True, color=colores["texto"]),
-                                ft.Text(f"${monto:,.0f}", size=12, weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                                ft.Text(f"({porcentaje:.1f}%)", size=11, color=colores["texto_secundario"]),
-                            ]),
-                            ft.Container(
-                                content=ft.Container(
-                                    width=ancho_barra * 280,
-                                    height=20,
-                                    bgcolor=color,
-                                    border_radius=5,
-                                ),
-                                bgcolor=colores["borde"],
+                grupos.append(
+                    ft.BarChartGroup(
+                        x=i,
+                        bar_rods=[
+                            ft.BarChartRod(
+                                from_y=0,
+                                to_y=monto,
+                                width=20,
+                                color=COLORES_CATEGORIAS.get(cat, "#95A5A6"),
                                 border_radius=5,
-                                width=280,
-                                height=20,
+                                tooltip=f"{cat}\n{formato_dinero(monto)} ({porcentaje:.1f}%)",
                             )
-                        ], spacing=5),
-                        padding=ft.padding.only(bottom=10)
+                        ],
                     )
                 )
+                etiquetas.append(ft.ChartAxisLabel(value=i, label=ft.Text(cat[:4], size=10, color=c_texto_secundario)))
             
             return ft.Container(
                 content=ft.Column([
-                    ft.Text("📊 Gastos por Categoría", size=16, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                    ft.Text("📊 Gastos por Categoría", size=16, weight=NEGRITA, color=c_texto),
                     ft.Divider(height=10, color="transparent"),
-                    *barras
+                    ft.BarChart(
+                        bar_groups=grupos,
+                        bottom_axis=ft.ChartAxis(labels=etiquetas, labels_size=24),
+                        left_axis=ft.ChartAxis(show_labels=False),
+                        horizontal_grid_lines=ft.ChartGridLines(color=c_borde, width=1),
+                        max_y=max_gasto,
+                        interactive=True,
+                        height=200,
+                    ),
                 ]),
                 padding=15,
-                bgcolor=colores["gris_bg"],
+                bgcolor=c_gris_bg,
                 border_radius=12,
                 margin=ft.margin.only(top=10, bottom=10)
             )
@@ -1394,35 +1618,46 @@ def main(page: ft.Page):
             if not datos_meses:
                 return ft.Container()
             
-            max_valor = max([max(d["ingresos"], d["gastos"]) for d in datos_meses]) if datos_meses else 1
-            
-            barras_tendencia = []
+            max_valor = 0
             for d in datos_meses:
-                altura_ing = (d["ingresos"] / max_valor * 60) if max_valor > 0 else 0
-                altura_gas = (d["gastos"] / max_valor * 60) if max_valor > 0 else 0
-                
-                barras_tendencia.append(
-                    ft.Column([
-                        ft.Row([
-                            ft.Container(width=15, height=altura_ing, bgcolor=colores["verde"], border_radius=3),
-                            ft.Container(width=15, height=altura_gas, bgcolor=colores["rojo"], border_radius=3),
-                        ], spacing=2, alignment=ft.MainAxisAlignment.CENTER),
-                        ft.Text(d["mes"], size=10, color=colores["texto_secundario"])
-                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=5)
+                max_valor = max(max_valor, d["ingresos"], d["gastos"])
+            
+            grupos = []
+            etiquetas = []
+            for i, d in enumerate(datos_meses):
+                grupos.append(
+                    ft.BarChartGroup(
+                        x=i,
+                        bar_rods=[
+                            ft.BarChartRod(from_y=0, to_y=d["ingresos"], width=15, color=c_verde, border_radius=3,
+                                           tooltip=formato_dinero(d["ingresos"])),
+                            ft.BarChartRod(from_y=0, to_y=d["gastos"], width=15, color=c_rojo, border_radius=3,
+                                           tooltip=formato_dinero(d["gastos"])),
+                        ],
+                        bars_space=2,
+                    )
                 )
+                etiquetas.append(ft.ChartAxisLabel(value=i, label=ft.Text(d["mes"], size=10, color=c_texto_secundario)))
             
             return ft.Container(
                 content=ft.Column([
-                    ft.Text("📈 Tendencia 6 Meses", size=16, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                    ft.Text("📈 Tendencia 6 Meses", size=16, weight=NEGRITA, color=c_texto),
                     ft.Row([
-                        ft.Row([ft.Container(width=10, height=10, bgcolor=colores["verde"], border_radius=2), ft.Text("Ingresos", size=10, color=colores["texto"])]),
-                        ft.Row([ft.Container(width=10, height=10, bgcolor=colores["rojo"], border_radius=2), ft.Text("Gastos", size=10, color=colores["texto"])]),
+                        ft.Row([ft.Container(width=10, height=10, bgcolor=c_verde, border_radius=2), ft.Text("Ingresos", size=10, color=c_texto)]),
+                        ft.Row([ft.Container(width=10, height=10, bgcolor=c_rojo, border_radius=2), ft.Text("Gastos", size=10, color=c_texto)]),
                     ], spacing=20),
                     ft.Divider(height=10, color="transparent"),
-                    ft.Row(barras_tendencia, alignment=ft.MainAxisAlignment.SPACE_AROUND),
+                    ft.BarChart(
+                        bar_groups=grupos,
+                        bottom_axis=ft.ChartAxis(labels=etiquetas, labels_size=20),
+                        left_axis=ft.ChartAxis(show_labels=False),
+                        max_y=max_valor or None,
+                        interactive=True,
+                        height=100,
+                    ),
                 ]),
                 padding=15,
-                bgcolor=colores["azul_bg"],
+                bgcolor=c_azul_bg,
                 border_radius=12,
                 margin=ft.margin.only(top=10)
             )
@@ -1431,10 +1666,10 @@ def main(page: ft.Page):
             ft.Container(
                 content=ft.Column([
                     ft.Row([
-                        ft.Text(f"📊 Balance de {mes_nombre} {anio_actual}", size=20, weight=ft.FontWeight.BOLD, expand=True, color=colores["texto"]),
+                        ft.Text(f"📊 Balance de {mes_nombre} {anio_actual}", size=20, weight=NEGRITA, expand=True, color=c_texto),
                         ft.IconButton(
                             icon="download",
-                            icon_color=colores["verde"],
+                            icon_color=c_verde,
                             tooltip="Exportar a Excel",
                             on_click=exportar_excel,
                             icon_size=28
@@ -1443,75 +1678,28 @@ def main(page: ft.Page):
                     ft.Divider(height=10, color="transparent"),
                     # Resumen en cards
                     ft.Row([
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Icon("trending_up", color=colores["verde"], size=24),
-                                ft.Text("Ingresos", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${ingresos_mes:,.0f}", size=16, weight=ft.FontWeight.BOLD, color=colores["verde"]),
-                            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                            padding=12,
-                            bgcolor=colores["verde_bg"],
-                            border_radius=10,
-                            expand=True
-                        ),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Icon("trending_down", color=colores["rojo"], size=24),
-                                ft.Text("Gastos", size=11, color=colores["texto_secundario"]),
-                                ft.Text(f"${gastos_mes:,.0f}", size=16, weight=ft.FontWeight.BOLD, color=colores["rojo"]),
-                            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                            padding=12,
-                            bgcolor=colores["rojo_bg"],
-                            border_radius=10,
-                            expand=True
-                        ),
+                        crear_tarjeta_estadistica("Ingresos", formato_dinero(ingresos_mes), c_verde, c_verde_bg, icono="trending_up"),
+                        crear_tarjeta_estadistica("Gastos", formato_dinero(gastos_mes), c_rojo, c_rojo_bg, icono="trending_down"),
                     ], spacing=10),
                     ft.Divider(height=10, color="transparent"),
                     ft.Row([
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text("Suscripciones", size=10, color=colores["texto_secundario"]),
-                                ft.Text(f"${total_subs:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["naranja"]),
-                            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                            padding=10,
-                            bgcolor=colores["naranja_bg"],
-                            border_radius=8,
-                            expand=True
-                        ),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text("Préstamos", size=10, color=colores["texto_secundario"]),
-                                ft.Text(f"${total_cuotas:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["purple"]),
-                            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                            padding=10,
-                            bgcolor=colores["purple_bg"],
-                            border_radius=8,
-                            expand=True
-                        ),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text("Créditos", size=10, color=colores["texto_secundario"]),
-                                ft.Text(f"${total_creditos:,.0f}", size=14, weight=ft.FontWeight.BOLD, color=colores["indigo"]),
-                            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                            padding=10,
-                            bgcolor=colores["indigo_bg"],
-                            border_radius=8,
-                            expand=True
-                        ),
+                        crear_tarjeta_estadistica("Suscripciones", formato_dinero(total_subs), c_naranja, c_naranja_bg),
+                        crear_tarjeta_estadistica("Préstamos", formato_dinero(total_cuotas), c_purple, c_purple_bg),
+                        crear_tarjeta_estadistica("Créditos", formato_dinero(total_creditos), c_indigo, c_indigo_bg),
                     ], spacing=8),
                     ft.Divider(height=15, color="transparent"),
                     # Balance final
                     ft.Container(
                         content=ft.Column([
-                            ft.Text("💰 Balance Final del Mes", size=14, color=colores["texto_secundario"]),
-                            ft.Text(f"${balance_mes:,.0f}", size=32, weight=ft.FontWeight.BOLD, 
-                                   color=colores["verde"] if balance_mes >= 0 else colores["rojo"]),
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                            ft.Text("💰 Balance Final del Mes", size=14, color=c_texto_secundario),
+                            ft.Text(formato_dinero(balance_mes), size=32, weight=NEGRITA, 
+                                   color=c_verde if balance_mes >= 0 else c_rojo),
+                        ], horizontal_alignment=CENTRADO),
                         padding=20,
-                        bgcolor=colores["tarjeta"],
+                        bgcolor=c_tarjeta,
                         border_radius=15,
-                        border=ft.border.all(2, colores["verde"] if balance_mes >= 0 else colores["rojo"]),
-                        shadow=ft.BoxShadow(spread_radius=1, blur_radius=8, color="black12", offset=ft.Offset(0, 2))
+                        border=ft.border.all(2, c_verde if balance_mes >= 0 else c_rojo),
+                        shadow=ft.BoxShadow(spread_radius=1, blur_radius=8, color="black12", offset=DESPLAZAMIENTO_SOMBRA)
                     ),
                     # Gráfico de categorías
                     crear_grafico_categorias(),
@@ -1521,173 +1709,59 @@ def main(page: ft.Page):
                 padding=15,
                 expand=True
             )
-        ], spacing=0, expand=True, scroll=ft.ScrollMode.AUTO)
+        ], spacing=0, expand=True, scroll=SCROLL_AUTO)
+    
+    def validar_campos(campos):
+        """Valida los campos del formulario y marca sus errores.
+        Retorna la lista de valores convertidos, o None si alguno no es válido"""
+        valores = []
+        hay_error = False
+        for campo in campos:
+            control = campo.control
+            control.error_text = None
+            if not control.value:
+                if campo.defecto is None:
+                    control.error_text = "Requerido"
+                    hay_error = True
+                valores.append(campo.defecto)
+                continue
+            patron = PATRONES_NUMERICOS.get(campo.convertir)
+            if patron is not None and not patron.match(control.value):
+                control.error_text = "Debe ser un número"
+                hay_error = True
+                valores.append(None)
+                continue
+            valor = campo.convertir(control.value)
+            if campo.es_valido is not None and not campo.es_valido(valor):
+                control.error_text = campo.mensaje
+                hay_error = True
+            valores.append(valor)
+        
+        if hay_error:
+            page.update()
+            return None
+        return valores
     
-    def crear_resumen_balance():
-        """Crea el widget de resumen de balance"""
-        colores = get_colores()
-        return ft.Container(
-            content=ft.Column([
-                ft.Text("Balance Total", size=14, color=colores["texto_secundario"], weight=ft.FontWeight.W_500),
-                txt_balance_total,
-                ft.Divider(height=5, color="transparent"),
-                ft.Row([
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Icon("arrow_upward", color=colores["verde"], size=18),
-                            ft.Text("Ingresos", size=11, color=colores["texto_secundario"]),
-                            txt_ingresos
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                        padding=8,
-                        bgcolor=colores["verde_bg"],
-                        border_radius=8,
-                        expand=True
-                    ),
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Icon("arrow_downward", color=colores["rojo"], size=18),
-                            ft.Text("Gastos", size=11, color=colores["texto_secundario"]),
-                            txt_gastos
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                        padding=8,
-                        bgcolor=colores["rojo_bg"],
-                        border_radius=8,
-                        expand=True
-                    ),
-                ], spacing=8),
-                ft.Divider(height=5, color="transparent"),
-                ft.Row([
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Icon("subscriptions", color=colores["naranja"], size=18),
-                            ft.Text("Suscripciones", size=11, color=colores["texto_secundario"]),
-                            txt_suscripciones
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                        padding=8,
-                        bgcolor=colores["naranja_bg"],
-                        border_radius=8,
-                        expand=True
-                    ),
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Icon("account_balance", color=colores["purple"], size=18),
-                            ft.Text("Préstamos", size=11, color=colores["texto_secundario"]),
-                            txt_prestamos
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                        padding=8,
-                        bgcolor=colores["purple_bg"],
-                        border_radius=8,
-                        expand=True
-                    ),
-                ], spacing=8),
-                ft.Divider(height=5, color="transparent"),
-                ft.Row([
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Icon("credit_card", color=colores["indigo"], size=18),
-                            ft.Text("Créditos", size=11, color=colores["texto_secundario"]),
-                            txt_creditos
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                        padding=8,
-                        bgcolor=colores["indigo_bg"],
-                        border_radius=8,
-                        expand=True
-                    ),
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Icon("savings", color=colores["teal"], size=18),
-                            ft.Text("Ahorros", size=11, color=colores["texto_secundario"]),
-                            txt_ahorros
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                        padding=8,
-                        bgcolor=colores["teal_bg"],
-                        border_radius=8,
-                        expand=True
-                    ),
-                ], spacing=8),
-                ft.Divider(height=5, color="transparent"),
-                ft.Row([
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Icon("account_balance", color=colores["cyan"], size=18),
-                            ft.Text("En Bancos", size=11, color=colores["texto_secundario"]),
-                            txt_bancos
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                        padding=8,
-                        bgcolor=colores["cyan_bg"],
-                        border_radius=8,
-                        expand=True
-                    ),
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Icon("account_balance_wallet", color=colores["azul"], size=18),
-                            ft.Text("Disponible", size=11, color=colores["texto_secundario"]),
-                            txt_disponible
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=2),
-                        padding=8,
-                        bgcolor=colores["azul_bg"],
-                        border_radius=8,
-                        expand=True
-                    ),
-                ], spacing=8),
-            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=5),
-            padding=15,
-            margin=10,
-            bgcolor=colores["tarjeta"],
-            border_radius=15,
-            shadow=ft.BoxShadow(spread_radius=0, blur_radius=8, color="black12", offset=ft.Offset(0, 2))
-        )
-
     def guardar_movimiento(e):
-        # Limpiar errores previos
-        input_desc.error_text = None
-        input_monto.error_text = None
-        
-        # Validar campos vacíos
-        if not input_desc.value or not input_monto.value:
-            input_desc.error_text = "Requerido" if not input_desc.value else None
-            input_monto.error_text = "Requerido" if not input_monto.value else None
-            page.update()
-            return
-        
-        # Validar formato de número
-        try:
-            monto = float(input_monto.value)
-        except ValueError:
-            input_monto.error_text = "Debe ser un número válido"
-            page.update()
-            return
-        
-        # Validar monto positivo
-        if monto <= 0:
-            input_monto.error_text = "Debe ser mayor a 0"
-            page.update()
+        valores = validar_campos([
+            Campo(input_desc),
+            Campo(input_monto, float, lambda v: v > 0, "Debe ser mayor a 0"),
+        ])
+        if valores is None:
             return
+        descripcion, monto = valores
 
-        # Intentar guardar en BD
-        if db.agregar_movimiento(
-            dropdown_tipo.value,
-            dropdown_cat.value,
-            monto,
-            input_desc.value
-        ):
-            # Si usa banco, agregar o retirar el monto de la cuenta
-            if dropdown_destino_movimiento.value == "banco" and dropdown_banco_movimiento.value:
-                # Extraer el ID del banco del valor seleccionado
-                id_cuenta = int(dropdown_banco_movimiento.value.split("_")[1])
-                
-                if dropdown_tipo.value == "ingreso":
-                    # Agregar monto al banco
-                    db.agregar_monto_cuenta(id_cuenta, monto)
-                else:
-                    # Retirar monto del banco (gasto)
-                    db.retirar_monto_cuenta(id_cuenta, monto)
-            
+        # Intentar guardar en BD; si usa banco, el saldo se ajusta en la misma transacción
+        if dropdown_destino_movimiento.value == "banco" and dropdown_banco_movimiento.value:
+            # La clave de la opción es directamente el ID de la cuenta
+            id_cuenta = int(dropdown_banco_movimiento.value)
+            guardado = db.agregar_movimiento_con_cuenta(dropdown_tipo.value, dropdown_cat.value, monto, descripcion, id_cuenta)
+        else:
+            guardado = db.agregar_movimiento(dropdown_tipo.value, dropdown_cat.value, monto, descripcion)
+        
+        if guardado:
             # Limpiar campos y cerrar diálogo
-            input_desc.value = ""
-            input_monto.value = ""
-            input_desc.error_text = None
-            input_monto.error_text = None
+            limpiar_campos(input_desc, input_monto)
             dropdown_banco_movimiento.visible = False
             bottom_sheet_movimiento.open = False
             actualizar_vista()
@@ -1697,39 +1771,17 @@ def main(page: ft.Page):
             page.update()
     
     def guardar_suscripcion(e):
-        input_sub_nombre.error_text = None
-        input_sub_monto.error_text = None
-        input_sub_dia.error_text = None
-        
-        if not input_sub_nombre.value or not input_sub_monto.value or not input_sub_dia.value:
-            input_sub_nombre.error_text = "Requerido" if not input_sub_nombre.value else None
-            input_sub_monto.error_text = "Requerido" if not input_sub_monto.value else None
-            input_sub_dia.error_text = "Requerido" if not input_sub_dia.value else None
-            page.update()
-            return
-        
-        try:
-            monto = float(input_sub_monto.value)
-            dia = int(input_sub_dia.value)
-        except ValueError:
-            input_sub_monto.error_text = "Debe ser un número"
-            page.update()
-            return
-        
-        if monto <= 0:
-            input_sub_monto.error_text = "Debe ser mayor a 0"
-            page.update()
+        valores = validar_campos([
+            Campo(input_sub_nombre),
+            Campo(input_sub_monto, float, lambda v: v > 0, "Debe ser mayor a 0"),
+            campo_dia(input_sub_dia),
+        ])
+        if valores is None:
             return
+        nombre, monto, dia = valores
         
-        if dia < 1 or dia > 31:
-            input_sub_dia.error_text = "Debe estar entre 1 y 31"
-            page.update()
-            return
-        
-        if db.agregar_suscripcion(input_sub_nombre.value, monto, dia):
-            input_sub_nombre.value = ""
-            input_sub_monto.value = ""
-            input_sub_dia.value = ""
+        if db.agregar_suscripcion(nombre, monto, dia):
+            limpiar_campos(input_sub_nombre, input_sub_monto, input_sub_dia)
             bottom_sheet_suscripcion.open = False
             actualizar_vista()
         else:
@@ -1737,44 +1789,18 @@ def main(page: ft.Page):
             page.update()
     
     def guardar_prestamo(e):
-        input_prest_banco.error_text = None
-        input_prest_monto_total.error_text = None
-        input_prest_cuota.error_text = None
-        input_prest_dia.error_text = None
-        
-        if not input_prest_banco.value or not input_prest_monto_total.value or not input_prest_cuota.value or not input_prest_dia.value:
-            input_prest_banco.error_text = "Requerido" if not input_prest_banco.value else None
-            input_prest_monto_total.error_text = "Requerido" if not input_prest_monto_total.value else None
-            input_prest_cuota.error_text = "Requerido" if not input_prest_cuota.value else None
-            input_prest_dia.error_text = "Requerido" if not input_prest_dia.value else None
-            page.update()
+        valores = validar_campos([
+            Campo(input_prest_banco),
+            Campo(input_prest_monto_total, float, lambda v: v > 0, "Debe ser mayor a 0"),
+            Campo(input_prest_cuota, float, lambda v: v > 0, "Debe ser mayor a 0"),
+            campo_dia(input_prest_dia),
+        ])
+        if valores is None:
             return
+        banco, monto_total, cuota, dia = valores
         
-        try:
-            monto_total = float(input_prest_monto_total.value)
-            cuota = float(input_prest_cuota.value)
-            dia = int(input_prest_dia.value)
-        except ValueError:
-            input_prest_monto_total.error_text = "Debe ser un número"
-            page.update()
-            return
-        
-        if monto_total <= 0 or cuota <= 0:
-            input_prest_monto_total.error_text = "Debe ser mayor a 0"
-            input_prest_cuota.error_text = "Debe ser mayor a 0"
-            page.update()
-            return
-        
-        if dia < 1 or dia > 31:
-            input_prest_dia.error_text = "Debe estar entre 1 y 31"
-            page.update()
-            return
-        
-        if db.agregar_prestamo(input_prest_banco.value, monto_total, cuota, dia):
-            input_prest_banco.value = ""
-            input_prest_monto_total.value = ""
-            input_prest_cuota.value = ""
-            input_prest_dia.value = ""
+        if db.agregar_prestamo(banco, monto_total, cuota, dia):
+            limpiar_campos(input_prest_banco, input_prest_monto_total, input_prest_cuota, input_prest_dia)
             bottom_sheet_prestamo.open = False
             actualizar_vista()
         else:
@@ -1782,46 +1808,20 @@ def main(page: ft.Page):
             page.update()
     
     def guardar_credito(e):
-        input_credito_desc.error_text = None
-        input_credito_banco.error_text = None
-        input_credito_monto.error_text = None
-        input_credito_meses.error_text = None
-        input_credito_interes.error_text = None
-        
-        if not input_credito_desc.value or not input_credito_banco.value or not input_credito_monto.value or not input_credito_meses.value:
-            input_credito_desc.error_text = "Requerido" if not input_credito_desc.value else None
-            input_credito_banco.error_text = "Requerido" if not input_credito_banco.value else None
-            input_credito_monto.error_text = "Requerido" if not input_credito_monto.value else None
-            input_credito_meses.error_text = "Requerido" if not input_credito_meses.value else None
-            page.update()
-            return
-        
-        try:
-            monto = float(input_credito_monto.value)
-            meses = int(input_credito_meses.value)
-            tasa_interes = float(input_credito_interes.value) if input_credito_interes.value else 0
-        except ValueError:
-            input_credito_monto.error_text = "Debe ser un número"
-            page.update()
-            return
-        
-        if monto <= 0 or meses <= 0:
-            input_credito_monto.error_text = "Debe ser mayor a 0" if monto <= 0 else None
-            input_credito_meses.error_text = "Debe ser mayor a 0" if meses <= 0 else None
-            page.update()
+        valores = validar_campos([
+            Campo(input_credito_desc),
+            Campo(input_credito_banco),
+            Campo(input_credito_monto, float, lambda v: v > 0, "Debe ser mayor a 0"),
+            Campo(input_credito_meses, int, lambda v: v > 0, "Debe ser mayor a 0"),
+            Campo(input_credito_interes, float, lambda v: v >= 0, "No puede ser negativo", defecto=0),
+        ])
+        if valores is None:
             return
+        descripcion, banco, monto, meses, tasa_interes = valores
         
-        if tasa_interes < 0:
-            input_credito_interes.error_text = "No puede ser negativo"
-            page.update()
-            return
-        
-        if db.agregar_credito(input_credito_desc.value, input_credito_banco.value, monto, meses, tasa_interes):
-            input_credito_desc.value = ""
-            input_credito_banco.value = ""
-            input_credito_monto.value = ""
-            input_credito_meses.value = ""
-            input_credito_interes.value = "0"
+        if db.agregar_credito(descripcion, banco, monto, meses, tasa_interes):
+            limpiar_campos(input_credito_desc, input_credito_banco, input_credito_monto, input_credito_meses)
+            limpiar_campos(input_credito_interes, valor="0")
             bottom_sheet_credito.open = False
             actualizar_vista()
         else:
@@ -1829,30 +1829,16 @@ def main(page: ft.Page):
             page.update()
     
     def guardar_ahorro(e):
-        input_ahorro_nombre.error_text = None
-        input_ahorro_meta.error_text = None
-        
-        if not input_ahorro_nombre.value or not input_ahorro_meta.value:
-            input_ahorro_nombre.error_text = "Requerido" if not input_ahorro_nombre.value else None
-            input_ahorro_meta.error_text = "Requerido" if not input_ahorro_meta.value else None
-            page.update()
+        valores = validar_campos([
+            Campo(input_ahorro_nombre),
+            Campo(input_ahorro_meta, float, lambda v: v > 0, "Debe ser mayor a 0"),
+        ])
+        if valores is None:
             return
+        nombre, meta = valores
         
-        try:
-            meta = float(input_ahorro_meta.value)
-        except ValueError:
-            input_ahorro_meta.error_text = "Debe ser un número"
-            page.update()
-            return
-        
-        if meta <= 0:
-            input_ahorro_meta.error_text = "Debe ser mayor a 0"
-            page.update()
-            return
-        
-        if db.agregar_ahorro(input_ahorro_nombre.value, meta):
-            input_ahorro_nombre.value = ""
-            input_ahorro_meta.value = ""
+        if db.agregar_ahorro(nombre, meta):
+            limpiar_campos(input_ahorro_nombre, input_ahorro_meta)
             bottom_sheet_ahorro.open = False
             actualizar_vista()
         else:
@@ -1860,27 +1846,18 @@ def main(page: ft.Page):
             page.update()
     
     def guardar_cuenta_bancaria(e):
-        input_banco_nombre.error_text = None
-        input_banco_saldo.error_text = None
-        input_banco_limite.error_text = None
-        
-        if not input_banco_nombre.value:
-            input_banco_nombre.error_text = "Requerido"
-            page.update()
-            return
-        
-        try:
-            saldo = float(input_banco_saldo.value) if input_banco_saldo.value else 0
-            limite = float(input_banco_limite.value) if input_banco_limite.value else 0
-        except ValueError:
-            input_banco_saldo.error_text = "Debe ser un número"
-            page.update()
+        valores = validar_campos([
+            Campo(input_banco_nombre),
+            Campo(input_banco_saldo, float, defecto=0),
+            Campo(input_banco_limite, float, defecto=0),
+        ])
+        if valores is None:
             return
+        nombre_banco, saldo, limite = valores
         
-        if db.agregar_cuenta_bancaria(input_banco_nombre.value, dropdown_tipo_cuenta.value, saldo, limite):
-            input_banco_nombre.value = ""
-            input_banco_saldo.value = "0"
-            input_banco_limite.value = "0"
+        if db.agregar_cuenta_bancaria(nombre_banco, dropdown_tipo_cuenta.value, saldo, limite):
+            limpiar_campos(input_banco_nombre)
+            limpiar_campos(input_banco_saldo, input_banco_limite, valor="0")
             dropdown_tipo_cuenta.value = "debito"
             bottom_sheet_banco.open = False
             actualizar_vista()
@@ -1900,175 +1877,54 @@ def main(page: ft.Page):
         if db.borrar_prestamo(id_pres):
             actualizar_vista()
     
-    def borrar_ahorro(id_aho):
+    def borrar_ahorro(id_aho, e=None):
         if db.borrar_ahorro(id_aho):
             actualizar_vista()
     
-    def borrar_credito(id_cred):
+    def borrar_credito(id_cred, e=None):
         if db.borrar_credito(id_cred):
             actualizar_vista()
     
-    def registrar_pago_credito_directo(id_cred):
+    def registrar_pago_credito_directo(id_cred, e=None):
         if db.registrar_pago_credito(id_cred):
             actualizar_vista()
     
-    def borrar_cuenta_bancaria(id_cuenta):
+    def borrar_cuenta_bancaria(id_cuenta, e=None):
         if db.borrar_cuenta_bancaria(id_cuenta):
             actualizar_vista()
 
     # --- Elementos de Navegación y Estructura ---
     
     # Campos para suscripciones
-    input_sub_nombre = ft.TextField(
-        label="Nombre",
-        hint_text="Ej: Netflix, Spotify...",
-        color="black",
-        text_size=16,
-        border_color="orange700",
-        focused_border_color="orange900"
-    )
-    input_sub_monto = ft.TextField(
-        label="Monto mensual",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="orange700",
-        focused_border_color="orange900"
-    )
-    input_sub_dia = ft.TextField(
-        label="Día de cobro (1-31)",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="orange700",
-        focused_border_color="orange900"
-    )
+    input_sub_nombre = crear_campo("Nombre", "orange700", borde_foco="orange900", hint_text="Ej: Netflix, Spotify...")
+    input_sub_monto = crear_campo("Monto mensual", "orange700", borde_foco="orange900", numerico=True)
+    input_sub_dia = crear_campo("Día de cobro (1-31)", "orange700", borde_foco="orange900", numerico=True)
     
     # Campos para préstamos
-    input_prest_banco = ft.TextField(
-        label="Banco",
-        hint_text="Ej: Banco Nacional, BBVA...",
-        color="black",
-        text_size=16,
-        border_color="purple700",
-        focused_border_color="purple900"
-    )
-    input_prest_monto_total = ft.TextField(
-        label="Monto total del préstamo",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="purple700",
-        focused_border_color="purple900"
-    )
-    input_prest_cuota = ft.TextField(
-        label="Cuota mensual",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="purple700",
-        focused_border_color="purple900"
-    )
-    input_prest_dia = ft.TextField(
-        label="Día de pago (1-31)",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="purple700",
-        focused_border_color="purple900"
-    )
+    input_prest_banco = crear_campo("Banco", "purple700", borde_foco="purple900", hint_text="Ej: Banco Nacional, BBVA...")
+    input_prest_monto_total = crear_campo("Monto total del préstamo", "purple700", borde_foco="purple900", numerico=True)
+    input_prest_cuota = crear_campo("Cuota mensual", "purple700", borde_foco="purple900", numerico=True)
+    input_prest_dia = crear_campo("Día de pago (1-31)", "purple700", borde_foco="purple900", numerico=True)
     
     # Campo para registrar pago de préstamo
-    input_pago_monto = ft.TextField(
-        label="Monto del pago",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="purple700",
-        focused_border_color="purple900"
-    )
+    input_pago_monto = crear_campo("Monto del pago", "purple700", borde_foco="purple900", numerico=True)
     
     # Campos para créditos
-    input_credito_desc = ft.TextField(
-        label="Descripción de la compra",
-        hint_text="Ej: TV, Laptop, Refrigerador...",
-        color="black",
-        text_size=16,
-        border_color="indigo700",
-        focused_border_color="indigo900"
-    )
-    input_credito_banco = ft.TextField(
-        label="Banco/Tarjeta",
-        hint_text="Ej: BBVA, Santander, Liverpool...",
-        color="black",
-        text_size=16,
-        border_color="indigo700",
-        focused_border_color="indigo900"
-    )
-    input_credito_monto = ft.TextField(
-        label="Monto total",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="indigo700",
-        focused_border_color="indigo900"
-    )
-    input_credito_meses = ft.TextField(
-        label="Plazo en meses",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="indigo700",
-        focused_border_color="indigo900"
-    )
-    input_credito_interes = ft.TextField(
-        label="Tasa de interés mensual % (0 = sin intereses)",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        hint_text="Ej: 0, 2.5, 3.8",
-        value="0",
-        color="black",
-        text_size=16,
-        border_color="indigo700",
-        focused_border_color="indigo900"
-    )
+    input_credito_desc = crear_campo("Descripción de la compra", "indigo700", borde_foco="indigo900", hint_text="Ej: TV, Laptop, Refrigerador...")
+    input_credito_banco = crear_campo("Banco/Tarjeta", "indigo700", borde_foco="indigo900", hint_text="Ej: BBVA, Santander, Liverpool...")
+    input_credito_monto = crear_campo("Monto total", "indigo700", borde_foco="indigo900", numerico=True)
+    input_credito_meses = crear_campo("Plazo en meses", "indigo700", borde_foco="indigo900", numerico=True)
+    input_credito_interes = crear_campo("Tasa de interés mensual % (0 = sin intereses)", "indigo700", borde_foco="indigo900", numerico=True, hint_text="Ej: 0, 2.5, 3.8", value="0")
     
     # Campos para ahorros
-    input_ahorro_nombre = ft.TextField(
-        label="Nombre del ahorro",
-        hint_text="Ej: Vacaciones, Auto, Casa...",
-        color="black",
-        text_size=16,
-        border_color="teal700",
-        focused_border_color="teal900"
-    )
-    input_ahorro_meta = ft.TextField(
-        label="Meta de ahorro",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="teal700",
-        focused_border_color="teal900"
-    )
+    input_ahorro_nombre = crear_campo("Nombre del ahorro", "teal700", borde_foco="teal900", hint_text="Ej: Vacaciones, Auto, Casa...")
+    input_ahorro_meta = crear_campo("Meta de ahorro", "teal700", borde_foco="teal900", numerico=True)
     
     # Campo para agregar/retirar monto de ahorro
-    input_monto_ahorro = ft.TextField(
-        label="Monto",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="teal700",
-        focused_border_color="teal900"
-    )
+    input_monto_ahorro = crear_campo("Monto", "teal700", borde_foco="teal900", numerico=True)
     
     # Campos para cuentas bancarias
-    input_banco_nombre = ft.TextField(
-        label="Nombre del banco",
-        hint_text="Ej: BBVA, Santander, Banorte...",
-        color="black",
-        text_size=16,
-        border_color="cyan900",
-        focused_border_color="cyan900"
-    )
+    input_banco_nombre = crear_campo("Nombre del banco", "cyan900", hint_text="Ej: BBVA, Santander, Banorte...")
     dropdown_tipo_cuenta = ft.Dropdown(
         label="Tipo de cuenta",
         options=[
@@ -2077,186 +1933,99 @@ def main(page: ft.Page):
             ft.dropdown.Option("ahorro", "Ahorro"),
             ft.dropdown.Option("inversion", "Inversión"),
         ],
-        value="debito",
-        color="black",
-        border_color="cyan900"
-    )
-    input_banco_saldo = ft.TextField(
-        label="Saldo inicial",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        value="0",
-        color="black",
-        text_size=16,
-        border_color="cyan900",
-        focused_border_color="cyan900"
-    )
-    input_banco_limite = ft.TextField(
-        label="Límite de crédito (solo para tarjetas)",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        value="0",
+        value="debito",
         color="black",
-        text_size=16,
-        border_color="cyan900",
-        focused_border_color="cyan900"
+        border_color="cyan900"
     )
+    input_banco_saldo = crear_campo("Saldo inicial", "cyan900", numerico=True, value="0")
+    input_banco_limite = crear_campo("Límite de crédito (solo para tarjetas)", "cyan900", numerico=True, value="0")
     
     # Campo para depositar/retirar de cuenta bancaria
-    input_monto_banco = ft.TextField(
-        label="Monto",
-        keyboard_type=ft.KeyboardType.NUMBER,
-        color="black",
-        text_size=16,
-        border_color="cyan900",
-        focused_border_color="cyan900"
-    )
+    input_monto_banco = crear_campo("Monto", "cyan900", numerico=True)
 
+    def abrir_hoja(hoja):
+        """Abre una BottomSheet, montándola en el overlay la primera vez que se usa"""
+        if hoja not in page.overlay:
+            page.overlay.append(hoja)
+        hoja.open = True
+    
     # Dialogo para agregar movimiento
-    bottom_sheet_movimiento = ft.BottomSheet(
-        ft.Container(
-            ft.Column(
-                [
-                    ft.Text("💸 Agregar Movimiento", size=20, weight=ft.FontWeight.BOLD),
-                    dropdown_tipo,
-                    dropdown_destino_movimiento,
-                    dropdown_banco_movimiento,
-                    dropdown_cat,
-                    input_desc,
-                    input_monto,
-                    ft.ElevatedButton("Guardar", on_click=guardar_movimiento, width=float("inf"))
-                ],
-                tight=True,
-                spacing=15,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            padding=20,
-            border_radius=ft.border_radius.only(top_left=20, top_right=20)
-        ),
-        is_scroll_controlled=True,
-        use_safe_area=True
+    bottom_sheet_movimiento = crear_bottom_sheet(
+        "💸 Agregar Movimiento",
+        [
+            dropdown_tipo,
+            dropdown_destino_movimiento,
+            dropdown_banco_movimiento,
+            dropdown_cat,
+            input_desc,
+            input_monto,
+        ],
+        guardar_movimiento
     )
     
     # Dialogo para agregar suscripción
-    bottom_sheet_suscripcion = ft.BottomSheet(
-        ft.Container(
-            ft.Column(
-                [
-                    ft.Text("📆 Agregar Suscripción", size=20, weight=ft.FontWeight.BOLD),
-                    input_sub_nombre,
-                    input_sub_monto,
-                    input_sub_dia,
-                    ft.ElevatedButton("Guardar", on_click=guardar_suscripcion, width=float("inf"))
-                ],
-                tight=True,
-                spacing=15,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            padding=20,
-            border_radius=ft.border_radius.only(top_left=20, top_right=20)
-        ),
-        is_scroll_controlled=True,
-        use_safe_area=True
+    bottom_sheet_suscripcion = crear_bottom_sheet(
+        "📆 Agregar Suscripción",
+        [
+            input_sub_nombre,
+            input_sub_monto,
+            input_sub_dia,
+        ],
+        guardar_suscripcion
     )
     
     # Dialogo para agregar préstamo
-    bottom_sheet_prestamo = ft.BottomSheet(
-        ft.Container(
-            ft.Column(
-                [
-                    ft.Text("🏦 Agregar Préstamo", size=20, weight=ft.FontWeight.BOLD),
-                    input_prest_banco,
-                    input_prest_monto_total,
-                    input_prest_cuota,
-                    input_prest_dia,
-                    ft.ElevatedButton("Guardar", on_click=guardar_prestamo, width=float("inf"))
-                ],
-                tight=True,
-                spacing=15,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            padding=20,
-            border_radius=ft.border_radius.only(top_left=20, top_right=20)
-        ),
-        is_scroll_controlled=True,
-        use_safe_area=True
+    bottom_sheet_prestamo = crear_bottom_sheet(
+        "🏦 Agregar Préstamo",
+        [
+            input_prest_banco,
+            input_prest_monto_total,
+            input_prest_cuota,
+            input_prest_dia,
+        ],
+        guardar_prestamo
     )
     
     # Dialogo para agregar compra a crédito
-    bottom_sheet_credito = ft.BottomSheet(
-        ft.Container(
-            ft.Column(
-                [
-                    ft.Text("💳 Agregar Compra a Crédito", size=20, weight=ft.FontWeight.BOLD),
-                    input_credito_desc,
-                    input_credito_banco,
-                    input_credito_monto,
-                    input_credito_meses,
-                    input_credito_interes,
-                    ft.Text("ℹ️ Si es sin intereses, deja el campo en 0", size=11, color="grey600", italic=True),
-                    ft.ElevatedButton("Guardar", on_click=guardar_credito, width=float("inf"))
-                ],
-                tight=True,
-                spacing=12,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            padding=20,
-            border_radius=ft.border_radius.only(top_left=20, top_right=20)
-        ),
-        is_scroll_controlled=True,
-        use_safe_area=True
+    bottom_sheet_credito = crear_bottom_sheet(
+        "💳 Agregar Compra a Crédito",
+        [
+            input_credito_desc,
+            input_credito_banco,
+            input_credito_monto,
+            input_credito_meses,
+            input_credito_interes,
+            ft.Text("ℹ️ Si es sin intereses, deja el campo en 0", size=11, color="grey600", italic=True),
+        ],
+        guardar_credito,
+        spacing=12
     )
     
-    # Variable para almacenar el ID del préstamo al registrar pago
-    prestamo_id_pago = [None]
+    # Registro sobre el que actúan las hojas de pago y de agregar/retirar monto
+    operacion = EstadoOperacion()
     
     # Dialogo para registrar pago de préstamo
-    bottom_sheet_pago_prestamo = ft.BottomSheet(
-        ft.Container(
-            ft.Column(
-                [
-                    ft.Text("💳 Registrar Pago", size=20, weight=ft.FontWeight.BOLD),
-                    input_pago_monto,
-                    ft.ElevatedButton("Confirmar Pago", on_click=lambda e: registrar_pago(e), width=float("inf"))
-                ],
-                tight=True,
-                spacing=15,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            padding=20,
-            border_radius=ft.border_radius.only(top_left=20, top_right=20)
-        ),
-        is_scroll_controlled=True,
-        use_safe_area=True
+    bottom_sheet_pago_prestamo = crear_bottom_sheet(
+        "💳 Registrar Pago",
+        [input_pago_monto],
+        lambda e: registrar_pago(e),
+        texto_boton="Confirmar Pago"
     )
     
-    def abrir_registrar_pago(id_prestamo):
-        prestamo_id_pago[0] = id_prestamo
-        input_pago_monto.value = ""
-        input_pago_monto.error_text = None
-        bottom_sheet_pago_prestamo.open = True
+    def abrir_registrar_pago(id_prestamo, e=None):
+        operacion.prestamo_id = id_prestamo
+        limpiar_campos(input_pago_monto)
+        abrir_hoja(bottom_sheet_pago_prestamo)
         page.update()
     
     def registrar_pago(e):
-        input_pago_monto.error_text = None
-        
-        if not input_pago_monto.value:
-            input_pago_monto.error_text = "Requerido"
-            page.update()
+        valores = validar_campos([Campo(input_pago_monto, float, lambda v: v > 0, "Debe ser mayor a 0")])
+        if valores is None:
             return
+        monto = valores[0]
         
-        try:
-            monto = float(input_pago_monto.value)
-        except ValueError:
-            input_pago_monto.error_text = "Debe ser un número"
-            page.update()
-            return
-        
-        if monto <= 0:
-            input_pago_monto.error_text = "Debe ser mayor a 0"
-            page.update()
-            return
-        
-        if db.registrar_pago_prestamo(prestamo_id_pago[0], monto):
-            input_pago_monto.value = ""
+        if db.registrar_pago_prestamo(operacion.prestamo_id, monto):
+            limpiar_campos(input_pago_monto)
             bottom_sheet_pago_prestamo.open = False
             actualizar_vista()
         else:
@@ -2264,96 +2033,54 @@ def main(page: ft.Page):
             page.update()
     
     # Dialogo para agregar ahorro
-    bottom_sheet_ahorro = ft.BottomSheet(
-        ft.Container(
-            ft.Column(
-                [
-                    ft.Text("🎯 Crear Meta de Ahorro", size=20, weight=ft.FontWeight.BOLD),
-                    input_ahorro_nombre,
-                    input_ahorro_meta,
-                    ft.ElevatedButton("Crear Meta", on_click=guardar_ahorro, width=float("inf"))
-                ],
-                tight=True,
-                spacing=15,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            padding=20,
-            border_radius=ft.border_radius.only(top_left=20, top_right=20)
-        ),
-        is_scroll_controlled=True,
-        use_safe_area=True
+    bottom_sheet_ahorro = crear_bottom_sheet(
+        "🎯 Crear Meta de Ahorro",
+        [
+            input_ahorro_nombre,
+            input_ahorro_meta,
+        ],
+        guardar_ahorro,
+        texto_boton="Crear Meta"
     )
     
-    # Variable para almacenar el ID del ahorro al agregar/retirar monto
-    ahorro_id_operacion = [None]
-    operacion_tipo = ["agregar"]  # "agregar" o "retirar"
-    
     # Dialogo para agregar/retirar monto de ahorro
-    bottom_sheet_monto_ahorro = ft.BottomSheet(
-        ft.Container(
-            ft.Column(
-                [
-                    ft.Text("💰 Modificar Ahorro", size=20, weight=ft.FontWeight.BOLD),
-                    input_monto_ahorro,
-                    ft.ElevatedButton("Confirmar", on_click=lambda e: confirmar_operacion_ahorro(e), width=float("inf"))
-                ],
-                tight=True,
-                spacing=15,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            padding=20,
-            border_radius=ft.border_radius.only(top_left=20, top_right=20)
-        ),
-        is_scroll_controlled=True,
-        use_safe_area=True
+    bottom_sheet_monto_ahorro = crear_bottom_sheet(
+        "💰 Modificar Ahorro",
+        [input_monto_ahorro],
+        lambda e: confirmar_operacion_ahorro(e),
+        texto_boton="Confirmar"
     )
     
-    def abrir_agregar_monto(id_ahorro):
-        ahorro_id_operacion[0] = id_ahorro
-        operacion_tipo[0] = "agregar"
-        input_monto_ahorro.value = ""
-        input_monto_ahorro.error_text = None
+    def abrir_agregar_monto(id_ahorro, e=None):
+        operacion.ahorro_id = id_ahorro
+        operacion.tipo_ahorro = "agregar"
+        limpiar_campos(input_monto_ahorro)
         input_monto_ahorro.label = "Monto a agregar"
-        bottom_sheet_monto_ahorro.open = True
+        abrir_hoja(bottom_sheet_monto_ahorro)
         page.update()
     
-    def abrir_retirar_monto(id_ahorro):
-        ahorro_id_operacion[0] = id_ahorro
-        operacion_tipo[0] = "retirar"
-        input_monto_ahorro.value = ""
-        input_monto_ahorro.error_text = None
+    def abrir_retirar_monto(id_ahorro, e=None):
+        operacion.ahorro_id = id_ahorro
+        operacion.tipo_ahorro = "retirar"
+        limpiar_campos(input_monto_ahorro)
         input_monto_ahorro.label = "Monto a retirar"
-        bottom_sheet_monto_ahorro.open = True
+        abrir_hoja(bottom_sheet_monto_ahorro)
         page.update()
     
     def confirmar_operacion_ahorro(e):
-        input_monto_ahorro.error_text = None
-        
-        if not input_monto_ahorro.value:
-            input_monto_ahorro.error_text = "Requerido"
-            page.update()
-            return
-        
-        try:
-            monto = float(input_monto_ahorro.value)
-        except ValueError:
-            input_monto_ahorro.error_text = "Debe ser un número"
-            page.update()
-            return
-        
-        if monto <= 0:
-            input_monto_ahorro.error_text = "Debe ser mayor a 0"
-            page.update()
+        valores = validar_campos([Campo(input_monto_ahorro, float, lambda v: v > 0, "Debe ser mayor a 0")])
+        if valores is None:
             return
+        monto = valores[0]
         
         exito = False
-        if operacion_tipo[0] == "agregar":
-            exito = db.agregar_monto_ahorro(ahorro_id_operacion[0], monto)
+        if operacion.tipo_ahorro == "agregar":
+            exito = db.agregar_monto_ahorro(operacion.ahorro_id, monto)
         else:
-            exito = db.retirar_monto_ahorro(ahorro_id_operacion[0], monto)
+            exito = db.retirar_monto_ahorro(operacion.ahorro_id, monto)
         
         if exito:
-            input_monto_ahorro.value = ""
+            limpiar_campos(input_monto_ahorro)
             bottom_sheet_monto_ahorro.open = False
             actualizar_vista()
         else:
@@ -2361,99 +2088,57 @@ def main(page: ft.Page):
             page.update()
     
     # Dialogo para agregar cuenta bancaria
-    bottom_sheet_banco = ft.BottomSheet(
-        ft.Container(
-            ft.Column(
-                [
-                    ft.Text("🏦 Agregar Cuenta Bancaria", size=20, weight=ft.FontWeight.BOLD),
-                    input_banco_nombre,
-                    dropdown_tipo_cuenta,
-                    input_banco_saldo,
-                    input_banco_limite,
-                    ft.Text("ℹ️ El límite solo aplica para tarjetas de crédito", size=11, color="grey600", italic=True),
-                    ft.ElevatedButton("Guardar", on_click=guardar_cuenta_bancaria, width=float("inf"))
-                ],
-                tight=True,
-                spacing=12,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            padding=20,
-            border_radius=ft.border_radius.only(top_left=20, top_right=20)
-        ),
-        is_scroll_controlled=True,
-        use_safe_area=True
+    bottom_sheet_banco = crear_bottom_sheet(
+        "🏦 Agregar Cuenta Bancaria",
+        [
+            input_banco_nombre,
+            dropdown_tipo_cuenta,
+            input_banco_saldo,
+            input_banco_limite,
+            ft.Text("ℹ️ El límite solo aplica para tarjetas de crédito", size=11, color="grey600", italic=True),
+        ],
+        guardar_cuenta_bancaria,
+        spacing=12
     )
     
-    # Variable para almacenar el ID de la cuenta al depositar/retirar
-    cuenta_id_operacion = [None]
-    operacion_tipo_banco = ["depositar"]  # "depositar" o "retirar"
-    
     # Dialogo para depositar/retirar de cuenta bancaria
-    bottom_sheet_monto_banco = ft.BottomSheet(
-        ft.Container(
-            ft.Column(
-                [
-                    ft.Text("💰 Modificar Saldo", size=20, weight=ft.FontWeight.BOLD),
-                    input_monto_banco,
-                    ft.ElevatedButton("Confirmar", on_click=lambda e: confirmar_operacion_banco(e), width=float("inf"))
-                ],
-                tight=True,
-                spacing=15,
-                scroll=ft.ScrollMode.AUTO
-            ),
-            padding=20,
-            border_radius=ft.border_radius.only(top_left=20, top_right=20)
-        ),
-        is_scroll_controlled=True,
-        use_safe_area=True
+    bottom_sheet_monto_banco = crear_bottom_sheet(
+        "💰 Modificar Saldo",
+        [input_monto_banco],
+        lambda e: confirmar_operacion_banco(e),
+        texto_boton="Confirmar"
     )
     
-    def abrir_depositar_banco(id_cuenta):
-        cuenta_id_operacion[0] = id_cuenta
-        operacion_tipo_banco[0] = "depositar"
-        input_monto_banco.value = ""
-        input_monto_banco.error_text = None
+    def abrir_depositar_banco(id_cuenta, e=None):
+        operacion.cuenta_id = id_cuenta
+        operacion.tipo_banco = "depositar"
+        limpiar_campos(input_monto_banco)
         input_monto_banco.label = "Monto a depositar"
-        bottom_sheet_monto_banco.open = True
+        abrir_hoja(bottom_sheet_monto_banco)
         page.update()
     
-    def abrir_retirar_banco(id_cuenta):
-        cuenta_id_operacion[0] = id_cuenta
-        operacion_tipo_banco[0] = "retirar"
-        input_monto_banco.value = ""
-        input_monto_banco.error_text = None
+    def abrir_retirar_banco(id_cuenta, e=None):
+        operacion.cuenta_id = id_cuenta
+        operacion.tipo_banco = "retirar"
+        limpiar_campos(input_monto_banco)
         input_monto_banco.label = "Monto a retirar"
-        bottom_sheet_monto_banco.open = True
+        abrir_hoja(bottom_sheet_monto_banco)
         page.update()
     
     def confirmar_operacion_banco(e):
-        input_monto_banco.error_text = None
-        
-        if not input_monto_banco.value:
-            input_monto_banco.error_text = "Requerido"
-            page.update()
-            return
-        
-        try:
-            monto = float(input_monto_banco.value)
-        except ValueError:
-            input_monto_banco.error_text = "Debe ser un número"
-            page.update()
-            return
-        
-        if monto <= 0:
-            input_monto_banco.error_text = "Debe ser mayor a 0"
-            page.update()
+        valores = validar_campos([Campo(input_monto_banco, float, lambda v: v > 0, "Debe ser mayor a 0")])
+        if valores is None:
             return
+        monto = valores[0]
         
         exito = False
-        if operacion_tipo_banco[0] == "depositar":
-            exito = db.agregar_monto_cuenta(cuenta_id_operacion[0], monto)
+        if operacion.tipo_banco == "depositar":
+            exito = db.agregar_monto_cuenta(operacion.cuenta_id, monto)
         else:
-            exito = db.retirar_monto_cuenta(cuenta_id_operacion[0], monto)
+            exito = db.retirar_monto_cuenta(operacion.cuenta_id, monto)
         
         if exito:
-            input_monto_banco.value = ""
+            limpiar_campos(input_monto_banco)
             bottom_sheet_monto_banco.open = False
             actualizar_vista()
         else:
@@ -2465,66 +2150,36 @@ def main(page: ft.Page):
         
         if vista_actual == "suscripciones":
             # Limpiar campos de suscripción
-            input_sub_nombre.value = ""
-            input_sub_monto.value = ""
-            input_sub_dia.value = ""
-            input_sub_nombre.error_text = None
-            input_sub_monto.error_text = None
-            input_sub_dia.error_text = None
-            bottom_sheet_suscripcion.open = True
+            limpiar_campos(input_sub_nombre, input_sub_monto, input_sub_dia)
+            abrir_hoja(bottom_sheet_suscripcion)
         elif vista_actual == "prestamos":
             # Limpiar campos de préstamo
-            input_prest_banco.value = ""
-            input_prest_monto_total.value = ""
-            input_prest_cuota.value = ""
-            input_prest_dia.value = ""
-            input_prest_banco.error_text = None
-            input_prest_monto_total.error_text = None
-            input_prest_cuota.error_text = None
-            input_prest_dia.error_text = None
-            bottom_sheet_prestamo.open = True
+            limpiar_campos(input_prest_banco, input_prest_monto_total, input_prest_cuota, input_prest_dia)
+            abrir_hoja(bottom_sheet_prestamo)
         elif vista_actual == "creditos":
             # Limpiar campos de crédito
-            input_credito_desc.value = ""
-            input_credito_banco.value = ""
-            input_credito_monto.value = ""
-            input_credito_meses.value = ""
-            input_credito_interes.value = "0"
-            input_credito_desc.error_text = None
-            input_credito_banco.error_text = None
-            input_credito_monto.error_text = None
-            input_credito_meses.error_text = None
-            input_credito_interes.error_text = None
-            bottom_sheet_credito.open = True
+            limpiar_campos(input_credito_desc, input_credito_banco, input_credito_monto, input_credito_meses)
+            limpiar_campos(input_credito_interes, valor="0")
+            abrir_hoja(bottom_sheet_credito)
         elif vista_actual == "ahorros":
             # Limpiar campos de ahorro
-            input_ahorro_nombre.value = ""
-            input_ahorro_meta.value = ""
-            input_ahorro_nombre.error_text = None
-            input_ahorro_meta.error_text = None
-            bottom_sheet_ahorro.open = True
+            limpiar_campos(input_ahorro_nombre, input_ahorro_meta)
+            abrir_hoja(bottom_sheet_ahorro)
         elif vista_actual == "bancos":
             # Limpiar campos de cuenta bancaria
-            input_banco_nombre.value = ""
-            input_banco_saldo.value = "0"
-            input_banco_limite.value = "0"
+            limpiar_campos(input_banco_nombre)
+            limpiar_campos(input_banco_saldo, input_banco_limite, valor="0")
             dropdown_tipo_cuenta.value = "debito"
-            input_banco_nombre.error_text = None
-            input_banco_saldo.error_text = None
-            input_banco_limite.error_text = None
-            bottom_sheet_banco.open = True
+            abrir_hoja(bottom_sheet_banco)
         else:
             # Limpiar campos de movimiento
-            input_desc.value = ""
-            input_monto.value = ""
-            input_desc.error_text = None
-            input_monto.error_text = None
+            limpiar_campos(input_desc, input_monto)
             dropdown_tipo.value = "gasto"
             dropdown_cat.value = "Comida"
             dropdown_destino_movimiento.value = "efectivo"
             dropdown_banco_movimiento.visible = False
             actualizar_opciones_destino()
-            bottom_sheet_movimiento.open = True
+            abrir_hoja(bottom_sheet_movimiento)
         
         page.update()
 
@@ -2532,65 +2187,72 @@ def main(page: ft.Page):
     # FUNCIONES DE EDICIÓN
     # =====================================================
     
-    def abrir_editar_movimiento(mov):
-        """Abre el formulario para editar un movimiento"""
-        if len(mov) == 7:
-            id_mov, tipo, cat, monto, desc, fecha, modo = mov
-        else:
-            id_mov, tipo, cat, monto, desc, fecha = mov
-        
-        registro_editando[0] = "movimiento"
-        registro_editando[1] = id_mov
-        
-        input_desc.value = desc
-        input_monto.value = str(monto)
-        dropdown_tipo.value = tipo
-        dropdown_cat.value = cat
-        
-        bottom_sheet_movimiento.open = True
-        page.update()
-    
-    def abrir_editar_suscripcion(sub):
-        """Abre el formulario para editar una suscripción"""
-        id_sub, nombre, monto, dia_cobro, activa = sub
-        
-        registro_editando[0] = "suscripcion"
-        registro_editando[1] = id_sub
-        
-        input_sub_nombre.value = nombre
-        input_sub_monto.value = str(monto)
-        input_sub_dia.value = str(dia_cobro)
-        
-        bottom_sheet_suscripcion.open = True
+    # Hoja y campos de cada tipo de registro editable: (control, columna, conversión)
+    EDITORES = {
+        "movimiento": (bottom_sheet_movimiento, (
+            (input_desc, "descripcion", None),
+            (input_monto, "monto", str),
+            (dropdown_tipo, "tipo", None),
+            (dropdown_cat, "categoria", None),
+        )),
+        "suscripcion": (bottom_sheet_suscripcion, (
+            (input_sub_nombre, "nombre", None),
+            (input_sub_monto, "monto", str),
+            (input_sub_dia, "dia_cobro", str),
+        )),
+        "prestamo": (bottom_sheet_prestamo, (
+            (input_prest_banco, "banco", None),
+            (input_prest_monto_total, "monto_total", str),
+            (input_prest_cuota, "cuota_mensual", str),
+            (input_prest_dia, "dia_pago", str),
+        )),
+        "ahorro": (bottom_sheet_ahorro, (
+            (input_ahorro_nombre, "nombre", None),
+            (input_ahorro_meta, "meta", str),
+        )),
+    }
+    
+    def abrir_editar(tipo, registro, e=None):
+        """Abre el formulario del tipo de registro con sus valores para editarlo"""
+        hoja, campos = EDITORES[tipo]
+        registro_editando[0] = tipo
+        registro_editando[1] = registro["id"]
+        
+        for control, columna, convertir in campos:
+            valor = registro[columna]
+            control.value = convertir(valor) if convertir else valor
+        
+        abrir_hoja(hoja)
         page.update()
     
-    def abrir_editar_prestamo(pres):
-        """Abre el formulario para editar un préstamo"""
-        id_pres, banco, monto_total, monto_pagado, cuota_mensual, dia_pago, fecha_inicio, activo = pres
-        
-        registro_editando[0] = "prestamo"
-        registro_editando[1] = id_pres
-        
-        input_prest_banco.value = banco
-        input_prest_monto_total.value = str(monto_total)
-        input_prest_cuota.value = str(cuota_mensual)
-        input_prest_dia.value = str(dia_pago)
-        
-        bottom_sheet_prestamo.open = True
-        page.update()
+    # FilePicker para importar backup; uno solo para toda la app, montado al iniciar
+    async def resultado_file_picker(e: ft.FilePickerResultEvent):
+        if e.files and len(e.files) > 0:
+            archivo = e.files[0]
+            colores = get_colores()
+            try:
+                importado = await asyncio.to_thread(db.importar_datos, archivo.path)
+                # La versión y la caché se actualizan aquí, en el hilo de la interfaz
+                db.invalidar_cache()
+                if importado:
+                    page.show_snack_bar(
+                        ft.SnackBar(
+                            content=ft.Text("✅ Datos importados correctamente. Reinicia la app para ver los cambios."),
+                            bgcolor=colores.verde,
+                            duration=5000
+                        )
+                    )
+                    actualizar_vista()
+                else:
+                    page.show_snack_bar(
+                        ft.SnackBar(content=ft.Text("❌ Error al importar datos"), bgcolor=colores.rojo)
+                    )
+            except Exception as ex:
+                page.show_snack_bar(
+                    ft.SnackBar(content=ft.Text(f"❌ Error: {ex}"), bgcolor=colores.rojo)
+                )
     
-    def abrir_editar_ahorro(aho):
-        """Abre el formulario para editar un ahorro"""
-        id_aho, nombre, meta, monto_actual, fecha_inicio, completado = aho
-        
-        registro_editando[0] = "ahorro"
-        registro_editando[1] = id_aho
-        
-        input_ahorro_nombre.value = nombre
-        input_ahorro_meta.value = str(meta)
-        
-        bottom_sheet_ahorro.open = True
-        page.update()
+    file_picker = ft.FilePicker(on_result=resultado_file_picker)
     
     # =====================================================
     # VISTA DE CONFIGURACIÓN
@@ -2599,14 +2261,13 @@ def main(page: ft.Page):
     def crear_vista_configuracion():
         """Crea la vista de configuración"""
         colores = get_colores()
-        tema_actual = db.obtener_tema()
-        es_oscuro = tema_actual == "dark"
+        # page.theme_mode ya refleja el tema guardado (se fija al iniciar y en cambiar_tema)
+        es_oscuro = page.theme_mode == ft.ThemeMode.DARK
         
         def cambiar_tema(e):
             nuevo_tema = "dark" if e.control.value else "light"
             db.guardar_tema(nuevo_tema)
             page.theme_mode = ft.ThemeMode.DARK if nuevo_tema == "dark" else ft.ThemeMode.LIGHT
-            page.update()
             actualizar_vista()
         
         def cambiar_pin(e):
@@ -2621,63 +2282,30 @@ def main(page: ft.Page):
             btn_saltar_pin.visible = True
             page.update()
         
-        def exportar_backup(e):
+        async def exportar_backup(e):
             """Exporta todos los datos"""
             try:
-                datos = db.exportar_datos()
-                if datos:
-                    nombre_archivo = f"JFinanzas_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                    ruta_documentos = os.path.join(os.path.expanduser('~'), 'Documents')
-                    ruta_completa = os.path.join(ruta_documentos, nombre_archivo)
-                    
-                    with open(ruta_completa, 'w', encoding='utf-8') as f:
-                        f.write(datos)
-                    
+                nombre_archivo = f"JFinanzas_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                ruta_completa = os.path.join(carpeta_exportacion(), nombre_archivo)
+                
+                # La consulta y la escritura del JSON se hacen fuera del hilo de la interfaz
+                if await asyncio.to_thread(db.exportar_datos, ruta_completa):
                     page.show_snack_bar(
                         ft.SnackBar(
                             content=ft.Text(f"✅ Backup guardado en: {ruta_completa}"),
-                            bgcolor=colores["verde"],
+                            bgcolor=colores.verde,
                             duration=5000
                         )
                     )
                 else:
                     page.show_snack_bar(
-                        ft.SnackBar(content=ft.Text("❌ Error al exportar"), bgcolor=colores["rojo"])
+                        ft.SnackBar(content=ft.Text("❌ Error al exportar"), bgcolor=colores.rojo)
                     )
             except Exception as ex:
                 page.show_snack_bar(
-                    ft.SnackBar(content=ft.Text(f"❌ Error: {ex}"), bgcolor=colores["rojo"])
+                    ft.SnackBar(content=ft.Text(f"❌ Error: {ex}"), bgcolor=colores.rojo)
                 )
         
-        # FilePicker para importar backup
-        def resultado_file_picker(e: ft.FilePickerResultEvent):
-            if e.files and len(e.files) > 0:
-                archivo = e.files[0]
-                try:
-                    with open(archivo.path, 'r', encoding='utf-8') as f:
-                        json_data = f.read()
-                    
-                    if db.importar_datos(json_data):
-                        page.show_snack_bar(
-                            ft.SnackBar(
-                                content=ft.Text("✅ Datos importados correctamente. Reinicia la app para ver los cambios."),
-                                bgcolor=colores["verde"],
-                                duration=5000
-                            )
-                        )
-                        actualizar_vista()
-                    else:
-                        page.show_snack_bar(
-                            ft.SnackBar(content=ft.Text("❌ Error al importar datos"), bgcolor=colores["rojo"])
-                        )
-                except Exception as ex:
-                    page.show_snack_bar(
-                        ft.SnackBar(content=ft.Text(f"❌ Error: {ex}"), bgcolor=colores["rojo"])
-                    )
-        
-        file_picker = ft.FilePicker(on_result=resultado_file_picker)
-        page.overlay.append(file_picker)
-        
         def importar_backup(e):
             """Abre el selector de archivos para importar"""
             file_picker.pick_files(
@@ -2689,21 +2317,21 @@ def main(page: ft.Page):
         return ft.Column([
             ft.Container(
                 content=ft.Column([
-                    ft.Text("⚙️ Configuración", size=24, weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                    ft.Divider(height=20, color=colores["borde"]),
+                    ft.Text("⚙️ Configuración", size=24, weight=NEGRITA, color=colores.texto),
+                    ft.Divider(height=20, color=colores.borde),
                     
                     # Tema
                     ft.Container(
                         content=ft.Row([
-                            ft.Icon("dark_mode", color=colores["purple"]),
+                            ft.Icon("dark_mode", color=colores.purple),
                             ft.Column([
-                                ft.Text("Modo Oscuro", weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                                ft.Text("Cambia la apariencia de la app", size=12, color=colores["texto_secundario"]),
+                                ft.Text("Modo Oscuro", weight=NEGRITA, color=colores.texto),
+                                ft.Text("Cambia la apariencia de la app", size=12, color=colores.texto_secundario),
                             ], expand=True, spacing=2),
                             ft.Switch(value=es_oscuro, on_change=cambiar_tema)
                         ]),
                         padding=15,
-                        bgcolor=colores["purple_bg"],
+                        bgcolor=colores.purple_bg,
                         border_radius=10,
                     ),
                     ft.Divider(height=10, color="transparent"),
@@ -2711,15 +2339,15 @@ def main(page: ft.Page):
                     # Seguridad
                     ft.Container(
                         content=ft.Row([
-                            ft.Icon("lock", color=colores["azul"]),
+                            ft.Icon("lock", color=colores.azul),
                             ft.Column([
-                                ft.Text("Cambiar PIN", weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                                ft.Text("Modifica tu PIN de acceso", size=12, color=colores["texto_secundario"]),
+                                ft.Text("Cambiar PIN", weight=NEGRITA, color=colores.texto),
+                                ft.Text("Modifica tu PIN de acceso", size=12, color=colores.texto_secundario),
                             ], expand=True, spacing=2),
-                            ft.IconButton(icon="chevron_right", on_click=cambiar_pin, icon_color=colores["texto"])
+                            ft.IconButton(icon="chevron_right", on_click=cambiar_pin, icon_color=colores.texto)
                         ]),
                         padding=15,
-                        bgcolor=colores["azul_bg"],
+                        bgcolor=colores.azul_bg,
                         border_radius=10,
                     ),
                     ft.Divider(height=10, color="transparent"),
@@ -2727,15 +2355,15 @@ def main(page: ft.Page):
                     # Backup - Exportar
                     ft.Container(
                         content=ft.Row([
-                            ft.Icon("backup", color=colores["verde"]),
+                            ft.Icon("backup", color=colores.verde),
                             ft.Column([
-                                ft.Text("Exportar Backup", weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                                ft.Text("Guarda todos tus datos en JSON", size=12, color=colores["texto_secundario"]),
+                                ft.Text("Exportar Backup", weight=NEGRITA, color=colores.texto),
+                                ft.Text("Guarda todos tus datos en JSON", size=12, color=colores.texto_secundario),
                             ], expand=True, spacing=2),
-                            ft.IconButton(icon="download", on_click=exportar_backup, icon_color=colores["texto"])
+                            ft.IconButton(icon="download", on_click=exportar_backup, icon_color=colores.texto)
                         ]),
                         padding=15,
-                        bgcolor=colores["verde_bg"],
+                        bgcolor=colores.verde_bg,
                         border_radius=10,
                     ),
                     ft.Divider(height=10, color="transparent"),
@@ -2743,15 +2371,15 @@ def main(page: ft.Page):
                     # Backup - Importar
                     ft.Container(
                         content=ft.Row([
-                            ft.Icon("cloud_upload", color=colores["cyan"]),
+                            ft.Icon("cloud_upload", color=colores.cyan),
                             ft.Column([
-                                ft.Text("Importar Backup", weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                                ft.Text("Restaura datos desde archivo JSON", size=12, color=colores["texto_secundario"]),
+                                ft.Text("Importar Backup", weight=NEGRITA, color=colores.texto),
+                                ft.Text("Restaura datos desde archivo JSON", size=12, color=colores.texto_secundario),
                             ], expand=True, spacing=2),
-                            ft.IconButton(icon="upload_file", on_click=importar_backup, icon_color=colores["texto"])
+                            ft.IconButton(icon="upload_file", on_click=importar_backup, icon_color=colores.texto)
                         ]),
                         padding=15,
-                        bgcolor=colores["cyan_bg"],
+                        bgcolor=colores.cyan_bg,
                         border_radius=10,
                     ),
                     ft.Divider(height=20, color="transparent"),
@@ -2759,17 +2387,17 @@ def main(page: ft.Page):
                     # Info de la app
                     ft.Container(
                         content=ft.Column([
-                            ft.Text("📱 Mis Finanzas", size=18, weight=ft.FontWeight.BOLD, color=colores["texto"]),
-                            ft.Text("Versión 2.0", size=14, color=colores["texto_secundario"]),
-                            ft.Text("Gestiona tus finanzas de forma inteligente", size=12, color=colores["texto_secundario"]),
+                            ft.Text("📱 Mis Finanzas", size=18, weight=NEGRITA, color=colores.texto),
+                            ft.Text("Versión 2.0", size=14, color=colores.texto_secundario),
+                            ft.Text("Gestiona tus finanzas de forma inteligente", size=12, color=colores.texto_secundario),
                             ft.Divider(height=10, color="transparent"),
                             ft.Row([
-                                ft.Icon("code", size=16, color=colores["texto_secundario"]),
-                                ft.Text("Desarrollado con Flet + Python", size=11, color=colores["texto_secundario"]),
+                                ft.Icon("code", size=16, color=colores.texto_secundario),
+                                ft.Text("Desarrollado con Flet + Python", size=11, color=colores.texto_secundario),
                             ], spacing=5)
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                        ], horizontal_alignment=CENTRADO),
                         padding=20,
-                        bgcolor=colores["gris_bg"],
+                        bgcolor=colores.gris_bg,
                         border_radius=15,
                         alignment=ft.alignment.center
                     ),
@@ -2777,7 +2405,7 @@ def main(page: ft.Page):
                 padding=20,
                 expand=True
             )
-        ], spacing=0, expand=True, scroll=ft.ScrollMode.AUTO)
+        ], spacing=0, expand=True, scroll=SCROLL_AUTO)
     
     # =====================================================
     # VISTA DE PRESUPUESTOS
@@ -2786,258 +2414,289 @@ def main(page: ft.Page):
     def crear_vista_presupuestos():
         """Crea la vista de presupuestos por categoría"""
         colores = get_colores()
-        lista_presupuestos = ft.ListView(spacing=10, padding=10, expand=True)
+        vista, filas = construir_vista_presupuestos(colores)
         
-        presupuestos = db.obtener_presupuestos()
+        # Presupuestos indexados por categoría (el primero de cada una, como
+        # antes) y gasto del mes en una sola consulta
+        presupuestos = {}
+        for p in db.obtener_presupuestos():
+            presupuestos.setdefault(p["categoria"], p)
+        gastos_mes = dict(db.obtener_gastos_por_categoria())
+        
+        for cat, fila in filas.items():
+            # Buscar si hay presupuesto definido
+            presupuesto_cat = presupuestos.get(cat)
+            limite = presupuesto_cat["limite"] if presupuesto_cat else 0
+            id_pres = presupuesto_cat["id"] if presupuesto_cat else None
+            
+            gasto_actual = gastos_mes.get(cat, 0)
+            porcentaje = (gasto_actual / limite * 100) if limite > 0 else 0
+            
+            # Color y estado según el tramo del porcentaje
+            clave_color, estado = ESTADOS_PRESUPUESTO[bisect.bisect_right(UMBRALES_PRESUPUESTO, porcentaje)]
+            color_progreso = getattr(colores, clave_color)
+            
+            fila.estado.value = estado if limite > 0 else "Sin límite"
+            fila.estado.color = color_progreso if limite > 0 else colores.texto_secundario
+            fila.gasto.value = f"Gastado: {formato_dinero(gasto_actual)}"
+            fila.limite.value = f"Límite: {formato_dinero(limite)}" if limite > 0 else "No definido"
+            fila.progreso.value = min(porcentaje/100, 1) if limite > 0 else 0
+            fila.progreso.color = color_progreso
+            fila.progreso.visible = limite > 0
+            fila.borrar.data = id_pres
+            fila.borrar.visible = limite > 0
+        
+        return vista
+    
+    def construir_vista_presupuestos(colores):
+        """Construye la columna de presupuestos con una fila por categoría, sin valores"""
+        lista_presupuestos = ft.ListView(spacing=10, padding=10, expand=True)
         
         # Header
         header = ft.Container(
             content=ft.Column([
-                ft.Text("📋 Presupuestos por Categoría", size=20, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                ft.Text("📋 Presupuestos por Categoría", size=20, weight=NEGRITA, color=colores.texto),
                 ft.Divider(height=10, color="transparent"),
                 ft.Text("Define límites de gasto para cada categoría y controla mejor tus finanzas.", 
-                       size=14, color=colores["texto_secundario"]),
+                       size=14, color=colores.texto_secundario),
             ]),
             padding=20,
-            bgcolor=colores["naranja_bg"],
+            bgcolor=colores.naranja_bg,
             border_radius=15,
             margin=10
         )
         
-        categorias = ["Comida", "Transporte", "Servicios", "Ocio", "Salud", "Compras", "Educación", "Otro"]
-        
-        for cat in categorias:
-            # Buscar si hay presupuesto definido
-            presupuesto_cat = next((p for p in presupuestos if p[1] == cat), None)
-            limite = presupuesto_cat[2] if presupuesto_cat else 0
-            id_pres = presupuesto_cat[0] if presupuesto_cat else None
-            
-            gasto_actual = db.obtener_gasto_categoria_mes(cat)
-            porcentaje = (gasto_actual / limite * 100) if limite > 0 else 0
-            
-            # Color según el porcentaje
-            if porcentaje >= 100:
-                color_progreso = colores["rojo"]
-                estado = "⚠️ Excedido"
-            elif porcentaje >= 80:
-                color_progreso = colores["naranja"]
-                estado = "⚡ Cerca del límite"
-            else:
-                color_progreso = colores["verde"]
-                estado = "✅ Dentro del presupuesto"
+        filas = {}
+        
+        def crear_fila(cat):
+            """Crea la tarjeta de una categoría y guarda sus controles variables en 'filas'"""
+            fila = FilaPresupuesto(
+                estado=ft.Text(size=12),
+                gasto=ft.Text(size=13, color=colores.texto),
+                limite=ft.Text(size=13, color=colores.texto_secundario),
+                progreso=ft.ProgressBar(bgcolor=colores.borde),
+                campo_limite=ft.TextField(
+                    hint_text="Límite",
+                    keyboard_type=TECLADO_NUMERICO,
+                    width=120,
+                    height=40,
+                    text_size=14,
+                    data=cat
+                ),
+                borrar=ft.IconButton(
+                    icon="delete",
+                    icon_color=colores.rojo,
+                    tooltip="Eliminar límite",
+                    on_click=partial(borrar_presupuesto_cat, cat)
+                ),
+            )
+            filas[cat] = fila
             
-            item = ft.Container(
+            return ft.Container(
                 content=ft.Column([
                     ft.Row([
-                        ft.Text(cat, weight=ft.FontWeight.BOLD, size=15, color=colores["texto"]),
-                        ft.Text(estado if limite > 0 else "Sin límite", size=12, 
-                               color=color_progreso if limite > 0 else colores["texto_secundario"]),
-                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                    ft.Row([
-                        ft.Text(f"Gastado: ${gasto_actual:,.0f}", size=13, color=colores["texto"]),
-                        ft.Text(f"Límite: ${limite:,.0f}" if limite > 0 else "No definido", 
-                               size=13, color=colores["texto_secundario"]),
+                        ft.Text(cat, weight=NEGRITA, size=15, color=colores.texto),
+                        fila.estado,
                     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                    ft.ProgressBar(
-                        value=min(porcentaje/100, 1) if limite > 0 else 0,
-                        color=color_progreso,
-                        bgcolor=colores["borde"]
-                    ) if limite > 0 else ft.Container(),
+                    ft.Row([fila.gasto, fila.limite], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    fila.progreso,
                     ft.Row([
-                        ft.TextField(
-                            hint_text="Límite",
-                            keyboard_type=ft.KeyboardType.NUMBER,
-                            width=120,
-                            height=40,
-                            text_size=14,
-                            data=cat
-                        ),
+                        fila.campo_limite,
                         ft.ElevatedButton(
                             "Guardar",
-                            bgcolor=colores["naranja"],
+                            bgcolor=colores.naranja,
                             color="white",
                             height=40,
-                            on_click=lambda e, c=cat: guardar_presupuesto_cat(e, c)
+                            on_click=partial(guardar_presupuesto_cat, cat)
                         ),
-                        ft.IconButton(
-                            icon="delete",
-                            icon_color=colores["rojo"],
-                            tooltip="Eliminar límite",
-                            on_click=lambda e, i=id_pres, c=cat: confirmar_borrado("presupuesto", i, f"presupuesto de {c}") if i else None,
-                            visible=limite > 0
-                        )
+                        fila.borrar
                     ], spacing=10)
                 ], spacing=8),
                 padding=15,
-                bgcolor=colores["tarjeta"],
+                bgcolor=colores.tarjeta,
                 border_radius=12,
-                border=ft.border.all(1, colores["borde"])
+                border=ft.border.all(1, colores.borde)
             )
-            lista_presupuestos.controls.append(item)
         
-        return ft.Column([header, lista_presupuestos], spacing=0, expand=True)
+        lista_presupuestos.controls = [crear_fila(cat) for cat in CATEGORIAS_GASTO]
+        return ft.Column([header, lista_presupuestos], spacing=0, expand=True), filas
     
-    def guardar_presupuesto_cat(e, categoria):
+    def guardar_presupuesto_cat(categoria, e):
         """Guarda el presupuesto de una categoría"""
         # Buscar el TextField correspondiente
         for control in e.control.parent.controls:
             if isinstance(control, ft.TextField) and control.data == categoria:
-                try:
-                    limite = float(control.value)
-                    if limite > 0:
-                        db.agregar_presupuesto(categoria, limite)
-                        actualizar_vista()
-                        page.show_snack_bar(
-                            ft.SnackBar(content=ft.Text(f"✅ Presupuesto de {categoria} guardado"), bgcolor="green")
-                        )
-                except:
+                if not PATRONES_NUMERICOS[float].match(control.value or ""):
                     page.show_snack_bar(
                         ft.SnackBar(content=ft.Text("❌ Ingresa un número válido"), bgcolor="red")
                     )
+                    break
+                limite = float(control.value)
+                if limite > 0:
+                    db.agregar_presupuesto(categoria, limite)
+                    actualizar_vista()
+                    page.show_snack_bar(
+                        ft.SnackBar(content=ft.Text(f"✅ Presupuesto de {categoria} guardado"), bgcolor="green")
+                    )
                 break
     
+    def borrar_presupuesto_cat(categoria, e):
+        """Pide confirmación para borrar el límite de una categoría (el id va en data)"""
+        if e.control.data:
+            confirmar_borrado("presupuesto", e.control.data, f"presupuesto de {categoria}")
+    
     # =====================================================
     # VISTA DE TRANSFERENCIAS
     # =====================================================
     
     def crear_vista_transferencias():
-        """Crea la vista de transferencias entre cuentas"""
-        colores = get_colores()
+        """Crea la vista de transferencias con el formulario y el historial"""
         cuentas = db.obtener_cuentas_bancarias()
         transferencias = db.obtener_transferencias()
+        colores = get_colores()
+        c_texto = colores.texto
+        c_texto_secundario = colores.texto_secundario
+        c_cyan = colores.cyan
+        c_rojo = colores.rojo
         
-        # Header con formulario de transferencia
-        opciones_cuentas = [ft.dropdown.Option(str(c[0]), f"{c[1]} ({c[2]})") for c in cuentas]
+        # Header con formulario de transferencia; cada Dropdown necesita sus propias opciones
+        def opciones_cuentas():
+            return [ft.dropdown.Option(str(c["id"]), f"{c['nombre_banco']} ({c['tipo_cuenta']})") for c in cuentas]
         
         dropdown_origen = ft.Dropdown(
             label="Cuenta origen",
-            options=opciones_cuentas,
+            options=opciones_cuentas(),
             width=150
         )
         
         dropdown_destino = ft.Dropdown(
             label="Cuenta destino",
-            options=opciones_cuentas,
+            options=opciones_cuentas(),
             width=150
         )
         
         input_monto_trans = ft.TextField(
             label="Monto",
-            keyboard_type=ft.KeyboardType.NUMBER,
+            keyboard_type=TECLADO_NUMERICO,
             width=120
         )
         
         def realizar_transferencia_click(e):
             if not dropdown_origen.value or not dropdown_destino.value or not input_monto_trans.value:
                 page.show_snack_bar(
-                    ft.SnackBar(content=ft.Text("❌ Completa todos los campos"), bgcolor=colores["rojo"])
+                    ft.SnackBar(content=ft.Text("❌ Completa todos los campos"), bgcolor=c_rojo)
                 )
                 return
             
             if dropdown_origen.value == dropdown_destino.value:
                 page.show_snack_bar(
-                    ft.SnackBar(content=ft.Text("❌ Las cuentas deben ser diferentes"), bgcolor=colores["rojo"])
+                    ft.SnackBar(content=ft.Text("❌ Las cuentas deben ser diferentes"), bgcolor=c_rojo)
                 )
                 return
             
-            try:
-                monto = float(input_monto_trans.value)
-                if monto <= 0:
-                    raise ValueError()
-                
-                if db.realizar_transferencia(int(dropdown_origen.value), int(dropdown_destino.value), monto):
-                    page.show_snack_bar(
-                        ft.SnackBar(content=ft.Text("✅ Transferencia realizada"), bgcolor=colores["verde"])
-                    )
-                    dropdown_origen.value = None
-                    dropdown_destino.value = None
-                    input_monto_trans.value = ""
-                    actualizar_vista()
-                else:
-                    page.show_snack_bar(
-                        ft.SnackBar(content=ft.Text("❌ Error en la transferencia"), bgcolor=colores["rojo"])
-                    )
-            except:
+            valor = input_monto_trans.value
+            if not PATRONES_NUMERICOS[float].match(valor) or float(valor) <= 0:
+                page.show_snack_bar(
+                    ft.SnackBar(content=ft.Text("❌ Monto inválido"), bgcolor=c_rojo)
+                )
+                return
+            monto = float(valor)
+            
+            if db.realizar_transferencia(int(dropdown_origen.value), int(dropdown_destino.value), monto):
+                page.show_snack_bar(
+                    ft.SnackBar(content=ft.Text("✅ Transferencia realizada"), bgcolor=colores.verde)
+                )
+                dropdown_origen.value = None
+                dropdown_destino.value = None
+                limpiar_campos(input_monto_trans)
+                actualizar_vista()
+            else:
                 page.show_snack_bar(
-                    ft.SnackBar(content=ft.Text("❌ Monto inválido"), bgcolor=colores["rojo"])
+                    ft.SnackBar(content=ft.Text("❌ Error en la transferencia"), bgcolor=c_rojo)
                 )
         
         header = ft.Container(
             content=ft.Column([
-                ft.Text("🔄 Transferir entre Cuentas", size=20, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                ft.Text("🔄 Transferir entre Cuentas", size=20, weight=NEGRITA, color=c_texto),
                 ft.Divider(height=10, color="transparent"),
-                ft.Row([dropdown_origen, ft.Icon("arrow_forward", color=colores["texto"]), dropdown_destino], 
+                ft.Row([dropdown_origen, ft.Icon("arrow_forward", color=c_texto), dropdown_destino], 
                        alignment=ft.MainAxisAlignment.CENTER, spacing=10),
                 ft.Row([
                     input_monto_trans,
-                    ft.ElevatedButton("Transferir", icon="send", bgcolor=colores["cyan"], color="white",
+                    ft.ElevatedButton("Transferir", icon="send", bgcolor=c_cyan, color="white",
                                      on_click=realizar_transferencia_click)
                 ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
-            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            ], horizontal_alignment=CENTRADO),
             padding=20,
-            bgcolor=colores["cyan_bg"],
+            bgcolor=colores.cyan_bg,
             border_radius=15,
             margin=10
         )
         
-        # Historial de transferencias
+        # Historial de transferencias; el borde es compartido por todos los elementos
+        borde_tarjeta = ft.border.all(1, colores.borde)
+        c_tarjeta = colores.tarjeta
         lista_trans = ft.ListView(spacing=10, padding=10, expand=True)
         
+        def crear_item_transferencia(trans):
+            id_t, origen, destino, monto, fecha, desc = trans
+            return ft.Container(
+                content=ft.Row([
+                    ft.Icon("swap_horiz", color=c_cyan),
+                    ft.Column([
+                        ft.Text(f"{origen} → {destino}", weight=NEGRITA, size=14, color=c_texto),
+                        ft.Text(fecha, size=12, color=c_texto_secundario),
+                    ], expand=True, spacing=2),
+                    ft.Text(formato_dinero(monto), weight=NEGRITA, color=c_cyan, size=16)
+                ]),
+                padding=12,
+                bgcolor=c_tarjeta,
+                border_radius=10,
+                border=borde_tarjeta
+            )
+        
         if not transferencias:
             lista_trans.controls.append(
                 ft.Container(
-                    content=ft.Text("No hay transferencias registradas.", italic=True, color=colores["texto_secundario"]),
+                    content=ft.Text("No hay transferencias registradas.", italic=True, color=c_texto_secundario),
                     padding=40,
                     alignment=ft.alignment.center
                 )
             )
         else:
-            for trans in transferencias:
-                id_t, origen, destino, monto, fecha, desc = trans
-                lista_trans.controls.append(
-                    ft.Container(
-                        content=ft.Row([
-                            ft.Icon("swap_horiz", color=colores["cyan"]),
-                            ft.Column([
-                                ft.Text(f"{origen} → {destino}", weight=ft.FontWeight.BOLD, size=14, color=colores["texto"]),
-                                ft.Text(fecha, size=12, color=colores["texto_secundario"]),
-                            ], expand=True, spacing=2),
-                            ft.Text(f"${monto:,.0f}", weight=ft.FontWeight.BOLD, color=colores["cyan"], size=16)
-                        ]),
-                        padding=12,
-                        bgcolor=colores["tarjeta"],
-                        border_radius=10,
-                        border=ft.border.all(1, colores["borde"])
-                    )
-                )
+            lista_trans.controls = [crear_item_transferencia(trans) for trans in transferencias]
         
         return ft.Column([
             header,
             ft.Container(
-                content=ft.Text("📜 Historial de Transferencias", size=16, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                content=ft.Text("📜 Historial de Transferencias", size=16, weight=NEGRITA, color=c_texto),
                 padding=ft.padding.only(left=15, top=10)
             ),
             lista_trans
         ], spacing=0, expand=True)
     
+    # Función que construye cada sección, usada por actualizar_vista
+    CREADORES_VISTA = {
+        "inicio": crear_vista_inicio,
+        "suscripciones": crear_vista_suscripciones,
+        "prestamos": crear_vista_prestamos,
+        "creditos": crear_vista_creditos,
+        "ahorros": crear_vista_ahorros,
+        "bancos": crear_vista_bancos,
+        "balance": crear_vista_balance_mensual,
+        "presupuestos": crear_vista_presupuestos,
+        "transferencias": crear_vista_transferencias,
+        "configuracion": crear_vista_configuracion,
+    }
+    
     # Actualizar función de cambio de vista
     def cambiar_vista(e):
         nonlocal vista_actual
         idx = e.control.selected_index
-        # Nueva estructura: Inicio, Movimientos, Reportes, Ahorros, Más
-        if idx == 0:
-            vista_actual = "inicio"
-            actualizar_vista()
-        elif idx == 1:
-            vista_actual = "balance"
+        if idx < len(VISTAS_NAVEGACION):
+            vista_actual = VISTAS_NAVEGACION[idx]
             actualizar_vista()
-        elif idx == 2:
-            vista_actual = "presupuestos"
-            actualizar_vista()
-        elif idx == 3:
-            vista_actual = "ahorros"
-            actualizar_vista()
-        elif idx == 4:
+        else:
             # Abrir menú "Más"
             mostrar_menu_mas()
     
@@ -3047,15 +2706,15 @@ def main(page: ft.Page):
             nonlocal vista_actual
             vista_actual = seccion
             bottom_sheet_mas.open = False
-            page.update()
+            # actualizar_vista hace el único page.update() (cierra la hoja y cambia la vista)
             actualizar_vista()
         
         opciones_mas = [
-            {"icono": "subscriptions", "titulo": "Suscripciones", "subtitulo": "Netflix, Spotify, etc.", "seccion": "suscripciones", "color": colores["naranja"]},
-            {"icono": "account_balance", "titulo": "Préstamos", "subtitulo": "Deudas bancarias", "seccion": "prestamos", "color": colores["purple"]},
-            {"icono": "credit_card", "titulo": "Créditos", "subtitulo": "Compras a meses", "seccion": "creditos", "color": colores["indigo"]},
-            {"icono": "account_balance_wallet", "titulo": "Cuentas Bancarias", "subtitulo": "Administra tus cuentas", "seccion": "bancos", "color": colores["cyan"]},
-            {"icono": "swap_horiz", "titulo": "Transferencias", "subtitulo": "Entre cuentas", "seccion": "transferencias", "color": colores["teal"]},
+            {"icono": "subscriptions", "titulo": "Suscripciones", "subtitulo": "Netflix, Spotify, etc.", "seccion": "suscripciones", "color": colores.naranja},
+            {"icono": "account_balance", "titulo": "Préstamos", "subtitulo": "Deudas bancarias", "seccion": "prestamos", "color": colores.purple},
+            {"icono": "credit_card", "titulo": "Créditos", "subtitulo": "Compras a meses", "seccion": "creditos", "color": colores.indigo},
+            {"icono": "account_balance_wallet", "titulo": "Cuentas Bancarias", "subtitulo": "Administra tus cuentas", "seccion": "bancos", "color": colores.cyan},
+            {"icono": "swap_horiz", "titulo": "Transferencias", "subtitulo": "Entre cuentas", "seccion": "transferencias", "color": colores.teal},
         ]
         
         lista_opciones = []
@@ -3070,33 +2729,33 @@ def main(page: ft.Page):
                         bgcolor=op["color"],
                         alignment=ft.alignment.center
                     ),
-                    title=ft.Text(op["titulo"], weight=ft.FontWeight.W_500, color=colores["texto"]),
-                    subtitle=ft.Text(op["subtitulo"], size=12, color=colores["texto_secundario"]),
+                    title=ft.Text(op["titulo"], weight=ft.FontWeight.W_500, color=colores.texto),
+                    subtitle=ft.Text(op["subtitulo"], size=12, color=colores.texto_secundario),
                     on_click=lambda e, s=op["seccion"]: ir_a_seccion(s),
                 )
             )
-            lista_opciones.append(ft.Divider(height=1, color=colores["borde"]))
+            lista_opciones.append(ft.Divider(height=1, color=colores.borde))
         
         bottom_sheet_mas.content = ft.Container(
             content=ft.Column([
                 ft.Container(
                     content=ft.Row([
-                        ft.Text("Más opciones", size=18, weight=ft.FontWeight.BOLD, color=colores["texto"]),
+                        ft.Text("Más opciones", size=18, weight=NEGRITA, color=colores.texto),
                         ft.IconButton(
                             icon="close",
-                            icon_color=colores["texto_secundario"],
+                            icon_color=colores.texto_secundario,
                             on_click=lambda e: cerrar_menu_mas()
                         )
                     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                     padding=ft.padding.only(left=20, right=10, top=10)
                 ),
-                ft.Divider(height=1, color=colores["borde"]),
+                ft.Divider(height=1, color=colores.borde),
                 ft.Column(lista_opciones, spacing=0),
             ], spacing=0, tight=True),
-            bgcolor=colores["tarjeta"],
-            border_radius=ft.border_radius.only(top_left=20, top_right=20),
+            bgcolor=colores.tarjeta,
+            border_radius=RADIO_HOJA,
         )
-        bottom_sheet_mas.open = True
+        abrir_hoja(bottom_sheet_mas)
         page.update()
     
     def cerrar_menu_mas():
@@ -3109,33 +2768,37 @@ def main(page: ft.Page):
         open=False,
     )
     
+    # Última vista construida de cada sección: {vista: (firma, control)}
+    vistas_construidas = {}
+    # Vistas con campos de formulario propios: se reconstruyen siempre para que
+    # no reaparezcan selecciones o montos a medio escribir al volver a la pestaña
+    VISTAS_CON_FORMULARIO = ("presupuestos", "transferencias")
+    
     def actualizar_vista():
-        """Actualiza la vista actual"""
+        """Actualiza la vista actual; si nada de lo que muestra cambió desde la
+        última vez (datos, tema, día y filtros) reutiliza la vista ya construida,
+        salvo en las vistas con formulario"""
         nonlocal vista_actual
         
         actualizar_balance()
-        contenedor_principal.controls.clear()
         
-        if vista_actual == "inicio":
-            contenedor_principal.controls.append(crear_vista_inicio())
-        elif vista_actual == "suscripciones":
-            contenedor_principal.controls.append(crear_vista_suscripciones())
-        elif vista_actual == "prestamos":
-            contenedor_principal.controls.append(crear_vista_prestamos())
-        elif vista_actual == "creditos":
-            contenedor_principal.controls.append(crear_vista_creditos())
-        elif vista_actual == "ahorros":
-            contenedor_principal.controls.append(crear_vista_ahorros())
-        elif vista_actual == "bancos":
-            contenedor_principal.controls.append(crear_vista_bancos())
-        elif vista_actual == "balance":
-            contenedor_principal.controls.append(crear_vista_balance_mensual())
-        elif vista_actual == "presupuestos":
-            contenedor_principal.controls.append(crear_vista_presupuestos())
-        elif vista_actual == "transferencias":
-            contenedor_principal.controls.append(crear_vista_transferencias())
-        elif vista_actual == "configuracion":
-            contenedor_principal.controls.append(crear_vista_configuracion())
+        firma = (
+            db.version,
+            page.theme_mode,
+            datetime.date.today(),
+            input_busqueda.value,
+            filtro_categoria.value,
+            filtro_tipo.value,
+            mostrar_filtros[0],
+        )
+        construida = vistas_construidas.get(vista_actual)
+        if construida is not None and construida[0] == firma:
+            vista = construida[1]
+        else:
+            vista = CREADORES_VISTA[vista_actual]()
+            if vista_actual not in VISTAS_CON_FORMULARIO:
+                vistas_construidas[vista_actual] = (firma, vista)
+        contenedor_principal.controls = [vista]
         
         page.update()
 
@@ -3143,7 +2806,7 @@ def main(page: ft.Page):
     page.appbar = ft.AppBar(
         title=ft.Text("💰 Mis Finanzas", color="white", size=20),
         center_title=True,
-        bgcolor=colores["appbar"],
+        bgcolor=colores.appbar,
         elevation=2,
         actions=[
             ft.IconButton(
@@ -3163,57 +2826,25 @@ def main(page: ft.Page):
     # Barra de navegación inferior simplificada
     page.navigation_bar = ft.NavigationBar(
         destinations=[
-            ft.NavigationBarDestination(
-                icon="home_outlined",
-                selected_icon="home",
-                label="Inicio"
-            ),
-            ft.NavigationBarDestination(
-                icon="receipt_long_outlined",
-                selected_icon="receipt_long",
-                label="Balance"
-            ),
-            ft.NavigationBarDestination(
-                icon="pie_chart_outline",
-                selected_icon="pie_chart",
-                label="Gastos"
-            ),
-            ft.NavigationBarDestination(
-                icon="savings_outlined",
-                selected_icon="savings",
-                label="Ahorros"
-            ),
-            ft.NavigationBarDestination(
-                icon="more_horiz",
-                selected_icon="more_horiz",
-                label="Más"
-            ),
+            ft.NavigationBarDestination(icon=icono, selected_icon=seleccionado, label=etiqueta)
+            for _, icono, seleccionado, etiqueta in DESTINOS_NAVEGACION
         ],
         on_change=cambiar_vista,
         selected_index=0,
-        bgcolor=colores["tarjeta"],
+        bgcolor=colores.tarjeta,
         height=65,
     )
 
     # Botón Flotante
     page.floating_action_button = ft.FloatingActionButton(
         icon="add",
-        bgcolor=colores["appbar"],
+        bgcolor=colores.appbar,
         on_click=abrir_agregar
     )
 
-    # Agregar BottomSheets al overlay
-    page.overlay.append(bottom_sheet_movimiento)
-    page.overlay.append(bottom_sheet_suscripcion)
-    page.overlay.append(bottom_sheet_prestamo)
-    page.overlay.append(bottom_sheet_pago_prestamo)
-    page.overlay.append(bottom_sheet_credito)
-    page.overlay.append(bottom_sheet_ahorro)
-    page.overlay.append(bottom_sheet_monto_ahorro)
-    page.overlay.append(bottom_sheet_banco)
-    page.overlay.append(bottom_sheet_monto_banco)
-    page.overlay.append(bottom_sheet_mas)
+    # Las BottomSheets se agregan al overlay al abrirlas por primera vez (abrir_hoja)
     page.overlay.append(dialogo_confirmacion)
+    page.overlay.append(file_picker)
     
     # =====================================================
     # PANTALLA DE LOGIN (PIN)
@@ -3227,15 +2858,15 @@ def main(page: ft.Page):
             txt_pin_titulo,
             ft.Text("Ingresa 4 dígitos" if not db.tiene_pin() else "", size=14, color="grey600"),
             ft.Container(height=30),
-            ft.Row(pin_inputs, alignment=ft.MainAxisAlignment.CENTER, spacing=10),
+            ft.Row(list(pin_inputs), alignment=ft.MainAxisAlignment.CENTER, spacing=10),
             ft.Container(height=10),
             txt_pin_mensaje,
             ft.Container(height=30),
             btn_saltar_pin,
-        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+        ], horizontal_alignment=CENTRADO),
         padding=30,
         expand=True,
-        bgcolor=colores["fondo"]
+        bgcolor=colores.fondo
     )
     
     # Configurar título según si hay PIN
@@ -1,24 +1,66 @@
 # utils.py - Funciones utilitarias para JFinanzas
+import datetime
+import functools
+import importlib.util
 import os
 import pathlib
 import platform
+import time
+from dataclasses import dataclass
 
-# Importar openpyxl solo si está disponible (no funciona en Android)
-EXCEL_DISPONIBLE = False
-Workbook = None
-Font = None
-PatternFill = None
-Alignment = None
+# openpyxl no funciona en Android y tarda en importarse: al iniciar solo se
+# comprueba que esté instalado y se importa en la primera exportación
+EXCEL_DISPONIBLE = importlib.util.find_spec("openpyxl") is not None
 
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
-    EXCEL_DISPONIBLE = True
-except:
-    pass
 
+@functools.lru_cache(maxsize=1)
+def _cargar_excel():
+    """Importa openpyxl y crea los estilos del reporte, una sola vez.
+    Retorna (Workbook, WriteOnlyCell, NamedStyle, estilos) o None si no está disponible"""
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+    except Exception:
+        return None
+    
+    estilos = {
+        "titulo": Font(bold=True, size=14),
+        "subtitulo": Font(bold=True, size=12),
+        # Partes del estilo con nombre del encabezado; el NamedStyle se crea por
+        # libro porque openpyxl lo liga al libro en el que se registra
+        "encabezado": {
+            "font": Font(bold=True, color="FFFFFF", size=12),
+            "fill": PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+            "alignment": Alignment(horizontal='center'),
+        },
+        "ingreso": Font(color="008000"),
+        "gasto": Font(color="FF0000"),
+        "total_ingreso": Font(color="008000", bold=True),
+        "total_gasto": Font(color="FF0000", bold=True),
+    }
+    return Workbook, WriteOnlyCell, NamedStyle, estilos
 
-def es_android():
+
+# Formateador de montos: el format spec se analiza una sola vez. Los totales
+# de la interfaz se repiten entre refrescos, así que se memoriza
+_formato_dinero = functools.lru_cache(maxsize=2048)("${:,.0f}".format)
+
+
+def formato_dinero(valor):
+    """Formatea un monto como "$1,234". Se normaliza a float antes de la caché:
+    lru_cache trata 1, 1.0 y True (o 0 y -0.0) como la misma clave"""
+    return _formato_dinero(float(valor) + 0.0)
+
+# En el Excel los montos se guardan como números y Excel les aplica este formato
+FORMATO_MONEDA_EXCEL = '"$"#,##0.00'
+
+# Disposición fija de la tabla de movimientos del reporte
+ANCHOS_COLUMNAS_EXCEL = {"A": 20, "B": 12, "C": 15, "D": 30, "E": 15}
+ENCABEZADOS_EXCEL = ("Fecha", "Tipo", "Categoría", "Descripción", "Monto")
+
+
+def _detectar_android():
     """Detecta si estamos en Android"""
     try:
         # En Android, el home suele contener /data/data/ o /data/user/
@@ -33,14 +75,25 @@ def es_android():
         return False
 
 
+# No cambia durante la vida del proceso: se detecta una sola vez al importar
+ES_ANDROID = _detectar_android()
+
+
+def es_android():
+    """Indica si estamos en Android"""
+    return ES_ANDROID
+
+
+@functools.lru_cache(maxsize=1)
 def get_persistent_db_path():
     """
     Obtiene una ruta persistente para la base de datos.
     Esta ruta NO se elimina cuando se actualiza la app.
+    Se calcula una sola vez por proceso (platform.system() y mkdir).
     """
     try:
         # En Android, usar directorio actual
-        if es_android():
+        if ES_ANDROID:
             return "finanzas.db"
         
         sistema = platform.system().lower()
@@ -61,161 +114,192 @@ def get_persistent_db_path():
         return "finanzas.db"
 
 
+@functools.lru_cache(maxsize=1)
+def carpeta_exportacion():
+    """Carpeta donde se guardan los backups y reportes: ~/Documents si existe
+    (en muchos Linux y en Android no), si no la carpeta de la base de datos"""
+    documentos = pathlib.Path.home() / "Documents"
+    if documentos.is_dir():
+        return str(documentos)
+    carpeta = pathlib.Path(get_persistent_db_path()).resolve().parent
+    carpeta.mkdir(parents=True, exist_ok=True)
+    return str(carpeta)
+
+
+@functools.lru_cache(maxsize=1)
+def _fecha_por_minuto(minuto):
+    return datetime.datetime.now()
+
+
+def fecha_actual():
+    """Fecha y hora actuales, recalculadas como máximo una vez por minuto"""
+    return _fecha_por_minuto(int(time.time() // 60))
+
+
+@dataclass(frozen=True, slots=True)
+class Paleta:
+    """Colores de la interfaz para un tema"""
+    fondo: str
+    tarjeta: str
+    tarjeta_elevada: str
+    texto: str
+    texto_secundario: str
+    borde: str
+    appbar: str
+    input_border: str
+    input_bg: str
+    verde: str
+    verde_bg: str
+    rojo: str
+    rojo_bg: str
+    naranja: str
+    naranja_bg: str
+    purple: str
+    purple_bg: str
+    azul: str
+    azul_bg: str
+    teal: str
+    teal_bg: str
+    cyan: str
+    cyan_bg: str
+    indigo: str
+    indigo_bg: str
+    gris_bg: str
+
+
+PALETA_OSCURA = Paleta(
+    fondo="#0d1117",
+    tarjeta="#161b22",
+    tarjeta_elevada="#21262d",
+    texto="#e6edf3",
+    texto_secundario="#8b949e",
+    borde="#30363d",
+    appbar="#161b22",
+    input_border="#30363d",
+    input_bg="#0d1117",
+    verde="#238636",
+    verde_bg="#0d1117",
+    rojo="#da3633",
+    rojo_bg="#0d1117",
+    naranja="#d29922",
+    naranja_bg="#1c1504",
+    purple="#8957e5",
+    purple_bg="#1a0d2e",
+    azul="#58a6ff",
+    azul_bg="#0d1117",
+    teal="#3fb950",
+    teal_bg="#0d1a0f",
+    cyan="#39c5cf",
+    cyan_bg="#0a1a1c",
+    indigo="#a371f7",
+    indigo_bg="#170d2e",
+    gris_bg="#21262d",
+)
+
+PALETA_CLARA = Paleta(
+    fondo="white",
+    tarjeta="white",
+    tarjeta_elevada="#f6f8fa",
+    texto="black",
+    texto_secundario="grey600",
+    borde="#e0e0e0",
+    appbar="blue700",
+    input_border="blue700",
+    input_bg="white",
+    verde="green",
+    verde_bg="green50",
+    rojo="red",
+    rojo_bg="red50",
+    naranja="orange",
+    naranja_bg="orange50",
+    purple="purple",
+    purple_bg="purple50",
+    azul="blue700",
+    azul_bg="blue50",
+    teal="teal",
+    teal_bg="teal50",
+    cyan="cyan900",
+    cyan_bg="cyan50",
+    indigo="indigo",
+    indigo_bg="indigo50",
+    gris_bg="grey100",
+)
+
+
 def obtener_colores(es_oscuro):
-    """Retorna diccionario de colores según el tema"""
-    if es_oscuro:
-        return {
-            "fondo": "#0d1117",
-            "tarjeta": "#161b22",
-            "tarjeta_elevada": "#21262d",
-            "texto": "#e6edf3",
-            "texto_secundario": "#8b949e",
-            "borde": "#30363d",
-            "appbar": "#161b22",
-            "input_border": "#30363d",
-            "input_bg": "#0d1117",
-            "verde": "#238636",
-            "verde_bg": "#0d1117",
-            "rojo": "#da3633",
-            "rojo_bg": "#0d1117",
-            "naranja": "#d29922",
-            "naranja_bg": "#1c1504",
-            "purple": "#8957e5",
-            "purple_bg": "#1a0d2e",
-            "azul": "#58a6ff",
-            "azul_bg": "#0d1117",
-            "teal": "#3fb950",
-            "teal_bg": "#0d1a0f",
-            "cyan": "#39c5cf",
-            "cyan_bg": "#0a1a1c",
-            "indigo": "#a371f7",
-            "indigo_bg": "#170d2e",
-            "gris_bg": "#21262d",
-        }
-    else:
-        return {
-            "fondo": "white",
-            "tarjeta": "white",
-            "tarjeta_elevada": "#f6f8fa",
-            "texto": "black",
-            "texto_secundario": "grey600",
-            "borde": "#e0e0e0",
-            "appbar": "blue700",
-            "input_border": "blue700",
-            "input_bg": "white",
-            "verde": "green",
-            "verde_bg": "green50",
-            "rojo": "red",
-            "rojo_bg": "red50",
-            "naranja": "orange",
-            "naranja_bg": "orange50",
-            "purple": "purple",
-            "purple_bg": "purple50",
-            "azul": "blue700",
-            "azul_bg": "blue50",
-            "teal": "teal",
-            "teal_bg": "teal50",
-            "cyan": "cyan900",
-            "cyan_bg": "cyan50",
-            "indigo": "indigo",
-            "indigo_bg": "indigo50",
-            "gris_bg": "grey100",
-        }
+    """Retorna la paleta de colores según el tema"""
+    return PALETA_OSCURA if es_oscuro else PALETA_CLARA
 
 
 def exportar_movimientos_a_excel(db, mes, anio):
     """Exporta los movimientos mensuales a un archivo Excel"""
-    if not EXCEL_DISPONIBLE:
+    excel = _cargar_excel()
+    if excel is None:
         return False, "Exportación Excel no disponible en este dispositivo"
+    Workbook, WriteOnlyCell, NamedStyle, estilos = excel
     
     try:
         movimientos = db.obtener_movimientos_mensuales(mes, anio)
-        ingresos_mes, gastos_mes = db.obtener_balance_mensual(mes, anio)
-        total_subs = db.obtener_total_suscripciones()
-        total_cuotas = db.obtener_total_cuotas_prestamos()
-        total_cuotas_creditos = db.obtener_total_cuotas_creditos()
+        ingresos_mes, gastos_mes, total_subs, total_cuotas, total_cuotas_creditos = db.obtener_resumen_mensual(mes, anio)
         balance_mes = ingresos_mes - gastos_mes
         
-        meses = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", 
-                "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
-        mes_nombre = meses[mes - 1]
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"{mes_nombre} {anio}"
-        
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=12)
-        title_font = Font(bold=True, size=14)
-        
-        ws.merge_cells('A1:E1')
-        ws['A1'] = f"Reporte de Movimientos - {mes_nombre} {anio}"
-        ws['A1'].font = title_font
-        ws['A1'].alignment = Alignment(horizontal='center')
+        mes_nombre = MESES_NOMBRES[mes - 1]
         
-        ws['A3'] = "RESUMEN DEL MES"
-        ws['A3'].font = Font(bold=True, size=12)
+        # Workbook en modo write_only: las filas se escriben en streaming
+        # sin mantener en memoria la cuadrícula completa de celdas
+        wb = Workbook(write_only=True)
+        # Cada celda del encabezado solo referencia este estilo por su nombre
+        wb.add_named_style(NamedStyle(name="encabezado", **estilos["encabezado"]))
+        ws = wb.create_sheet(f"{mes_nombre} {anio}")
         
-        ws['A4'] = "Total Ingresos:"
-        ws['B4'] = f"${ingresos_mes:,.2f}"
-        ws['B4'].font = Font(color="008000", bold=True)
+        # En write_only los anchos deben definirse antes de agregar filas
+        for columna, ancho in ANCHOS_COLUMNAS_EXCEL.items():
+            ws.column_dimensions[columna].width = ancho
         
-        ws['A5'] = "Total Gastos:"
-        ws['B5'] = f"${gastos_mes:,.2f}"
-        ws['B5'].font = Font(color="FF0000", bold=True)
+        def celda(valor, font=None, style=None, number_format=None):
+            c = WriteOnlyCell(ws, value=valor)
+            if style is not None:
+                c.style = style
+            if number_format is not None:
+                c.number_format = number_format
+            if font is not None:
+                c.font = font
+            return c
         
-        ws['A6'] = "Suscripciones:"
-        ws['B6'] = f"${total_subs:,.2f}"
+        # write_only no admite merge_cells: el título ocupa la columna A
+        ws.append([celda(f"Reporte de Movimientos - {mes_nombre} {anio}", font=estilos["titulo"])])
+        ws.append([])
+        ws.append([celda("RESUMEN DEL MES", font=estilos["subtitulo"])])
+        def monto(valor, font=None):
+            return celda(valor, font=font, number_format=FORMATO_MONEDA_EXCEL)
         
-        ws['A7'] = "Cuotas Préstamos:"
-        ws['B7'] = f"${total_cuotas:,.2f}"
+        ws.append(["Total Ingresos:", monto(ingresos_mes, font=estilos["total_ingreso"])])
+        ws.append(["Total Gastos:", monto(gastos_mes, font=estilos["total_gasto"])])
+        ws.append(["Suscripciones:", monto(total_subs)])
+        ws.append(["Cuotas Préstamos:", monto(total_cuotas)])
+        ws.append(["Cuotas Créditos:", monto(total_cuotas_creditos)])
+        ws.append(["Balance Final:", monto(balance_mes, font=estilos["subtitulo"])])
+        ws.append([])
         
-        ws['A8'] = "Cuotas Créditos:"
-        ws['B8'] = f"${total_cuotas_creditos:,.2f}"
+        ws.append([
+            celda(titulo, style="encabezado")
+            for titulo in ENCABEZADOS_EXCEL
+        ])
         
-        ws['A9'] = "Balance Final:"
-        ws['B9'] = f"${balance_mes:,.2f}"
-        ws['B9'].font = Font(bold=True, size=12)
-        
-        ws['A11'] = "Fecha"
-        ws['B11'] = "Tipo"
-        ws['C11'] = "Categoría"
-        ws['D11'] = "Descripción"
-        ws['E11'] = "Monto"
-        
-        for cell in ['A11', 'B11', 'C11', 'D11', 'E11']:
-            ws[cell].fill = header_fill
-            ws[cell].font = header_font
-            ws[cell].alignment = Alignment(horizontal='center')
-        
-        fila = 12
-        for mov in movimientos:
-            id_mov, tipo, categoria, monto, descripcion, fecha = mov
-            
-            ws[f'A{fila}'] = fecha
-            ws[f'B{fila}'] = tipo.upper()
-            ws[f'C{fila}'] = categoria
-            ws[f'D{fila}'] = descripcion
-            ws[f'E{fila}'] = f"${monto:,.2f}"
-            
-            if tipo == 'ingreso':
-                ws[f'B{fila}'].font = Font(color="008000")
-                ws[f'E{fila}'].font = Font(color="008000")
-            else:
-                ws[f'B{fila}'].font = Font(color="FF0000")
-                ws[f'E{fila}'].font = Font(color="FF0000")
-            
-            fila += 1
-        
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 12
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 30
-        ws.column_dimensions['E'].width = 15
+        font_ingreso = estilos["ingreso"]
+        font_gasto = estilos["gasto"]
+        for fecha, tipo, categoria, descripcion, importe in movimientos:
+            font = font_ingreso if tipo == 'INGRESO' else font_gasto
+            ws.append([
+                fecha,
+                celda(tipo, font=font),
+                categoria,
+                descripcion,
+                monto(importe, font=font),
+            ])
         
         nombre_archivo = f"Movimientos_{mes_nombre}_{anio}.xlsx"
-        ruta_documentos = os.path.join(os.path.expanduser('~'), 'Documents')
-        ruta_completa = os.path.join(ruta_documentos, nombre_archivo)
+        ruta_completa = os.path.join(carpeta_exportacion(), nombre_archivo)
         
         wb.save(ruta_completa)
         return True, ruta_completa
@@ -228,6 +312,9 @@ def exportar_movimientos_a_excel(db, mes, anio):
 # Constantes de categorías
 CATEGORIAS = ["Comida", "Transporte", "Servicios", "Ocio", "Salud", "Salario", "Compras", "Educación", "Otro"]
 
+# Categorías a las que se les puede poner presupuesto (todas menos los ingresos)
+CATEGORIAS_GASTO = tuple(c for c in CATEGORIAS if c != "Salario")
+
 COLORES_CATEGORIAS = {
     "Comida": "#FF6384", 
     "Transporte": "#36A2EB", 
@@ -240,42 +327,59 @@ COLORES_CATEGORIAS = {
     "Otro": "#95A5A6"
 }
 
-MESES_NOMBRES = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", 
-                 "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+# Icono y atributo de color (de la Paleta) según el tipo de cuenta bancaria
+ICONOS_CUENTA = {
+    "debito": ("payment", "azul"),
+    "credito": ("credit_card", "naranja"),
+    "ahorro": ("savings", "verde"),
+    "inversion": ("trending_up", "purple")
+}
+
+MESES_NOMBRES = ("Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+                 "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre")
 
-MESES_CORTOS = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
+MESES_CORTOS = ("Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic")
 
 
 # Páginas de onboarding
-ONBOARDING_PAGES = [
-    {
-        "icono": "account_balance_wallet",
-        "titulo": "¡Bienvenido a Mis Finanzas!",
-        "descripcion": "Tu asistente personal para controlar ingresos, gastos y alcanzar tus metas financieras.",
-        "color": "blue"
-    },
-    {
-        "icono": "trending_up",
-        "titulo": "Controla tus Movimientos",
-        "descripcion": "Registra fácilmente todos tus ingresos y gastos. Categoriza y mantén un historial completo.",
-        "color": "green"
-    },
-    {
-        "icono": "subscriptions",
-        "titulo": "Gestiona Suscripciones",
-        "descripcion": "Nunca pierdas de vista tus pagos recurrentes como Netflix, Spotify y más.",
-        "color": "orange"
-    },
-    {
-        "icono": "savings",
-        "titulo": "Alcanza tus Metas",
-        "descripcion": "Crea metas de ahorro y visualiza tu progreso. ¡Cada peso cuenta!",
-        "color": "teal"
-    },
-    {
-        "icono": "pie_chart",
-        "titulo": "Visualiza tus Finanzas",
-        "descripcion": "Gráficos y reportes para entender mejor cómo gastas tu dinero.",
-        "color": "purple"
-    }
-]
+@dataclass(frozen=True, slots=True)
+class PaginaOnboarding:
+    """Contenido de una página del onboarding"""
+    icono: str
+    titulo: str
+    descripcion: str
+    color: str
+
+
+ONBOARDING_PAGES = (
+    PaginaOnboarding(
+        icono="account_balance_wallet",
+        titulo="¡Bienvenido a Mis Finanzas!",
+        descripcion="Tu asistente personal para controlar ingresos, gastos y alcanzar tus metas financieras.",
+        color="blue",
+    ),
+    PaginaOnboarding(
+        icono="trending_up",
+        titulo="Controla tus Movimientos",
+        descripcion="Registra fácilmente todos tus ingresos y gastos. Categoriza y mantén un historial completo.",
+        color="green",
+    ),
+    PaginaOnboarding(
+        icono="subscriptions",
+        titulo="Gestiona Suscripciones",
+        descripcion="Nunca pierdas de vista tus pagos recurrentes como Netflix, Spotify y más.",
+        color="orange",
+    ),
+    PaginaOnboarding(
+        icono="savings",
+        titulo="Alcanza tus Metas",
+        descripcion="Crea metas de ahorro y visualiza tu progreso. ¡Cada peso cuenta!",
+        color="teal",
+    ),
+    PaginaOnboarding(
+        icono="pie_chart",
+        titulo="Visualiza tus Finanzas",
+        descripcion="Gráficos y reportes para entender mejor cómo gastas tu dinero.",
+        color="purple",
+    ),
+)